@@ -1,20 +1,33 @@
 import discord  # pip3 install -U discord.py
 from dotenv import load_dotenv  # pip3 install -U python-dotenv
+import asyncio
 import os
 import random
-import json
+from contextvars import ContextVar
 from discord.ext import commands
 from pathlib import Path
+from my_classes.Cache import Cache
+from my_classes.Catalog import catalog
 from my_classes.Course import Course
+from my_classes.Expression import start_workers
+from my_classes.Handoff import Handoff
+from my_classes.Http import http_client
+from my_classes.Ledger import Ledger
+from my_classes.PassageCache import PassageCache
+from my_classes.PassageStore import PassageStore
+from my_classes.PermissionWriter import PermissionWriter
 from my_classes.Reaction import Reaction
+from my_classes.ReactionRouter import ReactionRouter
+from my_classes.Registry import registry
 from my_classes.Role import Role
+from my_classes.RoomManager import RoomManager
 from my_classes.Student import to_student
 
 
 ######################
 #  GLOBAL FUNCTIONS  #
 ######################
-async def send_embed(ctx=None, title=None, text='', user=None, channel=None):
+async def send_embed(ctx=None, title=None, text='', user=None, channel=None, options=None):
     """send an embed message to a designated channel.
 
     WARNING: embed messages has a max length of 2048 characters.
@@ -31,6 +44,7 @@ async def send_embed(ctx=None, title=None, text='', user=None, channel=None):
     embed title by default will be the bot's name.
     embed color will be randomly generated each time.
         to make each message more distinct.
+    the options of a prompt are sent as buttons with the last message.
 
     Parameters
     ----------
@@ -39,6 +53,7 @@ async def send_embed(ctx=None, title=None, text='', user=None, channel=None):
     :param str text: the text for the embed description.
     :param int user: the user's discord id.
     :param int channel: the discord channel id.
+    :param dict options: a dictionary key=str emoji, value=str label of every button, None for no buttons.
     :return: the discord.Embed sent.
     """
     # embed title by default is the bot's name.
@@ -55,7 +70,7 @@ async def send_embed(ctx=None, title=None, text='', user=None, channel=None):
         long_msg = embed.description
 
         embed.description = long_msg[:long_msg.rindex(' ', 0, embed_limit)]
-        await ctx.channel.send(embed=embed)
+        store_last_bot_msg(await ctx.channel.send(embed=embed))
 
         embed.title = None
         embed.description = long_msg.replace(embed.description, '')
@@ -66,23 +81,30 @@ async def send_embed(ctx=None, title=None, text='', user=None, channel=None):
 
     # send an embed message to the designated channel.
     if user is not None:
-        return await bot.get_user(user).send(embed=embed)
-    if channel is not None:
-        return await bot.get_channel(channel).send(embed=embed)
-    return await ctx.channel.send(embed=embed)
+        destination = bot.get_user(user)
+        if options is not None:
+            destination = await destination.create_dm()  # buttons are sent to the DM channel, not the user.
+    elif channel is not None:
+        destination = bot.get_channel(channel)
+    else:
+        destination = ctx.channel
+
+    if options is not None:
+        return store_last_bot_msg(await reaction_router.send(destination, embed, options))
+    return store_last_bot_msg(await destination.send(embed=embed))
 
 
 def json_to_dict(file_path):
-    """stores the contents of a .json file to a dictionary object.
+    """get the contents of a .json file from the in memory content registry.
+
+    the file is not read from disk, every .json file is loaded when the bot starts.
 
     Parameters
     ----------
     :param str file_path: the file path the .json file is located.
-    :return: a dictionary of the contents in a .json file.
+    :return: a read-only dictionary of the contents in a .json file.
     """
-    # open and read help message from a .json file.
-    with open(file_path, encoding='UTF8') as file:
-        return json.load(file)
+    return registry.get(file_path)
 
 
 def to_member(discord_id):
@@ -119,6 +141,7 @@ async def display_queue(ctx, course, current_channel=True, direct_msg=False, ann
     a 'queue is empty' error message will be displayed:
         if there are no students in the queue.
     (optional) bot will send a direct message to each student their current position in the queue.
+    every message is sent at the same time.
 
    Parameters
     ----------
@@ -128,31 +151,70 @@ async def display_queue(ctx, course, current_channel=True, direct_msg=False, ann
     :param boolean direct_msg: if True direct message each student their position in the queue,
     :param boolean announcement: if True queue should be printed in the bot announcement channel
     """
+    # the queue can change while messages are being sent.
+    queue = list(course.queue)
+
     # display queue.
     description = ''
-    for index, student in enumerate(course.queue, start=1):
+    for index, student in enumerate(queue, start=1):
         mention_student = f'<@!{student.discord_id}>'
         description += f'#{index} {mention_student} - {student.times_helped}\n'
 
-        # send student their position in queue.
-        if direct_msg:
-            await send_position_in_queue(student.discord_id, course, index)
-
     # display error message.
     if course.que_is_empty():
         description = '*queue is empty.*'
 
+    requests = []
+
+    # send student their position in queue.
+    if direct_msg:
+        requests += [send_position_in_queue(student.discord_id, course, index)
+                     for index, student in enumerate(queue, start=1)]
+
     if announcement:
-        # remove old queue message made by bot.
-        if course.message is not None:
-            await course.message.delete()
+        requests.append(refresh_announcement(course, description))
+
+    if current_channel:
+        requests.append(send_embed(ctx, title=course.queue_title(), text=description))
+
+    await asyncio.gather(*requests)
+
 
-        # display updated queue in bot announcement channel.
+async def refresh_announcement(course, description):
+    """replace the queue message in the bot announcement channel.
+
+    only one queue message per course is replaced at a time
+        so two updates at the same time do not both delete the same message and leave two queue messages behind.
+
+    Parameters
+    ----------
+    :param Course course: the course object.
+    :param str description: the queue message.
+    """
+    async with course.lock:
+        # remove old queue message made by bot and display updated queue in bot announcement channel.
         channel = int(os.getenv("BOT_ANNOUNCEMENT_CHANNEL_ID"))
-        course.message = await send_embed(channel=channel, title=course.queue_title(), text=description)
+        course.message, _ = await asyncio.gather(
+            send_embed(channel=channel, title=course.queue_title(), text=description),
+            delete_queue_message(course.message))
+        ledger.add_message(course.message)
 
-    if current_channel:
-        await send_embed(ctx, title=course.queue_title(), text=description)
+
+async def delete_queue_message(message):
+    """
+    Parameters
+    ----------
+    :param discord.Message message: the old queue message, it may have already been deleted by a moderator.
+    """
+    if message is None:
+        return
+
+    try:
+        await message.delete()
+    except discord.NotFound:
+        pass
+
+    ledger.remove_message(message)
 
 
 async def send_position_in_queue(discord_id, course, position):
@@ -212,14 +274,24 @@ def generate_bot_client():
     API UPDATE: In version 1.5 of discord.py comes the introduction of Intents.
         This is a radical change in how bots are written.
         An intent basically allows a bot to subscribe into specific buckets of events.
+    the shared http session is closed when the bot closes, otherwise its connections are left open.
 
     :return: an instance of a discord bot.
     """
     prefix = os.getenv("BOT_PREFIX")
     intents = discord.Intents(messages=True, guilds=True, members=True, presences=True, reactions=True,
-                              voice_states=True)
+                              voice_states=True, invites=True)
+
+    bot = commands.Bot(command_prefix=prefix, help_command=None, intents=intents)
+    disconnect = bot.close
+
+    async def close():
+        """close the shared http session before the bot disconnects."""
+        await http_client.close()
+        await disconnect()
 
-    return commands.Bot(command_prefix=prefix, help_command=None, intents=intents)
+    bot.close = close
+    return bot
 
 
 def initialize_sessions():
@@ -232,7 +304,7 @@ def initialize_sessions():
     """
     sessions = {}
 
-    for course_code in Reaction().course_codes():
+    for course_code in catalog.codes():
         course = Course(course_code)
         sessions[course.num()] = course
 
@@ -281,16 +353,27 @@ async def initialize_accounts(dictionary):
 # bot instance.
 load_dotenv()  # load the environment variables from a local .env file.
 bot = generate_bot_client()  # an instance of the discord bot.
+role_reactions = Role(bot)  # the role reaction message handler.
+reaction_router = ReactionRouter(bot)  # answers the prompts waiting for a reaction by message id.
 
 # tutee and tutor fields.
 tutoring_sessions = initialize_sessions()  # a dictionary of every available tutoring session.
 tutoring_accounts = {}  # a dictionary of student objects.
-private_rooms = {}  # a dictionary of generated private voice channel rooms.
+handoffs = Handoff()  # the cached tutor voice channel invites and the '.tutor next' latencies.
+ledger = Ledger(os.getenv('LEDGER_PATH') or 'ledger.json')  # the server changes the bot has to undo on startup.
+permissions = PermissionWriter()  # batches permission overwrite changes into one edit per channel.
+rooms = RoomManager(bot, ledger, permissions)  # every generated private voice channel room.
+
+# weather commands fields.
+weather_cache = Cache(ttl=600, negative_ttl=60, stale_ttl=1800)  # the current weather by (city, zip, country, units).
+
+# esv commands fields.
+passage_cache = PassageCache(os.getenv('ESV_CACHE_PATH') or 'esv_cache.sqlite3')  # the ESV passages stored on disk.
+passage_store = PassageStore(os.getenv('ESV_PASSAGE_STORE') or None)  # the optional local copy of the Bible.
 
 # oops commands fields.
 msg_history = {}  # keeps track of the Bot's past messages to delete.
-user_discord_id = 'discord_id'  # stores the discord id of the last user that triggered a bot command.
-channel_id = 'channel'  # stores the discord channel id the bot message was sent.
+invocation = ContextVar('invocation', default=None)  # the (discord id, channel id) of the command being handled.
 
 
 #####################
@@ -331,7 +414,11 @@ async def bot_mention_message(ctx):
 async def send_courses_reaction_message(ctx, course_code):
     """display a reaction message of all the available session, then wait and return the student's response.
 
+        the course is resolved without a reaction message if the student's input can only mean one course.
+            i.e. 'egr 222', '222 ', 'data structures', 'algoritms'.
+        the reaction message only shows the courses the input could mean, or every course if it matched none.
         a cancel emoji will also be displayed along with the available session.
+        the sessions are buttons sent with the message, or reactions if the buttons could not be sent.
         the reaction message will have a timeout time before the message is deleted.
         the reaction message will only listen to the attended author.
 
@@ -342,42 +429,21 @@ async def send_courses_reaction_message(ctx, course_code):
     :return: str that represents a available course code, otherwise return None.
     """
     reaction = Reaction()
+    codes = catalog.resolve(course_code)
 
-    if reaction.validate(course_code) is False:
-        # display reaction message.
-        msg = await send_embed(channel=ctx.channel.id, text=reaction.message())
-        student_choice = await reaction.add(bot, msg, ctx.author.id, 30)
+    if len(codes) == 1:
+        return codes[0]
 
-        # validate student's reaction choice.
-        if student_choice is None:
-            return None
+    # display reaction message, every course is a button.
+    msg = await send_embed(channel=ctx.channel.id, text=reaction.message(codes), options=reaction.course_emojis(codes))
+    student_choice = await reaction.add(reaction_router, msg, ctx.author.id, 30, codes)
 
-        # update class section.
-        for emoji in reaction.course_emojis():
-            if str(student_choice) == emoji:
-                return reaction.course_emojis()[emoji]
+    # validate student's reaction choice.
+    if student_choice is None:
+        return None
 
-    return course_code.upper()
-
-
-async def store_private_voice_channels(member, before, after):
-    """stores generated private voice channel in dictionary.
-
-    Parameters
-    ----------
-    :param Member member: the member whose voice states changed.
-    :param VoiceState before: the voice state prior to the changes.
-    :param VoiceState after: the voice state after to the changes.
-    """
-    if after.channel and after.channel in private_rooms.keys():
-        await give_admin_permissions(member, after.channel)
-    if before.channel and before.channel != after.channel and before.channel.id in private_rooms.keys():
-        channel = before.channel
-        if not channel.members:
-            private_rooms.pop(channel.id)
-            await channel.delete()
-        else:
-            private_rooms[channel.id] = channel.members[0].id
+    # update class section.
+    return reaction.course_emojis().get(str(student_choice))
 
 
 async def get_user_info(ctx):
@@ -403,55 +469,144 @@ async def get_user_info(ctx):
 
 
 def store_last_bot_msg(message):
-    """store the last bot message and the user's discord id who triggered the bot command.
+    """store a bot message under the user's discord id who triggered the bot command.
 
     this function is for the undo command
         stored message allows users to delete them in the future.
-    this method is placed in this file because it relies on the on_message event.
+    every outgoing bot message is passed through this function on the send path.
+        the message is attributed to the command invocation that is running in the current context.
+            on_message stores the invocation in a context variable before processing commands.
+            each event is handled in its own asyncio task with its own copy of the context.
+        therefore, concurrent commands from different users can never be attributed to each other.
+    messages sent outside of a command invocation (i.e. on_ready) are not stored.
 
     Parameters
     ----------
-    :param Message message: the current message.
-    """
-    global msg_history, user_discord_id, channel_id
-    if message.author != bot.user:
-        user_discord_id = message.author.id
-        channel_id = message.channel.id
-    if message.author.bot:
-        if msg_history.get(user_discord_id) is not None:
-            if msg_history[user_discord_id].get(channel_id) is not None:
-                msg_history[user_discord_id][channel_id].append(message)
-            else:
-                msg_history[user_discord_id][channel_id] = [message]
-        else:
-            msg_history[user_discord_id] = {channel_id: [message]}
-
-
-async def give_admin_permissions(member, channel):
-    """give admin like permission to a given member for a given channel.
-
-    :param discord.Member member: the member object that is being granted the permissions.
-    :param discord.Channel channel: the channel object that the permission will be set.
+    :param Message message: the bot message that was sent.
+    :return: the given message.
     """
-    await channel.set_permissions(member, manage_permissions=True, connect=True,
-                                  view_channel=True, stream=True, move_members=True, speak=True)
+    current = invocation.get()
+    if current is None or message is None:
+        return message
+
+    discord_id, channel_id = current
+    msg_history.setdefault(discord_id, {}).setdefault(channel_id, []).append(message)
+
+    return message
 
 
-async def clean_up_channels():
-    """removes any unwanted channels or permission in the server.
+async def clean_up_channels(concurrency=5):
+    """undo the changes the bot left behind in the server.
 
     this function is implemented:
         in case the bot goes down before any functions that triggers the removal of a  channel/permission.
+    only the changes recorded in the ledger are undone.
+        permission overwrites given to students to connect to a tutor's voice channel.
+        private rooms made by students.
+            spare rooms are adopted back into the pool instead, the pool would create them again right away.
+        queue messages in the bot announcement channel.
+    every change is undone at the same time
+        a semaphore limits how many requests are sent at once to stay under discord's rate limits.
+    overwrites in the same channel are removed with one channel edit.
+    messages in the same channel are deleted with one bulk delete request (up to 100 messages each).
+        discord only bulk deletes messages younger than 14 days, older messages are deleted one at a time.
+    only the entries that were undone are removed from the ledger.
+        a change that failed to be undone is tried again on the next startup.
+        a change recorded while cleaning up is not forgotten.
+
+    Parameters
+    ----------
+    :param int concurrency: the maximum number of requests sent at once.
     """
-    for channel in bot.get_guild(int(os.getenv("GUILD_SERVER_ID"))).channels:
-        # remove student's permission to connect to tutor's voice channel.
-        if channel.type == discord.ChannelType.voice:
-            for member in channel.overwrites:
-                await channel.set_permissions(member, overwrite=None)
+    guild = bot.get_guild(int(os.getenv("GUILD_SERVER_ID")))
+    semaphore = asyncio.Semaphore(concurrency)
+    overwrites, deleted_rooms, messages = {}, set(), {}  # the ledger entries that were undone.
+
+    async def limit(request):
+        """create and send a request once the semaphore lets it through.
+
+        :param request: the function that returns the request to send.
+        :return: True if the change was undone or there was nothing left to undo, otherwise return False.
+        """
+        async with semaphore:
+            try:
+                await request()
+            except discord.NotFound:
+                pass
+            except discord.HTTPException:
+                return False
+
+        return True
+
+    async def remove_overwrites(channel_id, target_ids):
+        channel = guild.get_channel(channel_id)
+        targets = [guild.get_member(target_id) or guild.get_role(target_id) for target_id in target_ids]
+        if channel is None or await limit(lambda: asyncio.gather(*(permissions.set(channel, target, None)
+                                                                   for target in targets if target is not None))):
+            overwrites[channel_id] = target_ids
+
+    async def remove_room(channel_id):
+        channel = guild.get_channel(channel_id)
+        if channel is not None and rooms.adopt(channel):
+            return
+        if channel is None or await limit(channel.delete):
+            deleted_rooms.add(channel_id)
+
+    async def remove_messages(channel_id, message_ids):
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            messages[channel_id] = set(message_ids)
+            return
+
+        async with semaphore:
+            messages.setdefault(channel_id, set()).update(await delete_messages(channel, message_ids))
+
+    requests = []
+
+    # remove student's permission to connect to tutor's voice channel (one edit per channel).
+    for channel_id, target_ids in ledger.overwrites.items():
+        requests.append(remove_overwrites(channel_id, set(target_ids)))
+
+    # remove private rooms made by students.
+    for channel_id in ledger.rooms:
+        requests.append(remove_room(channel_id))
+
+    # remove old queue messages.
+    for channel_id, message_ids in ledger.messages.items():
+        message_ids = sorted(message_ids)
+        for index in range(0, len(message_ids), 100):
+            requests.append(remove_messages(channel_id, message_ids[index:index + 100]))
+
+    await asyncio.gather(*requests)
+    ledger.remove(overwrites, deleted_rooms, messages)
+
+
+async def delete_messages(channel, message_ids):
+    """delete messages with one bulk delete request, or one at a time if they are too old to bulk delete.
 
-        # remove private rooms made by students.
-        if channel.category is not None and channel.category.id == int(os.getenv("PRIVATE_ROOM_CATEGORY_ID")):
-            await channel.delete()
+    Parameters
+    ----------
+    :param discord.TextChannel channel: the channel the messages are in.
+    :param list message_ids: up to 100 message ids.
+    :return: a list of the message ids that were deleted or no longer exist.
+    """
+    try:
+        await channel.delete_messages([discord.Object(id=message_id) for message_id in message_ids])
+        return message_ids
+    except discord.HTTPException:
+        pass
+
+    deleted = []
+    for message_id in message_ids:
+        try:
+            await bot.http.delete_message(channel.id, message_id)
+        except discord.NotFound:
+            pass
+        except discord.HTTPException:
+            continue
+        deleted.append(message_id)
+
+    return deleted
 
 
 ################
@@ -461,8 +616,12 @@ async def clean_up_channels():
 async def on_ready():
     """executes these functions when the client is done preparing the data received from Discord."""
     await initialize_accounts(tutoring_accounts)  # bot needs to be ready before fetching messages.
+    bot.loop.run_in_executor(None, start_workers)  # start the calculator's worker processes ahead of time.
+    bot.loop.create_task(registry.watch())  # reload .json files modified while the bot is online.
+    bot.loop.create_task(rooms.reap())  # delete private rooms that have been empty for too long.
     await clean_up_channels()
-    await Role(bot).add()
+    bot.loop.create_task(rooms.fill())  # keep spare private rooms ready.
+    await role_reactions.add()
     await notify_devs_when_ready()
 
 
@@ -480,6 +639,10 @@ async def on_message(message):
     if message.author.bot and message.author != bot.user:
         return
 
+    # attribute every bot message sent while handling this message to its author.
+    if message.author != bot.user:
+        invocation.set((message.author.id, message.channel.id))
+
     # get message information for debugging.
     if message.content.startswith(os.getenv('BOT_PREFIX')):
         await get_user_info(message)
@@ -488,9 +651,6 @@ async def on_message(message):
     if mentioned_user(int(os.getenv("BOT_ID"))) in message.content:
         await bot_mention_message(message)
 
-    # store the last bot message.
-    store_last_bot_msg(message)
-
     # this code will override default process commands
     # and allow custom generated commands to trigger.
     await bot.process_commands(message)
@@ -507,7 +667,31 @@ async def on_voice_state_update(member, before, after):
     :param VoiceState before: the voice state prior to the changes.
     :param VoiceState after: the voice state after to the changes.
     """
-    await store_private_voice_channels(member, before, after)
+    await rooms.update(member, before, after)
+
+
+@bot.event
+async def on_invite_delete(invite):
+    """
+    PERMISSION NEEDED: This requires Intents.invites to be enabled.
+
+    Parameters
+    ----------
+    :param Invite invite: the invite that was deleted.
+    """
+    handoffs.forget(invite)
+
+
+@bot.event
+async def on_socket_response(msg):
+    """called for every gateway event, buttons are read from here because discord.py 1.x does not parse them.
+
+    Parameters
+    ----------
+    :param dict msg: the decoded gateway event.
+    """
+    if msg.get('t') == 'INTERACTION_CREATE':
+        await reaction_router.dispatch_interaction(msg['d'])
 
 
 @bot.event
@@ -518,8 +702,16 @@ async def on_raw_reaction_add(payload):
     ----------
     :param discord.raw_models. payload: the raw event payload data.
     """
+    # answer the prompt the reaction was made on.
+    if reaction_router.dispatch(payload):
+        return
+
+    # ignore reactions on any other message.
+    if not role_reactions.is_target(payload):
+        return
+
     # add roles
-    await Role(bot).edit(payload, add=True, delete=True)
+    await role_reactions.edit(payload, add=True, delete=True)
 
 
 @bot.event
@@ -530,8 +722,12 @@ async def on_raw_reaction_remove(payload):
     ----------
     :param discord.raw_models. payload: the raw event payload data.
     """
+    # ignore reactions on any other message.
+    if not role_reactions.is_target(payload):
+        return
+
     # remove roles
-    await Role(bot).edit(payload, remove=True)
+    await role_reactions.edit(payload, remove=True)
 
 
 # load other commands from other files.py.
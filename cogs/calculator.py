@@ -1,6 +1,8 @@
-import re
+import math
 from discord.ext import commands
 from cogs.bot import send_embed
+from my_classes.Expression import evaluate as calculate
+from my_classes.Table import Table
 
 
 class Calculator(commands.Cog):
@@ -8,6 +10,10 @@ class Calculator(commands.Cog):
 
     @commands.command()
     async def cal(self, ctx, *, expression=None):
+        # display a table of the expression for a range of values.
+        if expression is not None and expression.lower().startswith('table '):
+            return await display_table(ctx, expression[len('table '):])
+
         # evaluate given expression.
         await evaluate(ctx, expression)
 
@@ -16,13 +22,14 @@ async def evaluate(ctx, expression):
     """evaluates the given expression and display the result.
 
     WARNING:
-        this command uses python's eval() method to calculate given expression.
-        function should check for edge cases before eval() is called.
+        never use python's eval() on user input, a user can run any code or freeze the bot.
+        expressions are calculated by a sandboxed expression engine instead.
+            only numbers, math operators, and whitelisted math functions are allowed.
+            large results are calculated in a separate process with a timeout.
     display a 'expression cannot be evaluated':
         when expression cannot be evaluated.
-    function will terminate to avoid users from abusing the eval():
+    function will terminate:
         if the expression does not contain at least two digits.
-        if the expression contains any letters.
     the result will be rounded to 3 decimal places.
 
     Parameters
@@ -46,15 +53,66 @@ async def evaluate_expression(ctx, expression):
     :param Context ctx: the current Context.
     :param str expression: the expression to evaluate.
     """
-    decimal_places = 3
     try:
-        description = f'result is {round(eval(expression), decimal_places)}.'
-    except SyntaxError:
+        description = f'result is {to_string(await calculate(expression, ctx.author.id))}.'
+    except ZeroDivisionError:
+        description = 'cannot divide by zero.'
+    except OverflowError:
+        description = 'that number is too big.'
+    except TimeoutError:
+        description = 'that took too long to calculate.'
+    except (SyntaxError, ValueError, TypeError, RecursionError):
         description = 'let me google that.'
 
     await send_embed(ctx, title='♾ Calculator', text=description)
 
 
+async def display_table(ctx, text):
+    """display the given expressions calculated for every value in a range as a table.
+
+    example: .cal table n**2, 2**n for n in 1..10 step 1
+    the table is sent in a code block for the columns to line up.
+        tables that are too long for one embed message are not sent.
+
+    Parameters
+    ----------
+    :param Context ctx: the current Context.
+    :param str text: the table request.
+    """
+    embed_limit = 2048
+    try:
+        description = f'```\n{Table(text).render()}\n```'
+        if len(description) > embed_limit:
+            description = 'that table is too big to display.'
+    except OverflowError:
+        description = 'that number is too big.'
+    except (SyntaxError, ValueError, TypeError, RecursionError):
+        description = 'usage: .cal table <expression> for n in <start>..<stop> step <step>'
+
+    await send_embed(ctx, title='♾ Calculator', text=description)
+
+
+def to_string(result):
+    """converts a result into a str rounded to 3 decimal places.
+
+    integers that are too long to display are shown in scientific notation.
+
+    Parameters
+    ----------
+    :param result: the result to convert.
+    :return: a str representation of the result.
+    """
+    decimal_places = 3
+    if isinstance(result, int) and result.bit_length() > 160:
+        exponent = math.floor(math.log10(abs(result)))
+        mantissa = 10 ** (math.log10(abs(result)) - exponent)
+        sign = '-' if result < 0 else ''
+
+        return f'{sign}{mantissa:.{decimal_places}f}e+{exponent}'
+
+    return str(round(result, decimal_places))
+
+
 def check_edge_cases(expression):
     """checks for edge cases.
 
@@ -71,10 +129,6 @@ def check_edge_cases(expression):
     if len([x for x in expression if x.isdigit()]) < 2:
         return False
 
-    # expression contains a letter.
-    if re.compile('[a-zA-Z]+').search(expression) is not None:
-        return False
-
     return True
 
 
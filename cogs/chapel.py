@@ -1,5 +1,6 @@
 from discord.ext import commands
-from cogs.bot import send_embed, json_to_dict
+from cogs.bot import send_embed
+from my_classes.ChapelSchedule import chapel_schedule
 
 
 class Chapel(commands.Cog):
@@ -16,6 +17,11 @@ async def get_chapel_week(ctx, week_num):
 
     chapel schedule is stored in a local .json file
         to allow others to modify the schedule without touching the code.
+    the schedule is compiled into a date sorted index, every look up is a direct look up.
+        'today' - display today's chapel.
+        'next'  - display the next chapel after today.
+        a digit - display the chapel for that week.
+        None    - display every chapel.
     a 'no week was found' error message will be displayed:
         when the given week is not found in the file that is storing the chapel schedule..
 
@@ -25,35 +31,23 @@ async def get_chapel_week(ctx, week_num):
     :param str week_num: the chapel week to print.
     :return: a str representation of the chapel schedule.
     """
-    # week number must be none or a digit.
-    if week_num is not None and not week_num.isdigit():
-        return
-
     # get chapel schedule.
-    contents = json_to_dict('json_files/chapel/schedule.json')
-
-    schedule = []
-    for week in contents:
-        if week_num is not None and week != f'Week {week_num}':
-            continue
-
-        schedule.append('')
-        schedule.append(f'__**{week}**__')
-
-        # get chapel information for each week.
-        for date in contents[week]:
-            day_of_week = contents[week][date]['day_of_week']
-            speaker = contents[week][date]['speaker']
-
-            schedule.append(f'**{date}** [{day_of_week}] - *{speaker}*')
-
-    # print chapel schedule.
-    separator = '\n'
-    description = separator.join(schedule)
+    if week_num is not None and week_num.lower() == 'today':
+        description = chapel_schedule.today()
+        error = '*no scheduled chapel today.*'
+    elif week_num is not None and week_num.lower() == 'next':
+        description = chapel_schedule.next()
+        error = '*no upcoming chapel.*'
+    elif week_num is None or week_num.isdigit():
+        description = chapel_schedule.week(week_num)
+        error = f'*no scheduled chapel for week {week_num}.*'
+    # week number must be none, a digit, today, or next.
+    else:
+        return
 
     # print error message.
     if len(description) == 0:
-        await send_embed(ctx, title=get_chapel_title(), text=f'*no scheduled chapel for week {week_num}.*')
+        return await send_embed(ctx, title=get_chapel_title(), text=error)
 
     # display chapel information.
     await send_embed(ctx, title=get_chapel_title(), text=description)
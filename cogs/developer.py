@@ -1,7 +1,10 @@
 import discord
 import os
 from discord.ext import commands
-from cogs.bot import bot, send_embed, json_to_dict, to_member
+from cogs.bot import bot, send_embed, json_to_dict, to_member, role_reactions, weather_cache, passage_cache, \
+    passage_store, rooms, permissions, handoffs, reaction_router
+from my_classes.Http import http_client
+from my_classes.Worker import sweep_stats
 
 
 class Developer(commands.Cog):
@@ -29,6 +32,40 @@ class Developer(commands.Cog):
         if arg.lower() == 'form':
             await display_blank_google_form(ctx)
 
+        # display how many role edit requests were saved.
+        if arg.lower() == 'roles':
+            await send_embed(ctx, title=get_dev_title(), text=role_reactions.stats())
+
+        # display the latency and errors of every external api.
+        if arg.lower() == 'http':
+            await send_embed(ctx, title=get_dev_title(), text=http_client.stats())
+
+        # display how many private rooms are open and how often they are generated.
+        if arg.lower() == 'rooms':
+            await send_embed(ctx, title=get_dev_title(), text=rooms.stats())
+
+        # display how many prompts are waiting for a reaction.
+        if arg.lower() == 'prompts':
+            await send_embed(ctx, title=get_dev_title(), text=reaction_router.stats())
+
+        # display every running readiness sweep and how long it has been running.
+        if arg.lower() == 'sweeps':
+            await send_embed(ctx, title=get_dev_title(), text=sweep_stats())
+
+        # display how long tutors wait for the next student.
+        if arg.lower() == 'handoffs':
+            await send_embed(ctx, title=get_dev_title(), text=handoffs.stats())
+
+        # display how many permission overwrite requests were saved.
+        if arg.lower() == 'permissions':
+            await send_embed(ctx, title=get_dev_title(), text=permissions.stats())
+
+        # display how many look ups were returned from a cache.
+        if arg.lower() == 'cache':
+            description = f'**weather**\n{weather_cache.stats()}\n\n**esv**\n{await passage_cache.stats()}\n\n' \
+                          f'**passage store**\n{passage_store.stats()}'
+            await send_embed(ctx, title=get_dev_title(), text=description)
+
         # load, unload, or reload a cog.
         if arg.lower() == 'load' or arg.lower() == 'unload' or arg.lower() == 'reload':
             await modify_cogs_file(ctx, arg, arg2)
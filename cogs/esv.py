@@ -1,7 +1,11 @@
 import os
-import requests
 from discord.ext import commands
-from cogs.bot import send_embed
+from cogs.bot import send_embed, passage_cache, passage_store
+from my_classes.Http import http_client, HttpError
+from my_classes.Passage import passages, to_reference
+
+# the ESV api, the url can be pointed at a local server for testing.
+http_client.register('esv', os.getenv('ESV_API_URL') or 'https://api.esv.org/v3', timeout=5)
 
 
 class ESV(commands.Cog):
@@ -14,30 +18,45 @@ class ESV(commands.Cog):
 
         # Bible verse numbers are wrapped with '[]' in the api
         # replace brackets with discord's single line code block.
-        description = get_esv_verse(passage).replace('[', '`').replace(']', '`')
+        description = (await get_esv_verse(passage)).replace('[', '`').replace(']', '`')
 
         await send_embed(ctx, title='🙏🏻 English Standard Version', text=description)
 
 
-def get_esv_verse(passage):
+async def get_esv_verse(passage):
     """looks up the given passage in English Standard Version using an ESV API.
 
     for the api's documentation and optional parameters:
         https://api.esv.org/docs/passage-text/
     the api returns the passage in a .json format.
     the .json file will be converted to a str and then printed to the user.
+    passages are looked up in the local passage store first, if there is one.
+        to keep the command working when the api is slow or over its quota.
+    passages are cached on disk by canonical reference (i.e. 'jn 3 16' -> 'John 3:16').
+        a cached passage is returned without sending a request to the api.
+        a passage that cannot be parsed is sent to the api as typed and is not cached.
 
     Parameters
     ----------
     :param str passage: the book, chapter, and verse to look up.
     :return: a string of the given passage.
     """
-    url = 'https://api.esv.org/v3/passage/text'
+    parsed = passages.parse(passage)
+    reference = to_reference(parsed)
+
+    text = passage_store.get(parsed)
+    if text is not None:
+        return f'{reference}\n\n{text.strip()}'
+
+    if reference is not None:
+        text = await passage_cache.get(reference)
+        if text is not None:
+            return text
 
     params = {
-        'q': passage,
-        'include-footnotes': False,  # do not display footnotes.
-        'include-short-copyright': False  # do not display (ESV)
+        'q': reference or passage,
+        'include-footnotes': 'false',  # do not display footnotes.
+        'include-short-copyright': 'false'  # do not display (ESV)
     }
 
     headers = {
@@ -45,9 +64,19 @@ def get_esv_verse(passage):
     }
 
     # get passage from api.
-    response = requests.get(url, params=params, headers=headers).json()['passages']
+    try:
+        _, response = await http_client.get_json('esv', '/passage/text/', params=params, headers=headers)
+    except HttpError:
+        return 'ESV service is unavailable.'
+
+    texts = response.get('passages') if isinstance(response, dict) else None
+    if not texts:
+        return 'passage not found.'
+
+    if reference is not None:
+        await passage_cache.put(reference, texts[0])
 
-    return response[0] if response else 'passage not found.'
+    return texts[0]
 
 
 # connect this cog to bot.
@@ -1,37 +1,72 @@
-import os
 from discord.ext import commands
-from cogs.bot import send_embed, json_to_dict
+from cogs.bot import send_embed
+from my_classes.CheatSheet import cheat_sheets
 
 
 class Java(commands.Cog):
     """listens for the java_cheat_sheet commands."""
 
     @commands.command()
-    async def java(self, ctx, arg: str = None):
-        if arg is not None:
-            await get_java_cheat_sheet(ctx, arg)
+    async def java(self, ctx, arg: str = None, *, term: str = None):
+        if arg is None:
+            return
 
+        # search every cheat sheet.
+        if arg.lower() == 'search':
+            return await search_java_cheat_sheets(ctx, term)
 
-async def get_java_cheat_sheet(ctx, method):
+        await get_java_cheat_sheet(ctx, arg, term)
+
+
+async def get_java_cheat_sheet(ctx, method, term=None):
     """displays a java_cheat_sheet cheat sheet for a given class.
 
     each class method is stored in its own .json file
         so others can make modification to content without touching the code.
+    class names are looked up by the name of their .json file.
+        if the class is not found, then every cheat sheet is searched instead.
 
     Parameters
     ----------
     :param Context ctx: the current Context.
     :param str method: the specific method to display.
+    :param str term: the rest of the command, used in the search if the class is not found.
     """
     # print cheat sheet.
-    file_directory = 'json_files/java_cheat_sheet'
-    java_file = f'{method.lower()}.json'
-    for file in os.listdir(file_directory):
-        if java_file == file:
-            cheat_sheet = json_to_dict(f'{file_directory}/{java_file}')
-            title = f'☕ Java {method.lower().capitalize()} Methods'
+    cheat_sheet = cheat_sheets.get_class(method)
+    if cheat_sheet is not None:
+        title = f'☕ Java {method.lower().capitalize()} Methods'
+
+        return await send_embed(ctx, title=title, text=get_cheat_sheet(cheat_sheet))
+
+    await search_java_cheat_sheets(ctx, method if term is None else f'{method} {term}')
+
+
+async def search_java_cheat_sheets(ctx, term):
+    """displays the methods across every cheat sheet that best match the given words.
+
+    display a 'no methods found' error message:
+        if no method matches any of the given words.
+
+    Parameters
+    ----------
+    :param Context ctx: the current Context.
+    :param str term: the words to search for.
+    """
+    if term is None:
+        return
 
-            return await send_embed(ctx, title=title, text=get_cheat_sheet(cheat_sheet))
+    results = []
+    for java_class, data_type, method, description in cheat_sheets.search(term):
+        results.append(f'**{java_class.capitalize()}** `{method}` [{data_type}] - {description}')
+
+    # print error message.
+    if len(results) == 0:
+        classes = ', '.join(cheat_sheets.available_classes())
+        return await send_embed(ctx, title=get_java_title(term), text=f'*no methods found.*\n\nclasses: {classes}')
+
+    separator = '\n'
+    await send_embed(ctx, title=get_java_title(term), text=separator.join(results))
 
 
 def get_cheat_sheet(cheat_sheet):
@@ -55,13 +90,9 @@ def get_cheat_sheet(cheat_sheet):
     return separator.join(sheet)
 
 
-def get_available_java_class():
-    """stores every available java_cheat_sheet cheat sheet class in an array.
-
-    :return: an array of available java_cheat_sheet class
-    """
-
-    return ['array', 'list', 'map', 'math', 'queue', 'scanner', 'string']
+def get_java_title(term):
+    """:return: a str that represents the default embed title for the search command."""
+    return f'☕ Java Search: {term}'
 
 
 # connect this cog to bot.
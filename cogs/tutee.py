@@ -1,9 +1,10 @@
+import asyncio
 import discord
 import os
 import re
 from discord.ext import commands
 from cogs.bot import bot, send_embed, to_member, send_courses_reaction_message, tutoring_sessions, tutoring_accounts, \
-    give_admin_permissions, private_rooms, display_queue, is_bot_channel
+    rooms, display_queue, is_bot_channel, store_last_bot_msg
 from my_classes.Course import Course
 from my_classes.Student import Student
 
@@ -211,7 +212,7 @@ async def sign_in(ctx, course_num, tutor_name, student_accounts):
     # if course number does not exists.
     if tutoring_sessions.get(course_num) is None:
         course_code = await send_courses_reaction_message(ctx, course_num)
-        course_num = course_code[-3:]
+        course_num = course_code[-3:] if course_code is not None else None
 
     # validate course number.
     if course_num is None:
@@ -336,7 +337,8 @@ async def generate_private_voice_channel(ctx, other_members):
             because the bot cannot force members to join a voice channel, it can only move members.
         all other mentioned members.
     to prevent spamming this command:
-        the rooms will be saved in a dictionary (key = room-id, value = member's-discord-id).
+        every member can only own one room at a time.
+    admin permissions and invites are sent to every mentioned member at the same time.
     display 'room already generated' error message:
         when a member tries to generate a room, but has one in the server already.
     the bot by default will move the member to the newly generated room
@@ -352,56 +354,49 @@ async def generate_private_voice_channel(ctx, other_members):
     member = server.get_member(ctx.author.id)
 
     # display 'room already generated' error message.
-    if member.id in private_rooms.values():
+    if rooms.room_of(member.id) is not None:
         return await send_embed(ctx, text='*you already own a room.*')
 
-    # generate a private voice channel.
-    category_id = int(os.getenv("PRIVATE_ROOM_CATEGORY_ID"))
-    private_room_category = list(filter(lambda x: x.id == category_id, server.categories))[0]
-    private_room_channel = await private_room_category.create_voice_channel(f'Private Room: {member}')
-    await set_private_room_permissions(server, private_room_channel)
+    # find the other mentioned members.
+    guests, invalid = [], []
+    for mention in other_members:
+        guest_id = re.sub(r'\D', '', str(mention))
+        if not guest_id:
+            continue
+
+        guest = server.get_member(int(guest_id))
+        if guest is None:
+            invalid.append(mention)
+        elif guest != member and guest != bot.user:
+            guests.append(guest)
 
-    # invite to send to members.
-    invite = await private_room_channel.create_invite()
+    # generate a private voice channel.
+    private_room_channel, invite = await rooms.open(server, member, guests)
 
     # move/send an invite to the member.
     if member.voice is None:
-        await ctx.author.send(f'Here is a link to your private room:\n {invite}')
+        store_last_bot_msg(await ctx.author.send(f'Here is a link to your private room:\n {invite}'))
     else:
         await member.move_to(private_room_channel)
 
-    # send other members an invite.
-    other_members.append(member.id)
-    for member in other_members:
-        member = re.sub(r'\D', '', str(member))
-        if member:
-            try:
-                member = server.get_member(int(member))
-                await give_admin_permissions(member, private_room_channel)
-
-                # send other mentioned users a DM link to the private room.
-                if member != member and member != bot.user:
-                    await send_embed(user=member.id, text=f'<@!{member.id}> has created a private room and invited you')
-                    await bot.get_user(member.id).send(invite)
-            except discord.errors.InvalidArgument:
-                await send_embed(ctx, text=f'{member} *is an invalid member.*')
+    # send other mentioned users a DM link to the private room at the same time.
+    await asyncio.gather(*[send_room_invite(member, guest, invite) for guest in guests], return_exceptions=True)
 
-    # add member's room to a dictionary.
-    private_rooms[private_room_channel.id] = member.id
+    for mention in invalid:
+        await send_embed(ctx, text=f'{mention} *is an invalid member.*')
 
 
-async def set_private_room_permissions(server, channel):
-    """set the given channel with private room permissions.
+async def send_room_invite(owner, guest, invite):
+    """send a mentioned member a DM link to a private room.
 
-    private room permissions are:
-        permission to allow students to freely
-
-    :param discord.Server server: the server object that the channel is in.
-    :param discord.Channel channel: the channel object that the permission will be set in.
-    :return:
+    Parameters
+    ----------
+    :param discord.Member owner: the member that generated the room.
+    :param discord.Member guest: the member that was invited.
+    :param discord.Invite invite: the invite to the room.
     """
-    await channel.set_permissions(server.default_role, manage_permissions=False, connect=False, view_channel=False,
-                                  stream=True, move_members=False)
+    await send_embed(user=guest.id, text=f'<@!{owner.id}> has created a private room and invited you')
+    store_last_bot_msg(await bot.get_user(guest.id).send(invite))
 
 
 async def display_error_msg(ctx):
@@ -1,7 +1,10 @@
+import asyncio
 import discord
 import os
+import time
 from discord.ext import commands
-from cogs.bot import bot, send_embed, to_member, send_courses_reaction_message, tutoring_sessions, display_queue, is_bot_channel
+from cogs.bot import bot, send_embed, to_member, send_courses_reaction_message, tutoring_sessions, display_queue, \
+    is_bot_channel, store_last_bot_msg, ledger, permissions, handoffs, reaction_router
 from my_classes.Worker import Worker
 from my_classes.GoogleSheet import GoogleSheet
 from datetime import date, datetime
@@ -104,7 +107,7 @@ async def announce_session_started(ctx, course_num, tutor_accounts):
                      text=f'{tutor.ctx.mention()}\'s tutoring session has started!')
 
     # ping users in class course tutoring has started.
-    await bot.get_channel(channel_id).send(role.mention)
+    store_last_bot_msg(await bot.get_channel(channel_id).send(role.mention))
 
     # print confirmation for tutor.
     await send_embed(ctx, title=f'Tutor Accounts', text=f'tutees of {tutor.course.code} thank you for tutoring!')
@@ -123,7 +126,7 @@ async def set_session(ctx, course_num, tutor_accounts):
     # set tutor's session.
     if course is None:
         code = await send_courses_reaction_message(ctx, course_num)
-        course = tutoring_sessions.get(code[-3:])
+        course = tutoring_sessions.get(code[-3:]) if code is not None else None
 
     # add tutor object to tutor object dictionary.
     if course is not None:
@@ -139,6 +142,9 @@ async def end_session(ctx, tutor, account):
     :param {} account: the dictionary that stores the tutor objects.
     """
     try:
+        # stop asking students if they are ready.
+        await tutor.stop_sweep()
+
         # remove tutor object from accounts.
         account.pop(tutor.ctx.discord_id())
 
@@ -167,6 +173,9 @@ async def get_next_student(ctx, tutor):
     display an updated queue to the bot announcement channel.
     a 'no student in queue' error message will be displayed:
         if there are no students in the current queue.
+    the steps that do not depend on each other run at the same time:
+        refreshing the queue message, moving the previous student back, and asking the next student if they are ready.
+    asking the students if they are ready is a sweep owned by the tutor that runs after this command returns.
 
     Parameters
     ----------
@@ -185,23 +194,22 @@ async def get_next_student(ctx, tutor):
     if tutor.course.que_is_empty():
         return await send_embed(ctx, text='*there are no students to tutor!*')
 
-    # update queue
-    tutor.course.update_que()
+    start = time.monotonic()
 
-    # display updated queue.
-    await display_queue(ctx, tutor.course)
+    # the student being helped has to be found before update_que moves them to the end of the queue.
+    helped = tutor.course.queue[0] if tutor.course.queue[0].being_helped else None
 
-    # move student back to their previous channel.
-    await push_current_student(ctx, tutor.course.queue[0], tutor)
+    # update queue
+    tutor.course.update_que()
 
     # get next student.
-    await find_next_student(ctx, tutor)
+    tutor.start_sweep(find_next_student(ctx, tutor, start))
 
-    # tutor no longer has a reaction message circulating the queue.
-    tutor.reaction_msg = None
+    # display updated queue and move student back to their previous channel.
+    await asyncio.gather(display_queue(ctx, tutor.course), push_current_student(ctx, helped, tutor))
 
 
-async def find_next_student(ctx, tutor):
+async def find_next_student(ctx, tutor, start=None, rounds=3, backoff=30):
     """find the next student in queue that needs help.
 
     the bot will DM a reaction message to the first student in the queue asking if they need help.
@@ -210,6 +218,10 @@ async def find_next_student(ctx, tutor):
     this function will repeat until a student is ready or the tutor decides to stop waiting for a response.
         if the last student in the queue is not ready
             then the bot will go back to the top of queue to find the next student that is ready.
+        the queue is gone through at most [rounds] times.
+            the bot waits [backoff] seconds before the second round, and twice as long before every round after.
+    the tutor can stop the sweep at any time ('.tutor stop' or '.tutor end').
+        the reaction message the student has not answered is deleted.
     the tutor will get updates on how each student is responding.
         student got your invite - if the tutor is waiting for the student to accept the VC invite.
         student skipped - if the student reacted with a 'not ready emoji'.
@@ -219,6 +231,9 @@ async def find_next_student(ctx, tutor):
     ----------
     :param Context ctx: the current Context.
     :param 'Worker' tutor: the tutor that called this function.
+    :param float start: the time.monotonic() the tutor asked for the next student.
+    :param int rounds: the maximum number of times the queue is gone through.
+    :param int backoff: the number of seconds to wait before the second round.
     :return: the objet that represents the next student being helped.
     """
     ready_emoji = '👍🏼'
@@ -226,38 +241,58 @@ async def find_next_student(ctx, tutor):
 
     # cycle through the queue until a student is ready.
     index = 0
-    while True:
-        student = tutor.course.queue[index]
-
-        # DM reaction message to student.
-        reaction = await confirm_student_is_ready(tutor, student, ready_emoji, not_ready_emoji)
-
-        # tutor canceled getting the next student.
-        if tutor.reaction_msg is None:
-            return
-
-        # student did not respond.
-        if reaction is None:
-            await send_embed(ctx, text=f'{student.ctx.mention()} did not respond.')
-
-        if reaction is not None:
-            # student is ready.
-            if str(reaction) == ready_emoji:
-                await pull_student(ctx, tutor, student, index)
-                student.being_helped = True
-                return
-
-            # student is not ready.
-            if str(reaction) == not_ready_emoji:
-                await send_embed(ctx, text=f'{student.ctx.mention()} skipped.')
+    prompt = start
+    try:
+        while True:
+            student = tutor.course.queue[index]
 
-        # if the last student leaves the queue.
-        if tutor.course.que_is_empty():
+            # DM reaction message to student, the message is deleted once the student responds.
+            reaction = await confirm_student_is_ready(tutor, student, ready_emoji, not_ready_emoji, prompt)
+            tutor.reaction_msg = None
+            prompt = None
+
+            # student did not respond.
+            if reaction is None:
+                await send_embed(ctx, text=f'{student.ctx.mention()} did not respond.')
+
+            if reaction is not None:
+                # student is ready.
+                if str(reaction) == ready_emoji:
+                    pulled = time.monotonic()
+                    await pull_student(ctx, tutor, student, index)
+                    student.being_helped = True
+
+                    handoffs.record('pull', pulled)
+                    if start is not None:
+                        handoffs.record('handoff', start)
+                    return
+
+                # student is not ready.
+                if str(reaction) == not_ready_emoji:
+                    await send_embed(ctx, text=f'{student.ctx.mention()} skipped.')
+
+            # if the last student leaves the queue.
+            if tutor.course.que_is_empty():
+                return await display_queue(ctx, tutor.course)
+
+            # get next student on the wait list.
+            index = (index + 1) % tutor.course.size
+
+            # every student has been asked.
+            if index == 0:
+                tutor.sweep_round += 1
+                if tutor.sweep_round >= rounds:
+                    return await send_embed(ctx, text=f'*no students were ready after {rounds} rounds.*')
+                await asyncio.sleep(backoff * 2 ** (tutor.sweep_round - 1))
+
+    # delete the reaction message if the tutor stopped the sweep before the student responded.
+    finally:
+        if tutor.reaction_msg is not None:
+            try:
+                await tutor.reaction_msg.delete()
+            except discord.HTTPException:
+                pass
             tutor.reaction_msg = None
-            return await display_queue(ctx, tutor.course)
-
-        # get next student on the wait list.
-        index = (index + 1) % tutor.course.size
 
 
 async def pull_student(ctx, tutor, student, index):
@@ -271,6 +306,7 @@ async def pull_student(ctx, tutor, student, index):
             if the tutor is not in a voice channel.
         the bot will send the student an invite link to the tutor's voice channel:
             if the student is not in a voice channel.
+            every tutor's voice channel has one invite that is reused for every student.
 
     Parameters
     ----------
@@ -286,23 +322,25 @@ async def pull_student(ctx, tutor, student, index):
     try:
         # store user's voice channel
         student.prev_voice_channel = student.ctx.voice().channel
-        # move student to tutor's voice channel.
-        await student.ctx.member().move_to(tutor.ctx.voice().channel)
-        # display updated queue.
-        return await display_queue(ctx, tutor.course, direct_msg=True, announcement=True)
+        # move student to tutor's voice channel and display updated queue.
+        await asyncio.gather(student.ctx.member().move_to(tutor.ctx.voice().channel),
+                             display_queue(ctx, tutor.course, direct_msg=True, announcement=True))
+        return
 
     # student is not in a voice channel
     except AttributeError:
         # get tutor's voice channel
         try:
-            # generate invite for student.
-            invite = await tutor.ctx.voice().channel.create_invite()
-            # give student permission to connect.
-            await tutor.ctx.voice().channel.set_permissions(student.ctx.member(), connect=True)
-            # send student invite.
-            await bot.get_user(student.ctx.discord_id()).send(invite)
-            # display tutor an update.
-            await send_embed(ctx, text=f'waiting for {student.ctx.mention()} to accept your invite.')
+            channel = tutor.ctx.voice().channel
+            # get invite for student and give student permission to connect.
+            invite, _ = await asyncio.gather(handoffs.invite(channel), permissions.set(
+                channel, student.ctx.member(), discord.PermissionOverwrite(connect=True)))
+            ledger.add_overwrite(channel.id, student.ctx.discord_id())
+            # send student invite and display tutor an update.
+            message, _ = await asyncio.gather(
+                bot.get_user(student.ctx.discord_id()).send(invite),
+                send_embed(ctx, text=f'waiting for {student.ctx.mention()} to accept your invite.'))
+            store_last_bot_msg(message)
 
         # tutor's voice channel not found.
         except AttributeError:
@@ -310,7 +348,7 @@ async def pull_student(ctx, tutor, student, index):
 
 
 async def stop_pull(ctx, tutor):
-    """removes the reaction message sent by a tutor.
+    """stop the tutor's readiness sweep and remove the reaction message sent by a tutor.
 
     display 'message not found' error message:
         if tutor does not have a reaction message circulating the queue.
@@ -320,18 +358,15 @@ async def stop_pull(ctx, tutor):
     :param Context ctx: the current Context.
     :param 'Worker' tutor: the object that represents the tutor.
     """
-    # delete reaction message
-    try:
-        await tutor.reaction_msg.delete()
-        await send_embed(ctx, text='no longer asking for the next student.')
-        tutor.reaction_msg = None
+    # cancel the sweep, the sweep deletes its reaction message.
+    if tutor is not None and await tutor.stop_sweep():
+        return await send_embed(ctx, text='no longer asking for the next student.')
 
     # no reaction message to delete.
-    except AttributeError:
-        await send_embed(ctx, text='there are no reaction message to stop.')
+    await send_embed(ctx, text='there are no reaction message to stop.')
 
 
-async def confirm_student_is_ready(tutor, student, ready_emoji, not_ready_emoji):
+async def confirm_student_is_ready(tutor, student, ready_emoji, not_ready_emoji, start=None):
     """send a direct reaction message to given student to confirm student is ready to meet with the tutor.
 
     Parameters
@@ -340,13 +375,18 @@ async def confirm_student_is_ready(tutor, student, ready_emoji, not_ready_emoji)
     :param Student student: the student the reaction message is being sent to.
     :param emoji ready_emoji: the emoji that represents the student is ready to meet with the tutor.
     :param emoji not_ready_emoji: the emoji that represents the student is not ready to meet with the tutor.
+    :param float start: the time.monotonic() the tutor asked for the next student, None if this is not the first ask.
     :return: the reaction message.
     """
     description = f'do you need help?\n\n' \
                   f'{ready_emoji} - ready! connect me to the tutor.\n\n' \
                   f'{not_ready_emoji} - not yet, come back to me.'
 
-    tutor.reaction_msg = await send_embed(user=student.ctx.discord_id(), title=get_tutor_title(), text=description)
+    tutor.reaction_msg = await send_embed(user=student.ctx.discord_id(), title=get_tutor_title(), text=description,
+                                          options={ready_emoji: 'ready!', not_ready_emoji: 'not yet'})
+    if start is not None:
+        handoffs.record('prompt', start)
+
     return await add_reaction_to_message(tutor.reaction_msg, student.discord_id, [ready_emoji, not_ready_emoji], 15)
 
 
@@ -363,31 +403,48 @@ async def push_current_student(ctx, student, tutor):
             because they did not have a previous channel.
     if the student decided to move themselves to another voice channel
         then the bot will not move the student to avoid being put in an unwanted voice channel.
+    the permission is removed while the student is being moved.
 
     Parameters
     ----------
     :param Context ctx: the current Context.
-    :param Students student: the object that represents student being moved.
+    :param Students student: the object that represents student being moved, None if no student was being helped.
     :param Tutors tutor: the object that represents a tutor.
     """
     # only move student that has been helped to the previous voice channel.
-    if student.being_helped is False:
+    if student is None:
         return
 
     try:
+        channel = tutor.ctx.voice().channel
+
         # remove student's permission to access tutor's voice channel.
-        await tutor.ctx.voice().channel.set_permissions(student.ctx.member(), overwrite=None)
+        requests = [permissions.set(channel, student.ctx.member(), None)]
 
-        if tutor.ctx.voice().channel == student.ctx.voice().channel:
-            # move student back to their previous voice channel.
-            try:
-                await student.ctx.member().move_to(student.prev_voice_channel)
-            except discord.errors.HTTPException:  # previous channel no longer exists.
-                await student.ctx.member().move_to(None)  # disconnect student from voice channel.
+        # move student back to their previous voice channel.
+        voice = student.ctx.voice()
+        if voice is not None and voice.channel == channel:
+            requests.append(return_student(student))
+
+        await asyncio.gather(*requests)
+        ledger.remove_overwrite(channel.id, student.ctx.discord_id())
     except AttributeError:
         await send_embed(ctx, title='tutor\'s voice channel not found.')
 
 
+async def return_student(student):
+    """move the student back to their previous voice channel, or disconnect them if it no longer exists.
+
+    Parameters
+    ----------
+    :param Students student: the object that represents student being moved.
+    """
+    try:
+        await student.ctx.member().move_to(student.prev_voice_channel)
+    except discord.errors.HTTPException:  # previous channel no longer exists.
+        await student.ctx.member().move_to(None)  # disconnect student from voice channel.
+
+
 async def add_reaction_to_message(message, author, choice_emojis, timeout):
     """add reactions to given message and wait for an intended author to respond to it.
 
@@ -405,27 +462,7 @@ async def add_reaction_to_message(message, author, choice_emojis, timeout):
     :param int timeout: the number of seconds the intended author have to respond.
     :return: str: the emoji that represents the intended author's reaction.
     """
-    # add reactions to the message.
-    for emoji in choice_emojis:
-        await message.add_reaction(emoji)
-
-    # function to validate author and reaction added.
-    def check(reaction, user):
-        return user.id == author and str(reaction.emoji) in choice_emojis
-
-    # wait for reaction.
-    try:
-        reaction, _ = await bot.wait_for('reaction_add', check=check, timeout=timeout)
-    except:
-        reaction = None
-
-    # try if the message hasn't been removed by the tutor prior to deletion.
-    try:
-        await message.delete()
-    except:
-        pass
-
-    return reaction
+    return await reaction_router.ask(message, author, choice_emojis, timeout)
 
 
 async def edit_student_in_queue(ctx, tutor, first=None, second=None, move=False, swap=False, remove=False, clear=False):
@@ -510,7 +547,7 @@ async def generate_sing_in_sheet(ctx, tutor, day=None):
 
     # send sign-in sheet to tutor.
     with open(f'{workbook.path}/{workbook.file_name}', 'rb') as file:
-        await bot.get_user(ctx.author.id).send(file=discord.File(file, workbook.file_name))
+        store_last_bot_msg(await bot.get_user(ctx.author.id).send(file=discord.File(file, workbook.file_name)))
 
 
 async def is_tutor(ctx):
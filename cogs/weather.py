@@ -1,30 +1,53 @@
-import discord
+import asyncio
 import os
-import requests
 from discord.ext import commands
-from cogs.bot import send_embed
+from cogs.bot import send_embed, weather_cache
+from my_classes.Http import http_client, HttpError
+
+# the OpenWeather api, the url can be pointed at a local server for testing.
+http_client.register('weather', os.getenv('WEATHER_API_URL') or 'http://api.openweathermap.org/data/2.5', timeout=5)
+
+
+# the systems of units a look up can be displayed in.
+UNITS = ('imperial', 'metric', 'kelvin')
+
+MAX_CITIES = 5  # the maximum number of cities in one command.
+
+# the ISO 3166 country codes, a two letter word is only a country code if it is one of them.
+COUNTRIES = frozenset('''
+AD AE AF AG AI AL AM AO AQ AR AS AT AU AW AX AZ BA BB BD BE BF BG BH BI BJ BL BM BN BO BQ BR BS BT BV BW BY BZ
+CA CC CD CF CG CH CI CK CL CM CN CO CR CU CV CW CX CY CZ DE DJ DK DM DO DZ EC EE EG EH ER ES ET FI FJ FK FM FO FR
+GA GB GD GE GF GG GH GI GL GM GN GP GQ GR GS GT GU GW GY HK HM HN HR HT HU ID IE IL IM IN IO IQ IR IS IT JE JM JO JP
+KE KG KH KI KM KN KP KR KW KY KZ LA LB LC LI LK LR LS LT LU LV LY MA MC MD ME MF MG MH MK ML MM MN MO MP MQ MR MS MT
+MU MV MW MX MY MZ NA NC NE NF NG NI NL NO NP NR NU NZ OM PA PE PF PG PH PK PL PM PN PR PS PT PW PY QA RE RO RS RU RW
+SA SB SC SD SE SG SH SI SJ SK SL SM SN SO SR SS ST SV SX SY SZ TC TD TF TG TH TJ TK TL TM TN TO TR TT TV TW TZ UA UG
+UM US UY UZ VA VC VE VG VI VN VU WF WS YE YT ZA ZM ZW
+'''.split())
 
 
 class Weather(commands.Cog):
     """listens for the weather commands."""
 
     @commands.command()
-    async def weather(self, ctx, city=None, zip_code='', country='US', units='imperial'):
-        if city is None:
+    async def weather(self, ctx, *, cities=None):
+        if cities is None:
             return
 
         # display current weather.
-        await display_weather(ctx, city, zip_code, country, units)
+        await display_weather(ctx, cities)
 
 
-async def display_weather(ctx, city, zip_code, country, units):
-    """displays the current weather and weather condition of given city.
+async def display_weather(ctx, cities):
+    """displays the current weather and weather condition of every given city in one message.
 
     for api documentation and parameters:
         https://openweathermap.org/current
+    cities are separated by commas (i.e. 'riverside, corona, irvine').
+        every city is looked up at the same time through the weather cache and the shared http client.
+        only the first few cities are looked up to keep the message short.
     local weather lookup by default is by city name.
         as most users will be more familiar with a city name than its zip code.
-    user have the option:
+    user have the option for each city:
         to including the the zip code after the city name for a less ambiguous lookup.
         to specify a country code to search within that country.
             a few example of country codes:
@@ -38,32 +61,107 @@ async def display_weather(ctx, city, zip_code, country, units):
     examples of weather conditions are:
         clear sky, few clouds, rain, thunderstorm, snow, mist, etc.
     a 'city not found' error message will be displayed:
-        if local weather data for given city name is not found.
+        if local weather data for given city name is not found (404).
+    a 'service unavailable' error message will be displayed:
+        if the api times out, keeps failing, or sends anything else (i.e. 401 invalid api key).
+    the weather is cached by city, zip code, country code, and units.
+        OpenWeather updates the current weather about every 10 minutes.
+        so the same look up within 10 minutes does not send another request.
 
     Parameters
     ----------
     :param Context ctx: the current Context.
+    :param str cities: the cities separated by commas.
+    """
+    segments = [segment for segment in cities.split(',') if segment.strip()][:MAX_CITIES]
+    descriptions = await asyncio.gather(*[look_up_weather(*parse_city(segment)) for segment in segments])
+
+    separator = '\n'
+    await send_embed(ctx, title=':white_sun_rain_cloud: Weather', text=separator.join(descriptions))
+
+
+def parse_city(segment):
+    """convert one city of the command into a weather look up.
+
+    the units and zip code can be anywhere after the city name.
+        example: 'los angeles 90015 US metric' -> ('los angeles', '90015', 'US', 'metric')
+    a word is:
+        the units if it is one of the systems of units.
+        the zip code if it is a number.
+        otherwise part of the city name.
+    the last word of the city name is the country code if it is an ISO country code.
+        other two letter words are part of the city name (i.e. 'port st lucie').
+
+    Parameters
+    ----------
+    :param str segment: the text of one city.
+    :return: a tuple (city, zip code, country code, units).
+    """
+    words = segment.replace('+', ' ').split()
+    city, zip_code, country, units = [words[0]], '', 'US', 'imperial'
+
+    for word in words[1:]:
+        if word.lower() in UNITS:
+            units = word.lower()
+        elif word.isdigit():
+            zip_code = word
+        else:
+            city.append(word)
+
+    if len(city) > 1 and city[-1].upper() in COUNTRIES:
+        country = city.pop().upper()
+
+    return ' '.join(city), zip_code, country, units
+
+
+async def look_up_weather(city, zip_code, country, units):
+    """
+    Parameters
+    ----------
     :param str city: the city name for the local weather.
     :param str zip_code: the zip code for the local weather
-    :param str country: the country code for the local weather..
+    :param str country: the country code for the local weather.
     :param str units: the units the temperature will be displayed.
+    :return: a str that represents the current weather of given city.
     """
-    api_key = os.getenv('WEATHER_API_KEY')
-    url = f'http://api.openweathermap.org/data/2.5/weather?q={city},{zip_code},{country}&appid={api_key}&units={units}'
-    response = requests.get(url).json()
+    key = (city.lower(), zip_code, country, units)
 
     try:
-        temperature = round(response['main']['temp'])
-        degrees = get_weather_units(units)
-        city_name = response['name']
-        country_code = response['sys']['country']
-        condition = response['weather'][0]['description']
+        weather = await weather_cache.get(key, lambda: get_weather(*key))
+    except HttpError:
+        return f'weather service is unavailable for {city}.'
 
-        description = f'it is {temperature} {degrees} with {condition} in {city_name}, {country_code}'
-    except:
-        description = f'cannot find city, {city}'
+    if weather is None:
+        return f'cannot find city, {city}'
 
-    await send_embed(ctx, title=':white_sun_rain_cloud: Weather', text=description)
+    temperature, city_name, country_code, condition = weather
+    return f'it is {temperature} {get_weather_units(units)} with {condition} in {city_name}, {country_code}'
+
+
+async def get_weather(city, zip_code, country, units):
+    """looks up the current weather of given city using the OpenWeather API.
+
+    Parameters
+    ----------
+    :param str city: the city name for the local weather.
+    :param str zip_code: the zip code for the local weather
+    :param str country: the country code for the local weather.
+    :param str units: the units the temperature will be displayed.
+    :return: a tuple (temperature, city name, country code, condition), otherwise return None if city is not found.
+    :raise HttpError: if the api cannot be reached or the response is not the weather.
+    """
+    params = {'q': f'{city},{zip_code},{country}', 'appid': os.getenv('WEATHER_API_KEY') or '', 'units': units}
+    status, response = await http_client.get_json('weather', '/weather', params=params)
+
+    # only a city that does not exist is cached as not found.
+    if status == 404:
+        return None
+
+    try:
+        return (round(response['main']['temp']), response['name'], response['sys']['country'],
+                response['weather'][0]['description'])
+    except (KeyError, IndexError, TypeError):
+        raise HttpError('weather response is invalid', status)
 
 
 def get_weather_units(units):
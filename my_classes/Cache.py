@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+
+class Cache:
+    """
+    an in memory cache for results of slow look ups (i.e. an api request).
+
+    every entry has an age
+        fresh - younger than [ttl], returned right away.
+        stale - younger than [ttl] + [stale_ttl], returned right away and refreshed in the background.
+            so the user does not wait on the api while the next user gets a fresh result.
+        expired - looked up again before it is returned.
+    a look up that finds nothing (None) is cached for [negative_ttl] instead
+        so a misspelled look up is not sent to the api every time it is repeated.
+    look ups of the same key at the same time share one request (in flight).
+    errors are not cached, a stale entry is kept if its background refresh fails.
+    """
+    def __init__(self, ttl, negative_ttl, stale_ttl=0, max_size=1024, clock=time.monotonic):
+        self.ttl = ttl  # the number of seconds an entry is fresh.
+        self.negative_ttl = negative_ttl  # the number of seconds a look up that found nothing is cached.
+        self.stale_ttl = stale_ttl  # the number of seconds after ttl a stale entry can still be returned.
+        self.max_size = max_size  # the maximum number of entries, the oldest entries are removed first.
+        self.clock = clock  # the function that returns the current time in seconds.
+        self.entries = {}  # a dictionary key=key, value=(time stored, value).
+        self.in_flight = {}  # a dictionary key=key, value=asyncio.Task of the look up.
+        self.hits = 0  # the number of look ups returned from a fresh entry.
+        self.stale = 0  # the number of look ups returned from a stale entry.
+        self.negative = 0  # the number of look ups returned from a cached 'not found'.
+        self.shared = 0  # the number of look ups that joined a look up already in flight.
+        self.misses = 0  # the number of look ups that had to start the loader.
+
+    async def get(self, key, loader):
+        """
+        Parameters
+        ----------
+        :param key: the hashable key of the look up.
+        :param loader: the function that returns a coroutine to look up the value, returns None if not found.
+        :return: the value, otherwise return None if the look up found nothing.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            stored, value = entry
+            age = self.clock() - stored
+            if value is None and age < self.negative_ttl:
+                self.negative += 1
+                return None
+            if value is not None and age < self.ttl:
+                self.hits += 1
+                return value
+            if value is not None and age < self.ttl + self.stale_ttl:
+                self.stale += 1
+                self.load(key, loader)
+                return value
+
+        if key in self.in_flight:
+            self.shared += 1
+        else:
+            self.misses += 1
+
+        return await asyncio.shield(self.load(key, loader))
+
+    def load(self, key, loader):
+        """start a look up of given key, or join the look up that is already in flight.
+
+        Parameters
+        ----------
+        :param key: the hashable key of the look up.
+        :param loader: the function that returns a coroutine to look up the value.
+        :return: the asyncio.Task of the look up.
+        """
+        if key not in self.in_flight:
+            self.in_flight[key] = asyncio.ensure_future(self.store(key, loader))
+            # a failed background refresh has no one waiting on it, mark its error as handled.
+            self.in_flight[key].add_done_callback(lambda task: task.cancelled() or task.exception())
+
+        return self.in_flight[key]
+
+    async def store(self, key, loader):
+        """
+        Parameters
+        ----------
+        :param key: the hashable key of the look up.
+        :param loader: the function that returns a coroutine to look up the value.
+        :return: the value that was looked up.
+        """
+        try:
+            value = await loader()
+        finally:
+            del self.in_flight[key]
+
+        # dictionaries keep insertion order, the first key is the oldest entry.
+        self.entries.pop(key, None)
+        self.entries[key] = (self.clock(), value)
+        if len(self.entries) > self.max_size:
+            del self.entries[next(iter(self.entries))]
+
+        return value
+
+    def stats(self):
+        """:return: a str that represents how many look ups were returned from the cache."""
+        total = self.hits + self.stale + self.negative + self.shared + self.misses
+        rate = (total - self.misses) / total * 100 if total else 0
+
+        return f'{self.hits} fresh hits, {self.stale} stale hits, {self.negative} not found hits, ' \
+               f'{self.shared} shared, {self.misses} misses ({rate:.0f}% hit rate).\n' \
+               f'{len(self.entries)} entries cached.'
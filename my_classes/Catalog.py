@@ -0,0 +1,158 @@
+import re
+from difflib import SequenceMatcher
+from types import MappingProxyType
+from my_classes.Registry import registry
+
+
+class Catalog:
+    """
+    one shared index of every available course from the courses .json file.
+
+    every lookup is precomputed once so that hot paths (i.e. a reaction check) are a single dictionary lookup:
+        code  -> emoji    example: EGR222 -> 1️⃣
+        emoji -> code     example: 1️⃣ -> EGR222
+        num   -> code     example: 222 -> EGR222
+        the course picker message.
+    the index is rebuilt automatically when the courses .json file is reloaded by the content registry.
+    a course can be resolved from what a student typed (i.e. 'egr 222', '222 ', 'datastructures', 'algoritms').
+        the course code, number, and name are normalized once into aliases (lower case letters and digits only).
+        an exact alias is a dictionary lookup, otherwise the input is matched as part of an alias, then by similarity.
+        a number with more digits than any course number matches nothing (i.e. 'egr2222' is not EGR222).
+    """
+    def __init__(self, path='tutoring_courses/courses.json'):
+        self.path = path  # the str that represents the courses .json file relative to the content registry.
+        self.version = None  # the content registry version the index was built from.
+        self.code_to_emoji = MappingProxyType({})  # a read-only dictionary key=course code, value=emoji.
+        self.emoji_to_code = MappingProxyType({})  # a read-only dictionary key=emoji, value=course code.
+        self.num_to_code = MappingProxyType({})  # a read-only dictionary key=course number, value=course code.
+        self.code_to_name = MappingProxyType({})  # a read-only dictionary key=course code, value=course name.
+        self.picker_text = ''  # the str that represents the course picker message.
+        self.aliases = MappingProxyType({})  # a read-only dictionary key=normalized code, number, or name, value=code.
+        self.digits = 0  # the int that represents the most digits in a row of any alias.
+
+    def refresh(self):
+        """rebuild the index if the content registry has been reloaded since the last build."""
+        if self.version == registry.version:
+            return
+
+        courses = registry.get(self.path)
+
+        # build every lookup.
+        self.code_to_emoji = MappingProxyType({code: courses[code]['emoji'] for code in courses})
+        self.emoji_to_code = MappingProxyType({courses[code]['emoji']: code for code in courses})
+        self.num_to_code = MappingProxyType({code[-3:]: code for code in courses})
+        self.code_to_name = MappingProxyType({code: courses[code]['course'] for code in courses})
+
+        # every way a course can be typed.
+        aliases = {}
+        for code in courses:
+            for alias in (code, code[-3:], courses[code]['course']):
+                aliases[normalize(alias)] = code
+        self.aliases = MappingProxyType(aliases)
+        self.digits = max((len(number) for alias in aliases for number in re.findall(r'\d+', alias)), default=0)
+
+        # render the course picker message.
+        string = f'*Section Not Found.*\n\n' \
+                 f'did you mean one of these?\n'
+        for code in courses:
+            string += f'{courses[code]["emoji"]} - {code} {courses[code]["course"]}\n'
+        self.picker_text = string
+
+        self.version = registry.version
+
+    def codes(self):
+        """:return: a read-only dictionary key=course code, value=corresponding emoji."""
+        self.refresh()
+        return self.code_to_emoji
+
+    def emojis(self):
+        """:return: a read-only dictionary key=emoji, value=corresponding course code."""
+        self.refresh()
+        return self.emoji_to_code
+
+    def nums(self):
+        """:return: a read-only dictionary key=course number, value=corresponding course code."""
+        self.refresh()
+        return self.num_to_code
+
+    def names(self):
+        """:return: a read-only dictionary key=course code, value=corresponding course name."""
+        self.refresh()
+        return self.code_to_name
+
+    def picker(self, codes=None):
+        """
+        Parameters
+        ----------
+        :param list codes: the course codes to choose from, None for every course.
+        :return: a str representation of the courses for a student to choose from.
+        """
+        self.refresh()
+        if not codes:
+            return self.picker_text
+
+        string = f'*Section Not Found.*\n\n' \
+                 f'did you mean one of these?\n'
+        for code in codes:
+            string += f'{self.code_to_emoji[code]} - {code} {self.code_to_name[code]}\n'
+        return string
+
+    def resolve(self, text, cutoff=0.8, margin=0.05):
+        """find every course a student could have meant.
+
+        the courses are matched in order, the first step that matches any course is used.
+            1. the input is a course code, number, or name (i.e. 'egr 222', '222 ', 'data structures').
+            2. the input is part of a course code or name, at least 3 characters (i.e. 'csc', 'structures').
+            3. the input is similar to a course code, number, or name (i.e. 'algoritms', 'egr 22').
+                only the courses within [margin] of the most similar course are kept.
+
+        Parameters
+        ----------
+        :param str text: the course the student typed.
+        :param float cutoff: the minimum similarity (0 to 1) of a course.
+        :param float margin: how much less similar than the most similar course a course can be.
+        :return: a list of course codes, one if the input is not ambiguous, empty if no course matches.
+        """
+        self.refresh()
+        text = normalize(text or '')
+        if not text:
+            return []
+
+        # 1. exact.
+        if text in self.aliases:
+            return [self.aliases[text]]
+
+        # extra digits are not a typo of a course number.
+        if any(len(number) > self.digits for number in re.findall(r'\d+', text)):
+            return []
+
+        # 2. part of an alias.
+        codes = []
+        if len(text) >= 3:
+            codes = [code for alias, code in self.aliases.items() if text in alias]
+        if codes:
+            return list(dict.fromkeys(codes))
+
+        # 3. similar to an alias.
+        scores = {}
+        for alias, code in self.aliases.items():
+            score = SequenceMatcher(None, text, alias).ratio()
+            if score >= cutoff:
+                scores[code] = max(score, scores.get(code, 0))
+
+        best = max(scores.values(), default=0)
+        return [code for code, score in sorted(scores.items(), key=lambda item: -item[1]) if score >= best - margin]
+
+
+def normalize(text):
+    """
+    Parameters
+    ----------
+    :param str text: the text to normalize.
+    :return: a lower case str of only the letters and digits in text.
+    """
+    return re.sub(r'[^a-z0-9]', '', text.lower())
+
+
+# every available course.
+catalog = Catalog()
@@ -0,0 +1,139 @@
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from my_classes.Registry import registry
+
+# the month number of each month abbreviation used in the chapel schedule.
+MONTHS = {'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+          'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+
+
+class ChapelSchedule:
+    """
+    the chapel schedule compiled into a date sorted index.
+
+    dates in the .json file are written as 'Sept.15', 'Oct.1', etc. without a year.
+        dates are ordered by the school year that starts in August.
+            example: Aug.25 < Dec.1 < Jan.10
+    the index stores:
+        every chapel sorted by date.
+            to look up today's and the next chapel with a binary search.
+        a dictionary of week number and its chapels.
+            to look up a week directly.
+    rendered text is cached until the .json file is reloaded by the content registry.
+    """
+    def __init__(self, path='chapel/schedule.json', clock=datetime.now):
+        self.path = path  # the str that represents the chapel .json file relative to the content registry.
+        self.clock = clock  # the function that returns the current datetime.
+        self.version = None  # the content registry version the index was built from.
+        self.chapels = []  # a list of (date key, week, date, day of the week, speaker) sorted by date key.
+        self.keys = []  # a list of every chapel's date key sorted.
+        self.weeks = {}  # a dictionary key=week number, value=list of chapels in file order.
+        self.everything = []  # a list of every chapel in file order.
+        self.rendered = {}  # a dictionary key=look up, value=rendered text.
+
+    def refresh(self):
+        """rebuild the index if the content registry has been reloaded since the last build."""
+        if self.version == registry.version:
+            return
+
+        contents = registry.get(self.path)
+        self.weeks, self.everything, self.rendered = {}, [], {}
+
+        for week in contents:
+            number = re.sub(r'\D', '', week)
+            for date in contents[week]:
+                chapel = (to_key(date), week, date, contents[week][date]['day_of_week'],
+                          contents[week][date]['speaker'])
+
+                self.weeks.setdefault(number, []).append(chapel)
+                self.everything.append(chapel)
+
+        # dates that cannot be parsed are not in the date index.
+        self.chapels = sorted((chapel for chapel in self.everything if chapel[0] is not None), key=lambda c: c[0])
+        self.keys = [chapel[0] for chapel in self.chapels]
+        self.version = registry.version
+
+    def week(self, week_num=None):
+        """
+        Parameters
+        ----------
+        :param str week_num: the week number to look up, by default every week.
+        :return: a str representation of the chapel schedule for given week.
+        """
+        self.refresh()
+        if week_num is None:
+            return self.render('all', self.everything)
+
+        return self.render(f'week {week_num}', self.weeks.get(week_num, []))
+
+    def today(self):
+        """:return: a str representation of today's chapel."""
+        self.refresh()
+        key = to_key(self.clock())
+        start, end = bisect_left(self.keys, key), bisect_right(self.keys, key)
+
+        return self.render(f'date {key}', self.chapels[start:end])
+
+    def next(self):
+        """:return: a str representation of the next chapel after today."""
+        self.refresh()
+        key = to_key(self.clock())
+        index = bisect_right(self.keys, key)
+
+        # get every chapel on the next date.
+        if index < len(self.keys):
+            key = self.keys[index]
+            return self.render(f'date {key}', self.chapels[index:bisect_right(self.keys, key)])
+
+        return ''
+
+    def render(self, look_up, chapels):
+        """convert the given chapels to a str grouped by week.
+
+        Parameters
+        ----------
+        :param str look_up: the key the rendered text is cached with.
+        :param list chapels: the chapels to render.
+        :return: a str representation of the chapels.
+        """
+        if look_up in self.rendered:
+            return self.rendered[look_up]
+
+        schedule = []
+        week = None
+        for _, chapel_week, date, day_of_week, speaker in chapels:
+            if chapel_week != week:
+                week = chapel_week
+                schedule.append('')
+                schedule.append(f'__**{week}**__')
+
+            schedule.append(f'**{date}** [{day_of_week}] - *{speaker}*')
+
+        separator = '\n'
+        self.rendered[look_up] = separator.join(schedule)
+
+        return self.rendered[look_up]
+
+
+def to_key(date):
+    """convert a date into a key that is sorted by the school year.
+
+    Parameters
+    ----------
+    :param date: a datetime or a str that represents the date (i.e. 'Sept.15').
+    :return: a tuple (months since August, day), otherwise return None if the date cannot be parsed.
+    """
+    if isinstance(date, str):
+        match = re.match(r'\s*([A-Za-z]+)\.?\s*(\d+)', date)
+        if match is None or match.group(1)[:3].lower() not in MONTHS:
+            return None
+        month, day = MONTHS[match.group(1)[:3].lower()], int(match.group(2))
+    else:
+        month, day = date.month, date.day
+
+    return (month - 8) % 12, day
+
+
+# the chapel schedule.
+chapel_schedule = ChapelSchedule()
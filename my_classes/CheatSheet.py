@@ -0,0 +1,156 @@
+import re
+from bisect import bisect_left
+from my_classes.Registry import registry
+
+# words that are too common in the cheat sheets to be useful in a search.
+STOP_WORDS = {'a', 'an', 'and', 'as', 'at', 'by', 'for', 'from', 'if', 'in', 'is', 'it', 'of', 'on', 'or', 'the',
+              'this', 'to', 'with'}
+
+
+class CheatSheet:
+    """
+    an inverted index of every java cheat sheet.
+
+    every method signature, return type, and description is split into words (i.e. 'indexOf' -> index, of, indexof)
+        each word points to the methods it appears in and how much weight it carries.
+            method name words carry the most weight, then the class name, then everything else.
+    a search adds up the weight of every word in the search for each method
+        methods that match more of the search words are ranked first, then by weight.
+        words that only match the start of an indexed word (i.e. 'conta' -> contains) count for half.
+    class names are looked up in a separate dictionary, not in the index.
+        every .json file in the cheat sheet folder is a class.
+    sections that end with a colon (i.e. 'Type Parameters:') describe the class, they are not indexed as methods.
+    the index is rebuilt automatically when a cheat sheet .json file is reloaded by the content registry.
+    """
+    def __init__(self, folder='java_cheat_sheet'):
+        self.folder = folder  # the str that represents the cheat sheet folder relative to the content registry.
+        self.version = None  # the content registry version the index was built from.
+        self.classes = {}  # a dictionary key=class name, value=cheat sheet contents.
+        self.methods = []  # a list of (class name, return type, method, description).
+        self.index = {}  # a dictionary key=word, value=dictionary key=index in methods, value=weight.
+        self.words = []  # a list of every indexed word sorted, to look up words by prefix.
+
+    def refresh(self):
+        """rebuild the index if the content registry has been reloaded since the last build."""
+        if self.version == registry.version:
+            return
+
+        self.classes, self.methods, self.index = {}, [], {}
+        for file, cheat_sheet in registry.folder(self.folder).items():
+            java_class = file[:-len('.json')].lower()
+            self.classes[java_class] = cheat_sheet
+
+            for data_type in cheat_sheet:
+                if data_type.endswith(':'):
+                    continue
+
+                for method in cheat_sheet[data_type]:
+                    position = len(self.methods)
+                    description = cheat_sheet[data_type][method]
+                    self.methods.append((java_class, data_type, method, description))
+
+                    # the method's name is the text before the parameters.
+                    name = method.split('(')[0]
+                    self.add(position, name, 3)
+                    self.add(position, java_class, 2)
+                    self.add(position, f'{method[len(name):]} {data_type} {description}', 1)
+
+        self.words = sorted(self.index)
+        self.version = registry.version
+
+    def add(self, position, text, weight):
+        """
+        Parameters
+        ----------
+        :param int position: the method's index in methods.
+        :param str text: the text to index.
+        :param int weight: the weight of each word in the text.
+        """
+        for word in tokenize(text):
+            postings = self.index.setdefault(word, {})
+            postings[position] = max(postings.get(position, 0), weight)
+
+    def get_class(self, name):
+        """
+        Parameters
+        ----------
+        :param str name: the java class name (i.e. 'list').
+        :return: the cheat sheet contents of the class, otherwise return None.
+        """
+        self.refresh()
+        return self.classes.get(name.lower())
+
+    def available_classes(self):
+        """:return: a list of every available java class name."""
+        self.refresh()
+        return list(self.classes)
+
+    def search(self, term, limit=10):
+        """search every cheat sheet for methods that match the given words.
+
+        Parameters
+        ----------
+        :param str term: the words to search for.
+        :param int limit: the maximum number of methods to return.
+        :return: a list of (class name, return type, method, description) ranked from best to worst match.
+        """
+        self.refresh()
+
+        scores = {}  # a dictionary key=index in methods, value=[number of search words matched, weight].
+        for word in set(tokenize(term)):
+            matches = {}
+            for indexed_word, factor in self.expand(word):
+                for position, weight in self.index[indexed_word].items():
+                    matches[position] = max(matches.get(position, 0), weight * factor)
+
+            for position, weight in matches.items():
+                score = scores.setdefault(position, [0, 0])
+                score[0] += 1
+                score[1] += weight
+
+        ranked = sorted(scores, key=lambda position: (-scores[position][0], -scores[position][1], position))
+        return [self.methods[position] for position in ranked[:limit]]
+
+    def expand(self, word):
+        """
+        Parameters
+        ----------
+        :param str word: the search word.
+        :return: a list of (indexed word, factor) that the search word matches.
+        """
+        matches = [(word, 1)] if word in self.index else []
+
+        # indexed words that start with the search word.
+        position = bisect_left(self.words, word)
+        while position < len(self.words) and self.words[position].startswith(word):
+            if self.words[position] != word:
+                matches.append((self.words[position], 0.5))
+            position += 1
+
+        return matches
+
+
+def tokenize(text):
+    """split a text into lower case words.
+
+    camel case words are split and also kept as a whole.
+        example: 'indexOf(Object)' -> indexof, index, of, object
+
+    Parameters
+    ----------
+    :param str text: the text to split.
+    :return: a list of words.
+    """
+    words = []
+    for word in re.findall(r'[A-Za-z0-9]+', text):
+        parts = re.findall(r'[A-Z]?[a-z0-9]+|[A-Z]+(?![a-z])', word)
+        for part in [word] + (parts if len(parts) > 1 else []):
+            part = part.lower()
+            if part not in STOP_WORDS:
+                words.append(part)
+
+    return words
+
+
+# every java cheat sheet.
+cheat_sheets = CheatSheet()
@@ -1,3 +1,4 @@
+import asyncio
 from my_classes.Schedule import Schedule
 
 
@@ -6,6 +7,7 @@ class Course:
         self.schedule = Schedule(code)  # the schedule that corresponds to this course.
         self.code = code  # str that represents the course code.
         self.message = None  # stores the message sent in the bot announcement channel.
+        self.lock = asyncio.Lock()  # only one queue message is replaced at a time.
         self.queue = []  # array of student objects that represents the tutoring queue.
         self.size = 0  # the number of students in the queue.
 
@@ -0,0 +1,409 @@
+import ast
+import asyncio
+import math
+import multiprocessing
+import operator
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+# the binary operators a calculator expression can use.
+OPERATORS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+             ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow}
+
+# the unary operators a calculator expression can use.
+UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+# the functions a calculator expression can call.
+FUNCTIONS = {'abs': abs, 'ceil': math.ceil, 'cos': math.cos, 'exp': math.exp, 'factorial': math.factorial,
+             'floor': math.floor, 'log': math.log, 'log10': math.log10, 'log2': math.log2, 'sin': math.sin,
+             'sqrt': math.sqrt, 'tan': math.tan}
+
+# the constants a calculator expression can use.
+CONSTANTS = {'e': math.e, 'pi': math.pi}
+
+MAX_LENGTH = 256  # the maximum number of characters in an expression.
+INLINE_BITS = 2 ** 14  # expressions estimated under this many bits are calculated on the event loop.
+MAX_BITS = 2 ** 22  # expressions estimated over this many bits are not calculated at all.
+FOLD_BITS = 64  # sub expressions estimated under this many bits are calculated exactly while estimating.
+TIMEOUT = 2  # the number of seconds a worker has to calculate an expression.
+MAX_WORKERS = 2  # the maximum number of worker processes running at the same time.
+MAX_USER_WORKERS = 1  # the maximum number of worker processes running at the same time for each member.
+
+
+class Expression:
+    """
+    a calculator expression parsed into a syntax tree that only allows math.
+
+    WARNING: never use python's eval() on user input.
+        the expression is parsed into a syntax tree and every node is checked against a whitelist.
+            numbers, + - * / // % **, parentheses, whitelisted functions and constants.
+        anything else (names, attributes, strings, etc.) is rejected before it is calculated.
+    the size of the largest number calculated along the way is estimated before anything is calculated (in bits).
+        not only the size of the result, (10**10**6 * 10**10**6) % 7 is small but its product is not.
+        small numbers are cheap and calculated right away.
+        exponents, factorials, and products can grow large enough to freeze the bot (i.e. 9**9**9**9).
+            large numbers are calculated in a separate process that is killed after a timeout.
+            only a few processes run at the same time, one for each member.
+            the processes are started ahead of time and reused, a process that timed out is replaced.
+            the processes are never forked from the bot, forking a process with threads can copy a held lock.
+            numbers that are too large are rejected.
+    """
+    def __init__(self, text, variables=()):
+        if len(text) > MAX_LENGTH:
+            raise ValueError('expression is too long')
+
+        self.text = text  # the str that represents the expression.
+        self.variables = variables  # a tuple of variable names the expression can use.
+        self.tree = ast.parse(text.strip(), mode='eval').body  # the root of the syntax tree.
+
+        # comma separated expressions are calculated as columns (i.e. 'n * log2(n), n ** 2').
+        self.columns = self.tree.elts if isinstance(self.tree, ast.Tuple) else [self.tree]  # the root of each column.
+        for column in self.columns:
+            self.validate(column)
+
+    def validate(self, node):
+        """check every node of the syntax tree against the whitelist.
+
+        Parameters
+        ----------
+        :param ast.AST node: the node to check.
+        :raise ValueError: if the node is not allowed.
+        """
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            return
+        if isinstance(node, ast.Name) and (node.id in CONSTANTS or node.id in self.variables):
+            return
+        if isinstance(node, ast.BinOp) and type(node.op) in OPERATORS:
+            self.validate(node.left)
+            return self.validate(node.right)
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+            return self.validate(node.operand)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS \
+                and not node.keywords and len(node.args) in (1, 2):
+            for arg in node.args:
+                self.validate(arg)
+            return
+
+        raise ValueError(f'{type(node).__name__} is not allowed')
+
+    def headers(self):
+        """:return: a list of str that represents each column's expression."""
+        return [ast.get_source_segment(self.text.strip(), column) for column in self.columns]
+
+    def cost(self, bounds=None):
+        """estimate the size of the largest number calculated in bits.
+
+        the estimate is an upper bound for every integer operation.
+
+        Parameters
+        ----------
+        :param dict bounds: a dictionary key=variable name, value=the largest absolute value of the variable.
+        :return: a float that represents the estimated number of bits.
+        """
+        return max(estimate(column, bounds or {})[1] for column in self.columns)
+
+    def evaluate(self, namespace=None, functions=None, limit=MAX_BITS):
+        """calculate the expression.
+
+        Parameters
+        ----------
+        :param dict namespace: a dictionary key=variable name, value=the value of the variable.
+        :param dict functions: a dictionary key=function name, value=function, by default FUNCTIONS.
+        :param int limit: the maximum number of bits an integer power, product, or factorial can produce.
+        :return: the result of the expression, or a tuple of results if the expression has more than one column.
+        :raise OverflowError: if a power, a product, or a factorial is larger than the limit.
+        """
+        namespace = {**CONSTANTS, **(namespace or {})}
+        results = tuple(calculate(column, namespace, functions or FUNCTIONS, limit) for column in self.columns)
+
+        return results if isinstance(self.tree, ast.Tuple) else results[0]
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text, variables=()):
+    """parse and validate an expression once, repeated expressions are served from a cache.
+
+    Parameters
+    ----------
+    :param str text: the expression.
+    :param tuple variables: the variable names the expression can use.
+    :return: the Expression object.
+    :raise SyntaxError: if the expression cannot be parsed.
+    :raise ValueError: if the expression uses anything that is not allowed.
+    """
+    return Expression(text, variables)
+
+
+def estimate(node, bounds):
+    """
+    sub expressions without variables whose every step is small are calculated exactly
+        to keep the estimate of large powers and factorials close to the real size (i.e. 3**(10**6)).
+
+    Parameters
+    ----------
+    :param ast.AST node: the node to estimate.
+    :param dict bounds: a dictionary key=variable name, value=the largest absolute value of the variable.
+    :return: a tuple (estimated bits of the node's result, estimated bits of the largest number calculated).
+    """
+    bits, peak = upper_bound(node, bounds)
+
+    # calculate small sub expressions exactly.
+    if peak <= FOLD_BITS and not any(isinstance(child, ast.Name) and child.id in bounds for child in ast.walk(node)):
+        try:
+            return math.log2(abs(calculate(node, CONSTANTS, FUNCTIONS, FOLD_BITS)) + 1), peak
+        except (ArithmeticError, ValueError, TypeError):
+            pass
+
+    return bits, peak
+
+
+def upper_bound(node, bounds):
+    """
+    Parameters
+    ----------
+    :param ast.AST node: the node to estimate.
+    :param dict bounds: a dictionary key=variable name, value=the largest absolute value of the variable.
+    :return: a tuple (upper bound of the bits of the node's result, upper bound of the bits of the largest number).
+    """
+    if isinstance(node, ast.Constant):
+        bits = math.log2(abs(node.value) + 1)
+        return bits, bits
+    if isinstance(node, ast.Name):
+        bits = math.log2(abs(bounds.get(node.id, CONSTANTS.get(node.id, 1))) + 1)
+        return bits, bits
+    if isinstance(node, ast.UnaryOp):
+        return estimate(node.operand, bounds)
+    if isinstance(node, ast.Call):
+        args = [estimate(arg, bounds) for arg in node.args]
+        bits, peak = max(bits for bits, _ in args), max(peak for _, peak in args)
+        # n! has about n * log2(n) bits.
+        if node.func.id == 'factorial':
+            bits = grow(bits) * bits
+        if node.func.id == 'exp':
+            bits = grow(bits) * math.log2(math.e)
+        return bits, max(bits, peak)
+
+    (left, left_peak), (right, right_peak) = estimate(node.left, bounds), estimate(node.right, bounds)
+    bits = left
+    if isinstance(node.op, (ast.Add, ast.Sub)):
+        bits = max(left, right) + 1
+    if isinstance(node.op, ast.Mult):
+        bits = left + right
+    if isinstance(node.op, ast.Mod):
+        bits = min(left, right)
+    # a ** b has about log2(a) * b bits, 1 ** b and 0 ** b are tiny.
+    if isinstance(node.op, ast.Pow):
+        bits = 1 if left <= 1 else left * grow(right)
+
+    # the operands are calculated even if the result is small (i.e. x % 7).
+    return bits, max(bits, left_peak, right_peak)
+
+
+def grow(bits):
+    """
+    Parameters
+    ----------
+    :param float bits: the number of bits of a number.
+    :return: a float that represents the largest value the number can be, inf if it is too large for a float.
+    """
+    return 2 ** bits if bits < 1024 else math.inf
+
+
+def calculate(node, namespace, functions, limit):
+    """
+    Parameters
+    ----------
+    :param ast.AST node: the node to calculate.
+    :param dict namespace: a dictionary key=name, value=value.
+    :param dict functions: a dictionary key=function name, value=function.
+    :param int limit: the maximum number of bits an integer power, product, or factorial can produce.
+    :return: the result of the node.
+    """
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return namespace[node.id]
+    if isinstance(node, ast.UnaryOp):
+        return UNARY_OPERATORS[type(node.op)](calculate(node.operand, namespace, functions, limit))
+    if isinstance(node, ast.Call):
+        args = [calculate(arg, namespace, functions, limit) for arg in node.args]
+        if node.func.id == 'factorial' and isinstance(args[0], int) and args[0] * math.log2(max(args[0], 2)) > limit:
+            raise OverflowError('result is too large')
+        if node.func.id not in functions:
+            raise ValueError(f'{node.func.id} is not available')
+        return functions[node.func.id](*args)
+
+    left = calculate(node.left, namespace, functions, limit)
+    right = calculate(node.right, namespace, functions, limit)
+
+    # check the size of an integer power or product before calculating it.
+    if isinstance(node.op, ast.Pow) and isinstance(left, int) and isinstance(right, int) and abs(left) > 1 \
+            and left.bit_length() * abs(right) > limit:
+        raise OverflowError('result is too large')
+    if isinstance(node.op, ast.Mult) and isinstance(left, int) and isinstance(right, int) \
+            and left.bit_length() + right.bit_length() > limit:
+        raise OverflowError('result is too large')
+
+    return OPERATORS[type(node.op)](left, right)
+
+
+async def evaluate(text, user=None):
+    """calculate an expression without blocking the bot.
+
+    Parameters
+    ----------
+    :param str text: the expression.
+    :param int user: the discord id of the member calculating the expression.
+    :return: the result of the expression.
+    :raise SyntaxError: if the expression cannot be parsed.
+    :raise ValueError: if the expression uses anything that is not allowed.
+    :raise OverflowError: if the result is too large.
+    :raise TimeoutError: if the worker did not finish in time.
+    """
+    expression = compile_expression(text)
+    cost = expression.cost()
+
+    if cost > MAX_BITS:
+        raise OverflowError('result is too large')
+    if cost <= INLINE_BITS:
+        return expression.evaluate()
+
+    async with worker_slot(user):
+        return await asyncio.get_event_loop().run_in_executor(None, evaluate_in_worker, text, TIMEOUT)
+
+
+@asynccontextmanager
+async def worker_slot(user):
+    """wait until the member and the bot can start another worker process.
+
+    the member's semaphore is removed once nothing is using it.
+
+    Parameters
+    ----------
+    :param int user: the discord id of the member calculating the expression.
+    """
+    slot = user_workers.setdefault(user, [asyncio.Semaphore(MAX_USER_WORKERS), 0])
+    slot[1] += 1
+    try:
+        async with slot[0], workers:
+            yield
+    finally:
+        slot[1] -= 1
+        if slot[1] == 0:
+            user_workers.pop(user)
+
+
+def evaluate_in_worker(text, timeout):
+    """calculate an expression in a worker process that is killed if it does not finish in time.
+
+    Parameters
+    ----------
+    :param str text: the expression.
+    :param float timeout: the number of seconds the worker has to finish.
+    :return: the result of the expression.
+    :raise TimeoutError: if the worker did not finish in time.
+    """
+    worker = take_worker()
+    process, connection = worker
+    try:
+        connection.send(text)
+        finished = connection.poll(timeout)
+        if finished:
+            succeeded, result = connection.recv()
+    except (EOFError, OSError) as error:
+        stop_worker(worker)
+        raise TimeoutError('worker stopped before it finished') from error
+    except BaseException:
+        stop_worker(worker)
+        raise
+
+    if not finished:
+        stop_worker(worker)
+        raise TimeoutError('expression took too long')
+
+    with idle_lock:
+        idle.append(worker)
+
+    if not succeeded:
+        raise result
+
+    return result
+
+
+def start_workers(count=MAX_WORKERS):
+    """start worker processes ahead of time so the first large expression does not wait for one.
+
+    Parameters
+    ----------
+    :param int count: the number of idle worker processes to have ready.
+    """
+    while len(idle) < count:
+        worker = start_worker()
+        with idle_lock:
+            idle.append(worker)
+
+
+def take_worker():
+    """:return: a tuple (process, connection) of an idle worker process, started if none are idle."""
+    with idle_lock:
+        if idle:
+            return idle.pop()
+
+    return start_worker()
+
+
+def start_worker():
+    """:return: a tuple (process, connection) of a new worker process."""
+    connection, child = context.Pipe()
+    process = context.Process(target=serve, args=(child,), daemon=True)
+    process.start()
+    child.close()
+
+    return process, connection
+
+
+def stop_worker(worker):
+    """
+    Parameters
+    ----------
+    :param tuple worker: the (process, connection) of the worker process to kill.
+    """
+    process, connection = worker
+    if process.is_alive():
+        process.terminate()
+    process.join()
+    connection.close()
+
+
+def serve(connection):
+    """the worker process, calculates every expression it receives until the bot closes the connection.
+
+    sends (True, result) or (False, error) back to the bot for every expression.
+
+    Parameters
+    ----------
+    :param multiprocessing.Connection connection: the connection to the bot.
+    """
+    while True:
+        try:
+            text = connection.recv()
+        except EOFError:
+            return
+
+        try:
+            connection.send((True, compile_expression(text).evaluate()))
+        except Exception as error:
+            connection.send((False, error))
+
+
+# the worker processes running or waiting to run.
+workers = asyncio.Semaphore(MAX_WORKERS)  # limits the worker processes running for every member.
+user_workers = {}  # a dictionary key=discord id, value=list [asyncio.Semaphore, number of calculations using it].
+idle = []  # a list of (process, connection) of the worker processes waiting for an expression.
+idle_lock = threading.Lock()  # the lock of the idle workers, workers are taken and returned by executor threads.
+
+# the worker processes are started by a fork server (or spawned), never forked from the bot's threads.
+context = multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                                      else 'spawn')
+context.set_forkserver_preload(['my_classes.Expression'])
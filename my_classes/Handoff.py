@@ -0,0 +1,77 @@
+import time
+from collections import deque
+
+
+class Handoff:
+    """
+    reuses one invite for every tutor voice channel and measures how long a tutor waits for the next student.
+
+    a student that is not in a voice channel is sent an invite to the tutor's voice channel.
+        one invite per voice channel is created and reused for every student until it is close to expiring.
+            the invite expires after [max_age] seconds so a leaked invite does not open the server forever.
+            a new invite is created when the cached invite has less than [margin] seconds left.
+        the permission overwrite decides who can connect, not the invite.
+        the cached invite is forgotten if it is deleted from the server.
+    the latency of each step of '.tutor next' is kept for the most recent [size] handoffs.
+        prompt - from the tutor's command to the first student receiving the 'do you need help?' message.
+        pull - from a student saying they are ready to the student being moved or invited.
+        handoff - from the tutor's command to the next student being moved or invited.
+    """
+    def __init__(self, size=100, max_age=86400, margin=3600):
+        self.invites = {}  # a dictionary key=voice channel id, value=tuple (discord.Invite, time.monotonic() expiry).
+        self.max_age = max_age  # the number of seconds an invite is valid.
+        self.margin = margin  # the number of seconds before an invite expires that it stops being reused.
+        self.created = 0  # the number of invites created.
+        self.reused = 0  # the number of invites sent from the cache.
+        self.latencies = {step: deque(maxlen=size) for step in ('prompt', 'pull', 'handoff')}  # value=seconds.
+
+    async def invite(self, channel):
+        """
+        Parameters
+        ----------
+        :param discord.VoiceChannel channel: the tutor's voice channel.
+        :return: the discord.Invite to the voice channel.
+        """
+        invite, expiry = self.invites.get(channel.id, (None, 0))
+        if invite is not None and expiry - time.monotonic() > self.margin:
+            self.reused += 1
+            return invite
+
+        # unique, so discord does not return the old invite that is about to expire.
+        expiry = time.monotonic() + self.max_age
+        invite = await channel.create_invite(max_age=self.max_age, unique=True)
+        self.invites[channel.id] = (invite, expiry)
+        self.created += 1
+
+        return invite
+
+    def forget(self, invite):
+        """
+        Parameters
+        ----------
+        :param discord.Invite invite: the invite that was deleted.
+        """
+        cached, _ = self.invites.get(invite.channel.id, (None, 0))
+        if cached is not None and cached.code == invite.code:
+            self.invites.pop(invite.channel.id)
+
+    def record(self, step, start):
+        """
+        Parameters
+        ----------
+        :param str step: the step of the handoff ('prompt', 'pull', or 'handoff').
+        :param float start: the time.monotonic() the step started.
+        """
+        self.latencies[step].append(time.monotonic() - start)
+
+    def stats(self):
+        """:return: a str that represents the latency of every step of a handoff and how often invites are reused."""
+        lines = []
+        for step, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+            lines.append(f'{step} p50 {p50:.0f} ms, p95 {p95:.0f} ms ({len(latencies)} handoffs).')
+
+        lines.append(f'{self.created} invites created, {self.reused} reused.')
+        return '\n'.join(lines)
@@ -0,0 +1,88 @@
+import os
+from my_classes.Registry import registry
+from my_classes.Trie import Trie
+
+
+class HelpIndex:
+    """
+    a prebuilt index of every public help message.
+
+    every command is inserted into a prefix tree with the bot's prefix (i.e. '.tutee set').
+        looking up '.tutee' returns every command that starts with '.tutee'.
+    if no command starts with the look up, the commands closest to it by edit distance are returned.
+        to still find the help message when a command is misspelled (i.e. '.tuter').
+    the matching commands are rendered into one text grouped by category
+        for the text to be sent in the least number of embed messages.
+    the index is rebuilt automatically when a help .json file is reloaded by the content registry.
+    """
+    def __init__(self, folder='help_msg'):
+        self.folder = folder  # the str that represents the help .json files folder relative to the content registry.
+        self.version = None  # the content registry version the index was built from.
+        self.prefix = None  # the bot prefix the index was built with.
+        self.entries = []  # a list of (category, command, description) in file order.
+        self.trie = Trie()  # the prefix tree key=command, value=index in entries.
+
+    def refresh(self):
+        """rebuild the index if the content registry has been reloaded or the prefix changed since the last build."""
+        prefix = os.getenv("BOT_PREFIX") or ''
+        if self.version == registry.version and self.prefix == prefix:
+            return
+
+        self.entries, self.trie = [], Trie()
+        for categories in registry.folder(self.folder).values():
+            for category in categories:
+                for command in categories[category]:
+                    string = f'{prefix}{command}'
+                    self.trie.insert(string.lower(), len(self.entries))
+                    self.entries.append((category, string, categories[category][command]))
+
+        self.version = registry.version
+        self.prefix = prefix
+
+    def look_up(self, help_command=None):
+        """get the help messages of every command that starts with given command.
+
+        Parameters
+        ----------
+        :param str help_command: the command to look up, by default every command.
+        :return: a tuple (list of matching entries, True if the match is exact otherwise False).
+        """
+        self.refresh()
+        if help_command is None:
+            return self.entries, True
+
+        query = help_command.lower()
+        matches = self.trie.starts_with(query)
+        if matches:
+            return [self.entries[index] for index in matches], True
+
+        # allow one typo for short commands and two for longer commands.
+        _, matches = self.trie.closest(query, 1 if len(query) < 5 else 2)
+
+        return [self.entries[index] for index in sorted(matches)], False
+
+    def render(self, entries):
+        """convert the given entries into a str grouped by category.
+
+        Parameters
+        ----------
+        :param list entries: the entries to render.
+        :return: a str representation of the help messages.
+        """
+        help_msg = []
+        category = None
+        for entry_category, command, description in entries:
+            if entry_category != category:
+                if category is not None:
+                    help_msg.append('')
+                category = entry_category
+                help_msg.append(f'__**{category}**__')
+
+            help_msg.append(f'`{command}` - {description}')
+
+        separator = '\n'
+        return separator.join(help_msg)
+
+
+# every public help message.
+help_index = HelpIndex()
@@ -0,0 +1,213 @@
+import aiohttp
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+
+class HttpError(Exception):
+    """raised when an external api cannot be reached or keeps failing."""
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status  # the http status code of the last response, None if there was no response.
+
+
+class Api:
+    """
+    the settings, circuit breaker, and metrics of one external api.
+
+    every api has its own concurrency cap
+        so a slow api cannot use up every connection the other apis need.
+    the circuit breaker stops sending requests to an api that keeps failing
+        after [failures] failed requests in a row the circuit opens and every request fails right away.
+        after [reset_after] seconds one request is let through to test the api (half open).
+            if it succeeds the circuit closes, otherwise it opens again.
+    """
+    def __init__(self, name, base_url, concurrency=4, timeout=5, retries=2, backoff=0.5, failures=5, reset_after=30,
+                 max_retry_after=10):
+        self.name = name  # the str that represents the api name.
+        self.base_url = base_url.rstrip('/')  # the str that represents the url every path is relative to.
+        self.semaphore = asyncio.Semaphore(concurrency)  # the maximum number of requests sent to the api at once.
+        self.timeout = timeout  # the number of seconds a request has to finish.
+        self.retries = retries  # the number of times a failed request is sent again.
+        self.backoff = backoff  # the number of seconds to wait before the first retry, doubled after each retry.
+        self.failures = failures  # the number of failed requests in a row that opens the circuit.
+        self.reset_after = reset_after  # the number of seconds the circuit stays open.
+        self.max_retry_after = max_retry_after  # the longest Retry-After in seconds a request waits for.
+        self.failed = 0  # the number of failed requests in a row.
+        self.opened_at = None  # the time.monotonic() the circuit opened, None if the circuit is closed.
+        self.requests = 0  # the number of requests made.
+        self.errors = 0  # the number of requests that failed after every retry.
+        self.retried = 0  # the number of retries sent.
+        self.rejected = 0  # the number of requests rejected by the open circuit.
+        self.latencies = deque(maxlen=200)  # the number of seconds each of the most recent requests took.
+
+    def state(self):
+        """:return: a str that represents the state of the circuit breaker."""
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return 'half open'
+
+        return 'open'
+
+    def allow(self):
+        """
+        :return: True if a request can be sent to the api, otherwise return False.
+        """
+        state = self.state()
+        if state == 'half open':
+            # let one request through to test the api.
+            self.opened_at = time.monotonic()
+            return True
+
+        return state == 'closed'
+
+    def succeed(self):
+        """close the circuit after a successful request."""
+        self.failed, self.opened_at = 0, None
+
+    def fail(self):
+        """count a failed request, the circuit opens if too many requests failed in a row."""
+        self.errors += 1
+        self.failed += 1
+        if self.failed >= self.failures:
+            self.opened_at = time.monotonic()
+
+    def stats(self):
+        """:return: a str that represents the metrics of the api."""
+        latencies = sorted(self.latencies)
+        p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+        p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+
+        return f'**{self.name}** ({self.state()})\n' \
+               f'{self.requests} requests, {self.errors} errors, {self.retried} retries, {self.rejected} rejected.\n' \
+               f'latency p50 {p50:.0f} ms, p95 {p95:.0f} ms.'
+
+
+class HttpClient:
+    """
+    one shared async http session for every external api the bot uses.
+
+    WARNING: never use a blocking http library (i.e. requests) in a command.
+        a slow response freezes the event loop and every other command with it.
+    the session keeps connections open to be reused (connection pooling)
+        the session is created on the first request because it has to be created inside the event loop.
+    a request that times out, cannot connect, or gets a 5xx or 429 response is retried with exponential backoff.
+        a 429 response is retried after the number of seconds in its Retry-After header instead.
+            the request fails right away if the api asks to wait longer than the command should.
+        any other response is returned as is for the caller to handle (i.e. 404 city not found).
+    the session is closed when the bot closes.
+    """
+    def __init__(self, limit=50, limit_per_host=10):
+        self.limit = limit  # the maximum number of open connections.
+        self.limit_per_host = limit_per_host  # the maximum number of open connections to one host.
+        self.session = None  # the aiohttp.ClientSession shared by every api.
+        self.apis = {}  # a dictionary key=api name, value=Api object.
+
+    def register(self, name, base_url, **settings):
+        """add an external api, the existing api is returned if it was already added (i.e. a cog is reloaded).
+
+        Parameters
+        ----------
+        :param str name: the api name.
+        :param str base_url: the url every path is relative to.
+        :param settings: the Api settings (concurrency, timeout, retries, backoff, failures, reset_after,
+            max_retry_after).
+        :return: the Api object.
+        """
+        if name not in self.apis:
+            self.apis[name] = Api(name, base_url, **settings)
+
+        return self.apis[name]
+
+    def get_session(self):
+        """:return: the shared aiohttp.ClientSession, created if it does not exist."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self.session = aiohttp.ClientSession(connector=connector)
+
+        return self.session
+
+    async def get_json(self, name, path='', params=None, headers=None):
+        """send a GET request to an api.
+
+        Parameters
+        ----------
+        :param str name: the api name.
+        :param str path: the path relative to the api's base url.
+        :param dict params: the query parameters.
+        :param dict headers: the request headers.
+        :return: a tuple (http status code, the response .json contents).
+        :raise HttpError: if the circuit is open or the request failed after every retry.
+        """
+        api = self.apis[name]
+        if not api.allow():
+            api.rejected += 1
+            raise HttpError(f'{name} is unavailable')
+
+        api.requests += 1
+        status, delay = None, 0
+        for attempt in range(api.retries + 1):
+            if attempt > 0:
+                api.retried += 1
+                # exponential backoff with jitter so retries from many commands do not line up.
+                await asyncio.sleep(delay or api.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+            start = time.monotonic()
+            try:
+                async with api.semaphore:
+                    timeout = aiohttp.ClientTimeout(total=api.timeout)
+                    async with self.get_session().get(f'{api.base_url}{path}', params=params, headers=headers,
+                                                      timeout=timeout) as response:
+                        status = response.status
+                        if status < 500 and status != 429:
+                            contents = await response.json(content_type=None)
+                            api.latencies.append(time.monotonic() - start)
+                            api.succeed()
+                            return status, contents
+                        delay = retry_after(response.headers.get('Retry-After')) if status == 429 else 0
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                status, delay = None, 0
+
+            api.latencies.append(time.monotonic() - start)
+
+            # do not keep the command waiting longer than the api allows.
+            if delay > api.max_retry_after:
+                break
+
+        api.fail()
+        raise HttpError(f'{name} request failed', status)
+
+    async def close(self):
+        """close the shared session and every open connection."""
+        if self.session is not None:
+            await self.session.close()
+
+    def stats(self):
+        """:return: a str that represents the metrics of every api."""
+        separator = '\n\n'
+        return separator.join(api.stats() for api in self.apis.values()) or 'no api requests made.'
+
+
+def retry_after(header):
+    """
+    Parameters
+    ----------
+    :param str header: the Retry-After header, in seconds or an http date.
+    :return: a float that represents the number of seconds to wait, 0 if the header is missing or invalid.
+    """
+    if header is None:
+        return 0
+    if header.strip().isdigit():
+        return float(header)
+
+    try:
+        return max(parsedate_to_datetime(header).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+# the http client every cog shares.
+http_client = HttpClient()
@@ -0,0 +1,134 @@
+import json
+import os
+
+
+class Ledger:
+    """
+    a small file that records every change the bot made to the server that has to be undone later.
+
+    if the bot goes down in the middle of a tutoring session, the changes it made are left behind.
+        permission overwrites that let a student connect to a tutor's voice channel.
+        private rooms generated by students.
+        queue messages in the bot announcement channel.
+    the ledger is saved after every change, so on startup the bot can undo exactly what it left behind
+        instead of resetting every overwrite on every voice channel in the server.
+    the file is replaced in one step (write a temporary file then rename)
+        so a crash in the middle of a save never leaves a half written ledger.
+    """
+    def __init__(self, path):
+        self.path = path  # the str that represents the ledger .json file path.
+        self.overwrites = {}  # a dictionary key=channel id, value=set of member or role ids given an overwrite.
+        self.rooms = set()  # a set of generated private room channel ids.
+        self.messages = {}  # a dictionary key=channel id, value=set of message ids.
+
+        self.load()
+
+    def load(self):
+        """load the ledger file, an empty ledger is used if the file does not exist or cannot be read."""
+        try:
+            with open(self.path) as file:
+                contents = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        self.overwrites = {int(channel): set(targets) for channel, targets in contents.get('overwrites', {}).items()}
+        self.rooms = set(contents.get('rooms', []))
+        self.messages = {int(channel): set(messages) for channel, messages in contents.get('messages', {}).items()}
+
+    def save(self):
+        """write the ledger to its file."""
+        contents = {'overwrites': {channel: sorted(targets) for channel, targets in self.overwrites.items()},
+                    'rooms': sorted(self.rooms),
+                    'messages': {channel: sorted(messages) for channel, messages in self.messages.items()}}
+
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(contents, file)
+        os.replace(temporary, self.path)
+
+    def add_overwrite(self, channel_id, target_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the channel the overwrite was set in.
+        :param int target_id: the member or role the overwrite was set for.
+        """
+        self.overwrites.setdefault(channel_id, set()).add(target_id)
+        self.save()
+
+    def remove_overwrite(self, channel_id, target_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the channel the overwrite was removed from.
+        :param int target_id: the member or role the overwrite was removed for.
+        """
+        targets = self.overwrites.get(channel_id, set())
+        if target_id in targets:
+            targets.discard(target_id)
+            if not targets:
+                self.overwrites.pop(channel_id)
+            self.save()
+
+    def add_room(self, channel_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the private room that was generated.
+        """
+        self.rooms.add(channel_id)
+        self.save()
+
+    def remove_room(self, channel_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the private room that was deleted.
+        """
+        if channel_id in self.rooms:
+            self.rooms.discard(channel_id)
+            self.save()
+
+    def add_message(self, message):
+        """
+        Parameters
+        ----------
+        :param discord.Message message: the message that was sent.
+        """
+        self.messages.setdefault(message.channel.id, set()).add(message.id)
+        self.save()
+
+    def remove_message(self, message):
+        """
+        Parameters
+        ----------
+        :param discord.Message message: the message that was deleted.
+        """
+        messages = self.messages.get(message.channel.id, set())
+        if message.id in messages:
+            messages.discard(message.id)
+            if not messages:
+                self.messages.pop(message.channel.id)
+            self.save()
+
+    def remove(self, overwrites=None, rooms=(), messages=None):
+        """remove the entries whose changes have been undone.
+
+        entries that were not undone or were added while the changes were being undone are kept.
+
+        Parameters
+        ----------
+        :param dict overwrites: a dictionary key=channel id, value=set of member or role ids.
+        :param rooms: an iterable of private room channel ids.
+        :param dict messages: a dictionary key=channel id, value=set of message ids.
+        """
+        for entries, undone in ((self.overwrites, overwrites or {}), (self.messages, messages or {})):
+            for channel_id, ids in undone.items():
+                remaining = entries.get(channel_id, set()) - ids
+                if remaining:
+                    entries[channel_id] = remaining
+                else:
+                    entries.pop(channel_id, None)
+
+        self.rooms -= set(rooms)
+        self.save()
@@ -0,0 +1,125 @@
+import re
+from my_classes.Registry import registry
+
+# the ways a numbered book can be written (i.e. 'First John', 'I John', '1st John' -> '1 john').
+NUMBERS = {'first': '1', '1st': '1', 'i': '1', 'second': '2', '2nd': '2', 'ii': '2',
+           'third': '3', '3rd': '3', 'iii': '3'}
+
+# the format of a passage after it is normalized (i.e. 'john 3 16', 'john 3:16-4:2', '1 john 1').
+PATTERN = re.compile(r'(?P<book>(?:[123] )?[a-z][a-z ]*?) ?(?P<chapter>\d+)(?:[: ](?P<verse>\d+))?'
+                     r'(?:-(?P<end>\d+)(?::(?P<end_verse>\d+))?)?')
+
+
+class Passage:
+    """
+    converts the different ways a Bible passage can be written into one canonical reference.
+
+    example: 'John 3:16', 'jn 3 16', 'JOHN 3.16', and 'Jhn 3:16' -> 'John 3:16'
+    the book names and their aliases are stored in a .json file.
+        every alias is normalized once into a dictionary to look up a book in O(1).
+    a passage can be:
+        a chapter (i.e. 'John 3') or a range of chapters (i.e. 'John 3-4').
+        a verse (i.e. 'John 3:16') or a range of verses (i.e. 'John 3:16-18', 'John 3:16-4:2').
+    a passage from a book with only one chapter is a verse (i.e. 'Jude 3' -> 'Jude 1:3').
+    the aliases are rebuilt automatically when the .json file is reloaded by the content registry.
+    """
+    def __init__(self, path='esv/books.json'):
+        self.path = path  # the str that represents the books .json file relative to the content registry.
+        self.version = None  # the content registry version the aliases were built from.
+        self.books = {}  # a dictionary key=normalized book name or alias, value=book name.
+        self.chapters = {}  # a dictionary key=book name, value=number of chapters.
+
+    def refresh(self):
+        """rebuild the aliases if the content registry has been reloaded since the last build."""
+        if self.version == registry.version:
+            return
+
+        self.books, self.chapters = {}, {}
+        for book, contents in registry.get(self.path).items():
+            self.chapters[book] = contents['chapters']
+            for alias in (book, ) + tuple(contents['aliases']):
+                self.books[normalize(alias)] = book
+
+        self.version = registry.version
+
+    def parse(self, text):
+        """
+        Parameters
+        ----------
+        :param str text: the passage the user typed.
+        :return: a tuple (book, chapter, first verse, last chapter, last verse), otherwise return None if it cannot
+                 be parsed, the verses are None if the passage is a chapter or a range of chapters.
+        """
+        self.refresh()
+        match = PATTERN.fullmatch(normalize(text))
+        if match is None or match.group('book').strip() not in self.books:
+            return None
+
+        book = self.books[match.group('book').strip()]
+        chapter, verse, end, end_verse = (int(number) if number else None for number in
+                                          match.group('chapter', 'verse', 'end', 'end_verse'))
+
+        # a book with only one chapter is referenced by verse.
+        if self.chapters[book] == 1 and verse is None:
+            chapter, verse = 1, chapter
+
+        # the end of a range is a chapter if no verse is given, otherwise a verse in the same chapter.
+        if end_verse is None and verse is not None:
+            end, end_verse = chapter, end or verse
+        elif end_verse is None:
+            end = end or chapter
+
+        if not 1 <= chapter <= end <= self.chapters[book] or (end == chapter and (end_verse or 0) < (verse or 0)):
+            return None
+
+        return book, chapter, verse, end, end_verse
+
+    def canonical(self, text):
+        """
+        Parameters
+        ----------
+        :param str text: the passage the user typed.
+        :return: a str that represents the canonical reference, otherwise return None if it cannot be parsed.
+        """
+        return to_reference(self.parse(text))
+
+
+def to_reference(passage):
+    """
+    Parameters
+    ----------
+    :param tuple passage: the (book, chapter, first verse, last chapter, last verse) parsed by Passage.
+    :return: a str that represents the canonical reference, otherwise return None if passage is None.
+    """
+    if passage is None:
+        return None
+
+    book, chapter, verse, end, end_verse = passage
+    if verse is None:
+        return f'{book} {chapter}' if end == chapter else f'{book} {chapter}-{end}'
+    if end == chapter:
+        return f'{book} {chapter}:{verse}' if end_verse == verse else f'{book} {chapter}:{verse}-{end_verse}'
+
+    return f'{book} {chapter}:{verse}-{end}:{end_verse}'
+
+
+def normalize(text):
+    """
+    Parameters
+    ----------
+    :param str text: the text to normalize.
+    :return: a lower case str with single spaces, '.' as ':', and the book number as a digit.
+    """
+    text = re.sub(r'\s*([:\-])\s*', r'\1', text.lower().replace('.', ':').replace('–', '-'))
+    text = re.sub(r'(?<=[a-z]):|[\s_+]+', ' ', text).strip()
+
+    # the book number is written as a digit followed by a space (i.e. '1jn' -> '1 jn', 'first john' -> '1 john').
+    words = text.split(' ', 1)
+    if words[0] in NUMBERS and len(words) > 1:
+        text = f'{NUMBERS[words[0]]} {words[1]}'
+
+    return re.sub(r'^([123]) ?(?=[a-z])', r'\1 ', text)
+
+
+# the canonical references of every Bible passage.
+passages = Passage()
@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PassageCache:
+    """
+    a persistent least recently used cache of ESV passages stored in a sqlite file.
+
+    scripture text never changes, so a passage only has to be requested from the api once.
+        the cache is keyed by canonical reference (i.e. 'John 3:16')
+            so 'jn 3 16' and 'JOHN 3:16' are the same look up.
+        the cache is kept on disk to survive a restart of the bot.
+    WARNING: the ESV API terms limit how much text can be stored.
+        the cache keeps at most [max_entries] passages, the least recently used passages are removed first.
+    the database is opened on the first look up
+        so importing the bot does not create the file.
+    every read and write runs on one thread that owns the connection
+        so a look up, which also records when the passage was used, does not block the event loop.
+    """
+    def __init__(self, path, max_entries=500):
+        self.path = path  # the str that represents the sqlite file path.
+        self.max_entries = max_entries  # the maximum number of passages stored.
+        self.connection = None  # the sqlite3.Connection to the cache file, only used by the executor's thread.
+        self.executor = ThreadPoolExecutor(max_workers=1)  # the thread that reads and writes the cache file.
+        self.hits = 0  # the number of look ups returned from the cache.
+        self.misses = 0  # the number of look ups that were not cached.
+
+    def connect(self):
+        """:return: the sqlite3.Connection, opened and the table created if needed."""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path)
+            # the cache can be rebuilt from the api, so writes do not wait on the disk to sync.
+            self.connection.execute('PRAGMA journal_mode = WAL')
+            self.connection.execute('PRAGMA synchronous = NORMAL')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS passages '
+                                    '(reference TEXT PRIMARY KEY, text TEXT NOT NULL, used REAL NOT NULL)')
+
+        return self.connection
+
+    async def run(self, function, *args):
+        """
+        Parameters
+        ----------
+        :param function function: the function that uses the connection.
+        :param args: the arguments of the function.
+        :return: the result of the function, called on the thread that owns the connection.
+        """
+        return await asyncio.get_event_loop().run_in_executor(self.executor, function, *args)
+
+    async def get(self, reference):
+        """
+        Parameters
+        ----------
+        :param str reference: the canonical reference.
+        :return: the str of the cached passage, otherwise return None.
+        """
+        return await self.run(self.read, reference)
+
+    async def put(self, reference, text):
+        """store a passage, the least recently used passages are removed if the cache is full.
+
+        Parameters
+        ----------
+        :param str reference: the canonical reference.
+        :param str text: the passage.
+        """
+        await self.run(self.write, reference, text)
+
+    def read(self, reference):
+        """
+        Parameters
+        ----------
+        :param str reference: the canonical reference.
+        :return: the str of the cached passage, otherwise return None.
+        """
+        connection = self.connect()
+        row = connection.execute('SELECT text FROM passages WHERE reference = ?', (reference, )).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with connection:
+            connection.execute('UPDATE passages SET used = ? WHERE reference = ?', (time.time(), reference))
+
+        return row[0]
+
+    def write(self, reference, text):
+        """store a passage, the least recently used passages are removed if the cache is full.
+
+        Parameters
+        ----------
+        :param str reference: the canonical reference.
+        :param str text: the passage.
+        """
+        with self.connect() as connection:
+            connection.execute('INSERT OR REPLACE INTO passages VALUES (?, ?, ?)', (reference, text, time.time()))
+            connection.execute('DELETE FROM passages WHERE reference NOT IN '
+                               '(SELECT reference FROM passages ORDER BY used DESC LIMIT ?)', (self.max_entries, ))
+
+    def count(self):
+        """:return: the int number of passages cached."""
+        return self.connect().execute('SELECT COUNT(*) FROM passages').fetchone()[0]
+
+    async def stats(self):
+        """:return: a str that represents how many look ups were returned from the cache."""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        count = await self.run(self.count)
+
+        return f'{self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate).\n' \
+               f'{count} passages cached.'
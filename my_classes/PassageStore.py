@@ -0,0 +1,179 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left, bisect_right
+
+MAGIC = b'PSG1'  # the first bytes of a passage store file.
+MAX_VERSE = 1023  # the largest verse number a key can hold (10 bits).
+
+
+class PassageStore:
+    """
+    an optional local copy of the Bible stored in a compact binary file.
+
+    the file is built once from a licensed text file with the import tool at the bottom of this file.
+        python -m my_classes.PassageStore [text file] [store file]
+    the file has:
+        a header with the book names in order.
+        a sorted key of every verse (book, chapter, verse packed into one int).
+        the byte offset of every verse's text, verses are stored one after another in order.
+    the file is memory mapped instead of read
+        so the operating system only loads the pages that are looked up and shares them between processes.
+    a passage is two binary searches on the keys and one slice of the text
+        a range of verses (i.e. 'John 3:16-18') is one slice because the verses are stored in order.
+    the store is disabled if no file is given.
+    """
+    def __init__(self, path=None):
+        self.path = path  # the str that represents the store file path, None if there is no store.
+        self.map = None  # the mmap.mmap of the store file.
+        self.books = {}  # a dictionary key=book name, value=book number.
+        self.keys = None  # a memoryview of every verse key sorted.
+        self.offsets = None  # a memoryview of every verse's byte offset into the text, plus the end of the text.
+        self.text = None  # a memoryview of the text of every verse.
+        self.hits = 0  # the number of look ups found in the store.
+        self.misses = 0  # the number of look ups not found in the store.
+
+    def open(self):
+        """
+        :return: True if the store file is open, otherwise return False.
+        """
+        if self.map is not None or self.path is None:
+            return self.map is not None
+
+        try:
+            with open(self.path, 'rb') as file:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            print(f'{self.path} could not be opened: {error}')
+            self.path = None
+            return False
+
+        view = memoryview(self.map)
+        if view[:len(MAGIC)] != MAGIC:
+            print(f'{self.path} is not a passage store.')
+            self.path, self.map = None, None
+            return False
+
+        position = len(MAGIC)
+        header_length, = struct.unpack_from('<I', view, position)
+        header = json.loads(bytes(view[position + 4:position + 4 + header_length]))
+        position += 4 + header_length
+
+        count = header['verses']
+        self.books = {book: number for number, book in enumerate(header['books'])}
+        self.keys = view[position:position + 4 * count].cast('I')
+        self.offsets = view[position + 4 * count:position + 8 * count + 4].cast('I')
+        self.text = view[position + 8 * count + 4:]
+
+        return True
+
+    def get(self, passage):
+        """
+        Parameters
+        ----------
+        :param tuple passage: the (book, chapter, first verse, last chapter, last verse) parsed by Passage.
+        :return: a str of the passage's verses, otherwise return None if the passage is not in the store.
+        """
+        if passage is None or not self.open() or passage[0] not in self.books:
+            self.misses += 1
+            return None
+
+        book, chapter, verse, end, end_verse = passage
+        number = self.books[book]
+        start = bisect_left(self.keys, to_key(number, chapter, verse or 1))
+        stop = bisect_right(self.keys, to_key(number, end, end_verse or MAX_VERSE))
+
+        # the first verse has to be in the store, otherwise the passage would be missing its beginning.
+        first = to_key(number, chapter, verse or 0)
+        if start >= stop or self.keys[start] >> 10 != first >> 10 or (verse is not None and self.keys[start] != first):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return str(self.text[self.offsets[start]:self.offsets[stop]], 'utf-8')
+
+    def stats(self):
+        """:return: a str that represents how many look ups were found in the store."""
+        if not self.open():
+            return 'no passage store.'
+
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+
+        return f'{self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate).\n' \
+               f'{len(self.keys)} verses stored.'
+
+
+def to_key(book, chapter, verse):
+    """
+    Parameters
+    ----------
+    :param int book: the book number.
+    :param int chapter: the chapter number.
+    :param int verse: the verse number.
+    :return: an int that sorts verses in Bible order (book: 12 bits, chapter: 10 bits, verse: 10 bits).
+    """
+    return book << 20 | min(chapter, MAX_VERSE) << 10 | min(verse, MAX_VERSE)
+
+
+def build(source, destination, passages):
+    """import a text file into a passage store file.
+
+    the text file has one verse per line separated by tabs: [book] [chapter] [verse] [text]
+        example: John	3	16	For God so loved the world, ...
+    the book can be any name or alias that Passage knows.
+    each verse is stored with its verse number in brackets like the ESV API (i.e. '[16] For God so loved ...').
+
+    Parameters
+    ----------
+    :param str source: the text file path.
+    :param str destination: the store file path.
+    :param Passage passages: the passage parser used to look up the book names.
+    :return: the number of verses stored.
+    """
+    passages.refresh()
+    books = list(passages.chapters)
+    numbers = {book: number for number, book in enumerate(books)}
+
+    verses = {}
+    with open(source, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                book, chapter, verse, text = line.rstrip('\n').split('\t', 3)
+                passage = passages.parse(f'{book} {chapter}:{verse}')
+                key = to_key(numbers[passage[0]], passage[1], passage[2])
+            except (ValueError, TypeError):
+                raise ValueError(f'{source} line {line_number} is not: book, chapter, verse, text')
+            verses[key] = f'[{passage[2]}] {text.strip()} '.encode('utf-8')
+
+    keys = sorted(verses)
+    offsets = [0]
+    for key in keys:
+        offsets.append(offsets[-1] + len(verses[key]))
+
+    # the header is padded for the keys and offsets to start on a 4 byte boundary.
+    header = json.dumps({'books': books, 'verses': len(keys)}).encode('utf-8')
+    header += b' ' * (-len(header) % 4)
+    with open(destination, 'wb') as file:
+        file.write(MAGIC + struct.pack('<I', len(header)) + header)
+        file.write(struct.pack(f'<{len(keys)}I', *keys))
+        file.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        for key in keys:
+            file.write(verses[key])
+
+    return len(keys)
+
+
+# the import tool.
+if __name__ == '__main__':
+    from my_classes.Passage import passages as parser
+
+    if len(sys.argv) != 3:
+        sys.exit('usage: python -m my_classes.PassageStore [text file] [store file]')
+
+    print(f'{build(sys.argv[1], sys.argv[2], parser)} verses stored in {sys.argv[2]} '
+          f'({os.path.getsize(sys.argv[2])} bytes).')
@@ -0,0 +1,136 @@
+import asyncio
+
+
+class PermissionWriter:
+    """
+    applies permission overwrite changes to a channel with one channel edit instead of one request per member.
+
+    several students can move through one tutor's voice channel at the same time.
+        a separate set_permissions call for every member runs into the channel's rate limit.
+    every change made to the same channel while the event loop is busy is buffered.
+        the last change for each member or role wins.
+    the buffered changes are applied with one edit that carries the channel's complete overwrite map.
+        changes that would not change the channel (i.e. removing an overwrite that does not exist) are dropped.
+        no request is sent if every change was dropped.
+    only one edit per channel is sent at a time (a lock per channel)
+        because every edit replaces the whole map, two edits at the same time would undo each other.
+        changes made while an edit is being sent are applied together by the next edit.
+    discord.py updates its cached overwrites when discord sends the channel update event, not when the edit returns.
+        the overwrites written by this class are remembered until the cache has caught up.
+        a channel that is edited or deleted without this class has to be forgotten
+            otherwise the remembered overwrites are written back with the next change.
+    """
+    def __init__(self):
+        self.pending = {}  # a dictionary key=channel id, value=tuple (dictionary key=target, value=overwrite, future).
+        self.locks = {}  # a dictionary key=channel id, value=asyncio.Lock.
+        self.written = {}  # a dictionary key=channel id, value=dictionary key=target, value=overwrite not cached yet.
+        self.events = 0  # the number of overwrite changes received.
+        self.dropped = 0  # the number of overwrite changes that would not have changed the channel.
+        self.requests = 0  # the number of channel edits sent to discord.
+
+    async def set(self, channel, target, overwrite):
+        """change the overwrite of a member or role, the change is applied with every other change to the channel.
+
+        Parameters
+        ----------
+        :param discord.abc.GuildChannel channel: the channel the overwrite is in.
+        :param discord.Member or discord.Role target: the member or role the overwrite is for.
+        :param discord.PermissionOverwrite overwrite: the new overwrite, None removes the overwrite.
+        :return: True if the channel was edited, otherwise return False if nothing had to change.
+        """
+        self.events += 1
+
+        # start the channel's batch.
+        if channel.id not in self.pending:
+            self.pending[channel.id] = ({}, asyncio.get_event_loop().create_future())
+            asyncio.ensure_future(self.flush(channel))
+
+        changes, future = self.pending[channel.id]
+        changes[target] = overwrite
+
+        return await asyncio.shield(future)
+
+    async def flush(self, channel):
+        """wait for the channel's previous edit, then edit the channel once with every buffered change.
+
+        Parameters
+        ----------
+        :param discord.abc.GuildChannel channel: the channel being edited.
+        """
+        async with self.locks.setdefault(channel.id, asyncio.Lock()):
+            changes, future = self.pending.pop(channel.id)
+            try:
+                future.set_result(await self.apply(channel, changes))
+            except Exception as error:
+                future.set_exception(error)
+
+    async def apply(self, channel, changes):
+        """
+        Parameters
+        ----------
+        :param discord.abc.GuildChannel channel: the channel being edited.
+        :param dict changes: a dictionary key=member or role, value=overwrite or None.
+        :return: True if the channel was edited, otherwise return False.
+        """
+        overwrites = self.current(channel)
+
+        # apply the buffered changes to the channel's current overwrites.
+        edited = False
+        for target, overwrite in changes.items():
+            if overwrites.get(target) == overwrite:
+                self.dropped += 1
+                continue
+            if overwrite is None:
+                overwrites.pop(target)
+            else:
+                overwrites[target] = overwrite
+            edited = True
+
+        if not edited:
+            return False
+
+        self.requests += 1
+        await channel.edit(overwrites=overwrites)
+
+        written = self.written.setdefault(channel.id, {})
+        for target, overwrite in changes.items():
+            written[target] = overwrite
+
+        return True
+
+    def current(self, channel):
+        """
+        Parameters
+        ----------
+        :param discord.abc.GuildChannel channel: the channel.
+        :return: a dictionary of the channel's overwrites including edits discord.py has not cached yet.
+        """
+        overwrites = dict(channel.overwrites)
+        written = self.written.get(channel.id, {})
+
+        for target, overwrite in list(written.items()):
+            if overwrites.get(target) == overwrite:
+                written.pop(target)  # the cache caught up.
+            elif overwrite is None:
+                overwrites.pop(target, None)
+            else:
+                overwrites[target] = overwrite
+
+        if not written:
+            self.written.pop(channel.id, None)
+
+        return overwrites
+
+    def forget(self, channel):
+        """
+        Parameters
+        ----------
+        :param discord.abc.GuildChannel channel: the channel that was edited or deleted without this class.
+        """
+        self.written.pop(channel.id, None)
+
+    def stats(self):
+        """:return: a str that represents how many requests were saved by batching overwrite changes."""
+        return f'{self.events} overwrite changes received, {self.dropped} dropped.\n' \
+               f'{self.requests} channel edits sent.\n' \
+               f'{self.events - self.requests} requests saved.'
@@ -0,0 +1,255 @@
+import asyncio
+import discord
+import heapq
+import itertools
+from discord.http import Route
+
+
+class ReactionRouter:
+    """
+    routes every reaction (by message id) and button (by custom id) to the prompt waiting for it.
+
+    a prompt is a message the bot sent that waits for one member to react with one of its emojis.
+        i.e. the course picker and the 'do you need help?' message.
+    bot.wait_for registers a predicate that every reaction in the server is run through.
+        with hundreds of prompts open, every reaction event runs hundreds of predicates.
+    the router keeps the waiting prompts in a dictionary (message id -> prompt)
+        so a reaction event finds its prompt in O(1) no matter how many prompts are open.
+    every timeout is kept in one heap sorted by deadline with a single timer for the earliest deadline
+        instead of a timer for every prompt.
+        answered prompts are left in the heap and skipped when their deadline comes.
+        the heap is rebuilt if it has more answered prompts than waiting prompts.
+    a prompt is sent with a button for every choice (a select menu for more than 5 choices).
+        the buttons are part of the message, so the prompt can be answered as soon as it is sent
+            instead of after one add reaction request for every emoji.
+        discord.py 1.x has no message components, so the raw components are sent through the bot's http client
+            and the INTERACTION_CREATE gateway event is read from on_socket_response.
+        every button's custom id is '<prompt key>:<emoji>', the router finds the prompt from the custom id in O(1).
+        a prompt that could not be sent with buttons is sent without them and answered with reactions.
+    """
+    def __init__(self, bot):
+        self.bot = bot  # the discord bot that will be using this class.
+        self.pending = {}  # a dictionary key=message id or prompt key, value=(author id, emojis, deadline, future).
+        self.deadlines = []  # a heap of tuples (deadline, order, message id or prompt key).
+        self.order = itertools.count()  # breaks ties between equal deadlines, message ids and keys do not compare.
+        self.timer = None  # the asyncio.TimerHandle that wakes up at the earliest deadline.
+        self.keys = itertools.count(1)  # the numbers used to generate a key for every prompt sent with buttons.
+        self.sent = {}  # a dictionary key=message id, value=str key of the prompts sent with buttons.
+        self.events = 0  # the number of reaction and button events routed to a prompt.
+        self.answered = 0  # the number of prompts answered.
+        self.expired = 0  # the number of prompts that timed out.
+
+    async def send(self, channel, embed, options):
+        """send a prompt message with a button for every choice.
+
+        Parameters
+        ----------
+        :param discord.abc.Messageable channel: the text or DM channel to send the prompt to.
+        :param discord.Embed embed: the prompt's embed.
+        :param dict options: a dictionary key=str emoji, value=str label of every choice.
+        :return: the discord.Message sent, without buttons if discord rejected them.
+        """
+        key = f'prompt-{next(self.keys)}'
+        route = Route('POST', '/channels/{channel_id}/messages', channel_id=channel.id)
+        try:
+            data = await self.bot.http.request(route, json={'embed': embed.to_dict(),
+                                                            'components': self.components(key, options)})
+        except discord.HTTPException:
+            return await channel.send(embed=embed)
+
+        # build the message the same way discord.py does for the messages it sends.
+        message = self.bot._connection.create_message(channel=channel, data=data)
+        self.sent[message.id] = key
+        return message
+
+    def components(self, key, options):
+        """
+        Parameters
+        ----------
+        :param str key: the prompt's key.
+        :param dict options: a dictionary key=str emoji, value=str label of every choice.
+        :return: a list of the raw action rows with a button (or a select menu) for every choice.
+        """
+        if len(options) <= 5:
+            return [{'type': 1, 'components': [
+                {'type': 2, 'style': 2, 'label': label, 'emoji': {'name': emoji}, 'custom_id': f'{key}:{emoji}'}
+                for emoji, label in options.items()]}]
+
+        return [{'type': 1, 'components': [{'type': 3, 'custom_id': key, 'options': [
+            {'label': label, 'value': emoji, 'emoji': {'name': emoji}} for emoji, label in options.items()][:25]}]}]
+
+    async def ask(self, message, author, emojis, timeout):
+        """add reactions to a message and wait for an intended author to respond to it.
+
+        the prompt listens as soon as it is registered, so an answer made before every reaction is added counts.
+        a message sent with buttons is answered with its buttons, no reactions are added.
+        the message will be deleted once the bot stops listening for a reaction
+            to not confuse users thinking that the bot is still listening.
+            the message is also deleted if the task waiting on the prompt is cancelled.
+
+        Parameters
+        ----------
+        :param discord.Message message: the prompt message.
+        :param int author: the intended author's discord id.
+        :param emojis: an iterable of str emojis the author can choose from.
+        :param int timeout: the number of seconds the intended author have to respond.
+        :return: the str emoji the author chose, otherwise return None if the prompt timed out.
+        """
+        key = self.sent.pop(message.id, message.id)
+        future = self.wait(key, author, emojis, timeout)
+        try:
+            # add reactions to the message.
+            for emoji in emojis if key == message.id else ():
+                if future.done():
+                    break
+                await message.add_reaction(emoji)
+
+            return await future
+        finally:
+            self.cancel(key)
+
+            # try if the message hasn't been removed prior to deletion.
+            try:
+                await message.delete()
+            except discord.HTTPException:
+                pass
+
+    def wait(self, key, author, emojis, timeout):
+        """
+        Parameters
+        ----------
+        :param key: the prompt message id or the key of a prompt sent with buttons.
+        :param int author: the intended author's discord id.
+        :param emojis: an iterable of str emojis the author can choose from.
+        :param int timeout: the number of seconds the intended author have to respond.
+        :return: an asyncio.Future of the str emoji the author reacted with, or None if the prompt timed out.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        deadline = loop.time() + timeout
+
+        self.pending[key] = (author, frozenset(emojis), deadline, future)
+        heapq.heappush(self.deadlines, (deadline, next(self.order), key))
+        self.schedule()
+
+        return future
+
+    def cancel(self, key):
+        """
+        Parameters
+        ----------
+        :param key: the prompt message id or the key of a prompt sent with buttons that is no longer waiting.
+        """
+        prompt = self.pending.pop(key, None)
+        if prompt is not None and not prompt[3].done():
+            prompt[3].cancel()
+
+        # remove the answered prompts from the heap once they are the majority.
+        if len(self.deadlines) > 2 * len(self.pending) + 64:
+            self.deadlines = [(deadline, order, key) for deadline, order, key in self.deadlines
+                              if key in self.pending and self.pending[key][2] == deadline]
+            heapq.heapify(self.deadlines)
+
+    def dispatch(self, payload):
+        """answer the prompt a raw reaction event was made on.
+
+        Parameters
+        ----------
+        :param discord.RawReactionActionEvent payload: the raw event payload data.
+        :return: True if the reaction was made on a waiting prompt, otherwise return False.
+        """
+        return self.answer(payload.message_id, payload.user_id, str(payload.emoji))
+
+    async def dispatch_interaction(self, interaction):
+        """answer the prompt a button or select menu was used on.
+
+        the interaction is acknowledged without changing the message, otherwise discord shows it as failed.
+
+        Parameters
+        ----------
+        :param dict interaction: the raw INTERACTION_CREATE event data.
+        :return: True if the component belongs to a waiting prompt, otherwise return False.
+        """
+        # only message components (type 3) are prompt answers.
+        if interaction.get('type') != 3:
+            return False
+
+        data = interaction.get('data') or {}
+        key, _, emoji = data.get('custom_id', '').partition(':')
+        if data.get('values'):
+            emoji = data['values'][0]
+
+        # the user is under member in a server, and on its own in a DM.
+        user = (interaction.get('member') or interaction).get('user') or {}
+        if not self.answer(key, int(user.get('id', 0)), emoji):
+            return False
+
+        route = Route('POST', '/interactions/{interaction_id}/{interaction_token}/callback',
+                      interaction_id=interaction['id'], interaction_token=interaction['token'])
+        try:
+            await self.bot.http.request(route, json={'type': 6})
+        except discord.HTTPException:
+            pass
+
+        return True
+
+    def answer(self, key, user_id, emoji):
+        """
+        Parameters
+        ----------
+        :param key: the prompt message id or the key of a prompt sent with buttons.
+        :param int user_id: the discord id of the member that answered.
+        :param str emoji: the emoji the member chose.
+        :return: True if the key belongs to a waiting prompt, otherwise return False.
+        """
+        prompt = self.pending.get(key)
+        if prompt is None:
+            return False
+
+        self.events += 1
+        author, emojis, _, future = prompt
+
+        # only the intended author's answer with one of the prompt's emojis answers the prompt.
+        if user_id == author and emoji in emojis:
+            self.pending.pop(key)
+            self.answered += 1
+            if not future.done():
+                future.set_result(emoji)
+
+        return True
+
+    def schedule(self):
+        """set the timer to the earliest deadline."""
+        if not self.deadlines:
+            return
+        if self.timer is not None and self.timer.when() <= self.deadlines[0][0]:
+            return
+
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = asyncio.get_event_loop().call_at(self.deadlines[0][0], self.expire)
+
+    def expire(self):
+        """time out every prompt whose deadline has passed, then set the timer to the next deadline."""
+        self.timer = None
+        now = asyncio.get_event_loop().time()
+
+        while self.deadlines and self.deadlines[0][0] <= now:
+            deadline, _, key = heapq.heappop(self.deadlines)
+            prompt = self.pending.get(key)
+
+            # skip prompts that were answered, cancelled, or asked again with a new deadline.
+            if prompt is None or prompt[2] != deadline:
+                continue
+
+            self.pending.pop(key)
+            self.expired += 1
+            if not prompt[3].done():
+                prompt[3].set_result(None)
+
+        self.schedule()
+
+    def stats(self):
+        """:return: a str that represents how many prompts are waiting and how they were answered."""
+        return f'{len(self.pending)} prompts waiting ({len(self.deadlines)} deadlines).\n' \
+               f'{self.events} reactions routed, {self.answered} prompts answered, {self.expired} timed out.'
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import os
+from types import MappingProxyType
+
+
+class Registry:
+    """
+    stores every .json file under a content directory in memory.
+
+    every file is loaded once when the registry is created
+        so that bot commands never have to open a file while they are running.
+    the contents are frozen into read-only structures (dict -> mappingproxy, list -> tuple)
+        to prevent a command from accidentally modifying the shared content.
+    editors can still modify the .json files without restarting the bot:
+        watch() polls the directory and reloads any file that was added, changed, or removed.
+        a reloaded file is validated first and swapped in with a single assignment.
+            commands will either see the old contents or the new contents, never a mix of both.
+        a file that fails validation is reported and the previous contents are kept.
+    the version number increases after each swap
+        for other objects to rebuild anything they computed from the old contents.
+    """
+    def __init__(self, directory):
+        self.directory = directory  # the str that represents the content directory.
+        self.files = MappingProxyType({})  # a read-only dictionary key=relative file path, value=file contents.
+        self.mtimes = {}  # a dictionary key=relative file path, value=last modified time.
+        self.version = 0  # the int that increases every time the contents are swapped.
+        self.watching = False  # True, if the directory is being watched for changes.
+
+        self.reload()
+
+    def get(self, path):
+        """get the contents of a .json file.
+
+        Parameters
+        ----------
+        :param str path: the file path relative to the content directory (i.e. 'chapel/schedule.json').
+        :return: the read-only contents of the file.
+        """
+        return self.files[normalize_path(self.directory, path)]
+
+    def folder(self, name):
+        """get the contents of every .json file in a sub directory.
+
+        Parameters
+        ----------
+        :param str name: the sub directory relative to the content directory (i.e. 'help_msg').
+        :return: a dictionary key=file name, value=read-only contents of the file, sorted by file name.
+        """
+        prefix = f'{name.strip("/")}/'
+        return {path[len(prefix):]: contents for path, contents in self.files.items() if path.startswith(prefix)}
+
+    def reload(self):
+        """reload every .json file that was added, changed, or removed since the last reload.
+
+        :return: a list of the relative file paths that were swapped.
+        """
+        return self.apply(*read_changes(self.directory, dict(self.mtimes)))
+
+    def apply(self, mtimes, loaded):
+        """swap in the files read by read_changes().
+
+        Parameters
+        ----------
+        :param dict mtimes: a dictionary key=relative file path, value=last modified time of every file.
+        :param dict loaded: a dictionary key=relative file path, value=read-only contents of every changed file.
+        :return: a list of the relative file paths that were swapped.
+        """
+        files = dict(self.files)
+        files.update(loaded)
+        changed = list(loaded)
+
+        # remove deleted files.
+        for path in set(files) - set(mtimes):
+            files.pop(path)
+            changed.append(path)
+
+        # swap the contents.
+        self.mtimes = mtimes
+        if changed:
+            self.files = MappingProxyType(dict(sorted(files.items())))
+            self.version += 1
+
+        return changed
+
+    async def watch(self, interval=5):
+        """poll the content directory for changes until the bot closes.
+
+        calling this function while the directory is already being watched does nothing.
+            on_ready can be called more than once when the bot reconnects.
+        the directory is scanned and the changed files are read in a thread
+            so a slow disk never blocks the event loop, only the swap runs on the event loop.
+
+        Parameters
+        ----------
+        :param int interval: the number of seconds between each poll.
+        """
+        if self.watching:
+            return
+
+        self.watching = True
+        loop = asyncio.get_event_loop()
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                changes = await loop.run_in_executor(None, read_changes, self.directory, dict(self.mtimes))
+                for path in self.apply(*changes):
+                    print(f'{path} reloaded.')
+        finally:
+            self.watching = False
+
+
+def read_changes(directory, mtimes):
+    """read every .json file that was added or changed since the given modified times.
+
+    a file that fails validation is reported and keeps its previous modified time to be read again later.
+
+    Parameters
+    ----------
+    :param str directory: the content directory.
+    :param dict mtimes: a dictionary key=relative file path, value=last modified time of the files already loaded.
+    :return: a tuple (dictionary of the current modified times, dictionary of the read-only contents that changed).
+    """
+    current = scan(directory)
+    loaded = {}
+
+    for path, mtime in current.items():
+        if mtimes.get(path) == mtime:
+            continue
+
+        try:
+            contents = load(os.path.join(directory, path))
+            validate(path, contents)
+        except (OSError, ValueError) as error:
+            print(f'{path} could not be loaded: {error}')
+            current[path] = mtimes.get(path)
+            continue
+
+        loaded[path] = freeze(contents)
+
+    return current, loaded
+
+
+def scan(directory):
+    """get the last modified time of every .json file in a directory and its sub directories.
+
+    Parameters
+    ----------
+    :param str directory: the directory to scan.
+    :return: a dictionary key=relative file path, value=last modified time.
+    """
+    mtimes = {}
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith('.json'):
+                path = os.path.join(root, file)
+                mtimes[normalize_path(directory, path)] = os.stat(path).st_mtime_ns
+
+    return mtimes
+
+
+def load(file_path):
+    """stores the contents of a .json file to a dictionary object.
+
+    Parameters
+    ----------
+    :param str file_path: the file path the .json file is located.
+    :return: a dictionary of the contents in a .json file.
+    """
+    with open(file_path, encoding='UTF8') as file:
+        return json.load(file)
+
+
+def freeze(contents):
+    """convert the contents of a .json file into read-only structures.
+
+    Parameters
+    ----------
+    :param contents: the contents to convert.
+    :return: the read-only version of the contents.
+    """
+    if isinstance(contents, dict):
+        return MappingProxyType({key: freeze(value) for key, value in contents.items()})
+    if isinstance(contents, list):
+        return tuple(freeze(value) for value in contents)
+
+    return contents
+
+
+def normalize_path(directory, path):
+    """convert a file path into a path relative to the content directory with forward slashes.
+
+    Parameters
+    ----------
+    :param str directory: the content directory.
+    :param str path: the file path, either relative to the content directory or including it.
+    :return: a str that represents the relative file path.
+    """
+    path = path.replace('\\', '/').replace('//', '/')
+    prefix = f'{directory.strip("/")}/'
+    if path.startswith(prefix):
+        path = path[len(prefix):]
+
+    return path.strip('/')
+
+
+def validate(path, contents):
+    """validate the shape of a .json file before it is used by the bot.
+
+    files are validated according to the sub directory they are stored in.
+    files in an unknown sub directory only need to be a json object.
+
+    Parameters
+    ----------
+    :param str path: the relative file path.
+    :param contents: the contents of the file.
+    :raise ValueError: if the contents do not have the expected shape.
+    """
+    check_type(contents, dict, path)
+
+    folder = path.split('/')[0]
+    for key, value in contents.items():
+        location = f'{path} -> {key}'
+
+        # { week: { date: { day_of_week: str, speaker: str } } }
+        if folder == 'chapel':
+            check_type(value, dict, location)
+            for date, chapel in value.items():
+                check_fields(chapel, {'day_of_week': str, 'speaker': str}, f'{location} -> {date}')
+
+        # { book: { aliases: [str], chapters: int } }
+        if folder == 'esv':
+            check_fields(value, {'aliases': list, 'chapters': int}, location)
+            for alias in value['aliases']:
+                check_type(alias, str, f'{location} -> aliases')
+
+        # { category: { command: description } }
+        if folder in ('developers', 'help_msg', 'java_cheat_sheet'):
+            check_type(value, dict, location)
+            for command, description in value.items():
+                check_type(description, str, f'{location} -> {command}')
+
+        # { course code: { emoji: str, course: str } }
+        if folder == 'tutoring_courses':
+            check_fields(value, {'emoji': str, 'course': str}, location)
+
+        # { day: { tutor: { start_hour: int, start_minute: int, end_hour: int, end_minute: int, location: str } } }
+        if folder == 'tutoring_hours':
+            check_type(value, dict, location)
+            for tutor, hours in value.items():
+                check_fields(hours, {'start_hour': int, 'start_minute': int, 'end_hour': int, 'end_minute': int,
+                                     'location': str}, f'{location} -> {tutor}')
+
+
+def check_type(value, expected, location):
+    """
+    Parameters
+    ----------
+    :param value: the value to check.
+    :param type expected: the type the value should be.
+    :param str location: the location of the value, used in the error message.
+    :raise ValueError: if the value is not the expected type.
+    """
+    if not isinstance(value, expected):
+        raise ValueError(f'{location} should be a {expected.__name__}')
+
+
+def check_fields(value, fields, location):
+    """
+    Parameters
+    ----------
+    :param value: the json object to check.
+    :param dict fields: a dictionary key=required field, value=type the field should be.
+    :param str location: the location of the json object, used in the error message.
+    :raise ValueError: if the json object is missing a field or a field is not the expected type.
+    """
+    check_type(value, dict, location)
+    for field, expected in fields.items():
+        if field not in value:
+            raise ValueError(f'{location} is missing "{field}"')
+        check_type(value[field], expected, f'{location} -> {field}')
+
+
+# every .json file the bot uses.
+registry = Registry('json_files')
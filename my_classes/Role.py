@@ -1,6 +1,7 @@
+import asyncio
 import discord
 import os
-from my_classes.Reaction import Reaction
+from my_classes.Catalog import catalog
 
 
 class Role:
@@ -13,19 +14,64 @@ class Role:
                 :emoji_2: EGR227 - Data Structure
                 :emoji_3: CSC312 - Algorithm
                 :emoji_4: EGR329 - Computer Architecture
+    role edits are buffered per member for a short window
+        because hundreds of students react on the role message at the start of the semester.
+        a separate add_roles/remove_roles call for every reaction runs into the guild's rate limit.
+    when the window ends the member's roles are added with one request and removed with another.
+        adding then removing the same reaction within the window cancels out.
+        only the roles that changed are sent, so roles given to the member elsewhere during the window are kept.
+    an error in a member's edit is printed instead of being lost with the task.
     """
-    def __init__(self, bot):
+    def __init__(self, bot, window=2):
         self.bot = bot  # the discord bot that will be using this class
-        self.emojis = Reaction().course_emojis()  # a dictionary of available course codes and it corresponding emojis.
         self.channel = int(os.getenv("ROLE_REACTION_CHANNEL_ID"))  # the discord role reaction channel id.
         self.message = int(os.getenv("ROLE_REACTION_MESSAGE_ID"))  # the discord role message id.
+        self.role_ids = {}  # a dictionary key=course code, value=discord role id.
+        self.window = window  # the number of seconds role edits are buffered for each member.
+        self.pending = {}  # a dictionary key=member id, value=dictionary key=role id, value=True if role is added.
+        self.events = 0  # the number of role edits received.
+        self.requests = 0  # the number of member edits sent to discord.
 
     async def add(self):
         """add reactions to the role assigning message."""
         message = await self.bot.get_channel(self.channel).fetch_message(self.message)
-        for emoji in self.emojis:
+        for emoji in catalog.emojis():
             await message.add_reaction(emoji)
 
+    def is_target(self, payload):
+        """checks if a raw reaction event was made on the role reaction message.
+
+        this check should be done before anything else
+            because every reaction anywhere in the guild triggers a raw reaction event.
+
+        Parameters
+        ----------
+        :param discord.raw_models. payload: the raw event payload data.
+        :return: True if the reaction was made on the role reaction message, otherwise return False.
+        """
+        return payload.message_id == self.message
+
+    def get_role(self, guild, course_code):
+        """get the discord role that corresponds to given course code.
+
+        the role id is cached by course code so the look up is O(1) after the first time.
+            the cache is refreshed if the role was deleted or renamed.
+
+        Parameters
+        ----------
+        :param discord.Guild guild: the guild the role is in.
+        :param str course_code: the course code the role is named after.
+        :return: the discord.Role, otherwise return None.
+        """
+        role = guild.get_role(self.role_ids.get(course_code, 0))
+
+        if role is None or role.name != course_code:
+            role = discord.utils.get(guild.roles, name=course_code)
+            if role is not None:
+                self.role_ids[course_code] = role.id
+
+        return role
+
     async def edit(self, payload, add=False, remove=False, delete=False):
         """edit a discord role from user according to the action of a reaction.
 
@@ -33,6 +79,8 @@ class Role:
         remove the corresponding role if user removes a reaction from the role reaction message.
         delete any reactions to the role reaction message that does not corresponding to a course code.
             custom emojis cannot be removed.
+        reactions on any other message are ignored before anything is looked up.
+        the guild, member, and role are resolved through discord.py's id keyed caches.
 
         Parameters
         ----------
@@ -41,35 +89,97 @@ class Role:
         :param bool remove: True, if the bot is removing a role from the user.
         :param bool delete: True, if any non role assigning reactions will be deleted.
         """
-        if (add and remove) or (not add and not remove):
+        if not self.is_target(payload) or add == remove:
             return
 
-        # get reaction message and roles.
-        message_id = payload.message_id
-        if message_id == self.message:
-            guild_id = payload.guild_id
-            guild = discord.utils.find(lambda guild: guild.id == guild_id, self.bot.guilds)
+        # get roles.
+        guild = self.bot.get_guild(payload.guild_id)
+        course_code = catalog.emojis().get(payload.emoji.name)
 
-            role = None
-            for emoji in self.emojis:
-                if payload.emoji.name == emoji:
-                    role = discord.utils.get(guild.roles, name=self.emojis.get(emoji))
+        if guild is not None and course_code is not None:
+            role = self.get_role(guild, course_code)
 
+            # buffer student's role edit.
             if role is not None:
-                member = discord.utils.find(lambda member: member.id == payload.user_id, guild.members)
-
-                # edit student's role.
-                if member is not None:
-                    if add:
-                        await member.add_roles(role)
-                    if remove:
-                        await member.remove_roles(role)
-
-            # delete non course code reactions.
-            if delete:
-                if payload.emoji.name not in self.emojis:
-                    message = await self.bot.get_channel(payload.channel_id).fetch_message(self.message)
-                    emoji = payload.emoji.name
-                    user = self.bot.get_user(payload.user_id)
-
-                    await message.remove_reaction(emoji, user)
+                self.buffer(guild, payload.user_id, role, add)
+
+        # delete non course code reactions.
+        if delete and course_code is None:
+            message = await self.bot.get_channel(payload.channel_id).fetch_message(self.message)
+            emoji = payload.emoji.name
+            user = self.bot.get_user(payload.user_id)
+
+            await message.remove_reaction(emoji, user)
+
+    def buffer(self, guild, member_id, role, add):
+        """buffer a role edit for a member until the member's window ends.
+
+        the last edit for each role wins.
+
+        Parameters
+        ----------
+        :param discord.Guild guild: the guild the member is in.
+        :param int member_id: the member's discord id.
+        :param discord.Role role: the role being edited.
+        :param bool add: True, if the role is being added, otherwise the role is being removed.
+        """
+        self.events += 1
+
+        # start the member's window.
+        if member_id not in self.pending:
+            self.pending[member_id] = {}
+            task = self.bot.loop.create_task(self.flush(guild, member_id))
+            task.add_done_callback(lambda done: self.supervise(done, member_id))
+
+        self.pending[member_id][role.id] = add
+
+    async def flush(self, guild, member_id):
+        """wait for the member's window to end, then add and remove the roles that changed.
+
+        no request is sent if the member already has every added role and none of the removed roles.
+
+        Parameters
+        ----------
+        :param discord.Guild guild: the guild the member is in.
+        :param int member_id: the member's discord id.
+        """
+        await asyncio.sleep(self.window)
+        changes = self.pending.pop(member_id, {})
+
+        member = guild.get_member(member_id)
+        if member is None:
+            return
+
+        # compare the buffered edits to the member's current roles.
+        current = {role.id for role in member.roles}
+        added, removed = [], []
+        for role_id, add in changes.items():
+            role = guild.get_role(role_id)
+            if role is None or add == (role_id in current):
+                continue
+            (added if add else removed).append(role)
+
+        # edit student's roles.
+        if added:
+            self.requests += 1
+            await member.add_roles(*added)
+        if removed:
+            self.requests += 1
+            await member.remove_roles(*removed)
+
+    def supervise(self, task, member_id):
+        """print the error a member's role edit failed with.
+
+        Parameters
+        ----------
+        :param asyncio.Task task: the finished flush task.
+        :param int member_id: the member's discord id.
+        """
+        if not task.cancelled() and task.exception() is not None:
+            print(f'role edit for {member_id} failed: {task.exception()!r}')
+
+    def stats(self):
+        """:return: a str that represents how many requests were saved by buffering the role edits."""
+        return f'{self.events} role edits received.\n' \
+               f'{self.requests} member edits sent.\n' \
+               f'{self.events - self.requests} requests saved.'
@@ -0,0 +1,371 @@
+import asyncio
+import discord
+import math
+import os
+import time
+from collections import deque
+
+# the permissions of everyone that is not invited to a private room.
+HIDDEN = {'manage_permissions': False, 'connect': False, 'view_channel': False, 'stream': True, 'move_members': False}
+
+# the admin like permissions of every member invited to a private room.
+ADMIN = {'manage_permissions': True, 'connect': True, 'view_channel': True, 'stream': True, 'move_members': True,
+         'speak': True}
+
+SPARE_NAME = 'Spare Room'  # the name of a room waiting in the pool.
+
+
+class RoomManager:
+    """
+    keeps track of every private room generated by a student.
+
+    every room has one owner and every owner has at most one room.
+        both are stored in a dictionary (owner -> room and room -> owner) to look up either in O(1).
+    admin permissions are granted to the owner and every invited member at the same time.
+    if the owner leaves the room:
+        the ownership is transferred to the member that has been in the room the longest.
+            the time every member joined is recorded, discord does not keep the members in the order they joined.
+    if everyone leaves the room, the owner no longer owns it and can generate another room.
+        the first member to join the empty room owns it again.
+    a room that is empty is deleted by the reaper after it has been idle for [idle] seconds
+        so a member can leave and come back, and a room nobody joined is not left behind.
+    the reaper uses a timer wheel instead of a timer per room.
+        the wheel is a circle of buckets, one bucket for each [tick] seconds.
+        scheduling or cancelling a room is O(1), each tick only looks at the rooms in one bucket.
+    creating and deleting a channel are two of discord's slowest and most rate limited requests.
+        a pool of hidden spare rooms is kept ready in the private room category.
+        generating a room from the pool is one edit (name and every permission at once) and an invite.
+            the edit replaces every permission, the overwrites the PermissionWriter remembers are forgotten.
+        a deleted room goes back to the pool instead, if the pool is not full.
+        the size of the pool follows demand, one spare room for every room generated in the last [window] seconds.
+            at least [min_pool] and at most [max_pool] spare rooms.
+        a spare room that was deleted or cannot be edited is skipped for the next one, or a new room is created.
+        spare rooms left from before a restart are adopted back into the pool instead of being deleted.
+    """
+    def __init__(self, bot, ledger, permissions, idle=300, tick=15, window=600, min_pool=1, max_pool=5):
+        self.bot = bot  # the discord bot that will be using this class.
+        self.ledger = ledger  # the ledger that records every room for the startup clean up.
+        self.permissions = permissions  # the PermissionWriter that batches overwrite changes.
+        self.category = int(os.getenv("PRIVATE_ROOM_CATEGORY_ID"))  # the private room category id.
+        self.owners = {}  # a dictionary key=owner's discord id, value=room channel id.
+        self.rooms = {}  # a dictionary key=room channel id, value=owner's discord id.
+        self.joined = {}  # a dictionary key=room channel id, value=dictionary key=member's discord id, value=time.
+        self.tick = tick  # the number of seconds between each turn of the wheel.
+        self.ticks = math.ceil(idle / tick)  # the number of turns a room can be idle for.
+        self.wheel = [set() for _ in range(self.ticks + 2)]  # the buckets of room channel ids to check.
+        self.slots = {}  # a dictionary key=room channel id, value=index of its bucket in the wheel.
+        self.cursor = 0  # the index of the bucket the wheel is at.
+        self.reaping = False  # True, if the reaper is running.
+        self.created = 0  # the number of rooms generated.
+        self.deleted = 0  # the number of rooms deleted.
+        self.transferred = 0  # the number of times a room changed owner.
+        self.pool = []  # a list of hidden spare room channels.
+        self.filling = False  # True, if spare rooms are being created.
+        self.window = window  # the number of seconds demand is measured over.
+        self.min_pool = min_pool  # the minimum number of spare rooms.
+        self.max_pool = max_pool  # the maximum number of spare rooms.
+        self.demand = deque()  # the time.monotonic() of every room generated in the last [window] seconds.
+        self.latencies = {True: deque(maxlen=100), False: deque(maxlen=100)}  # key=from the pool, value=seconds.
+
+    def room_of(self, owner_id):
+        """
+        Parameters
+        ----------
+        :param int owner_id: the member's discord id.
+        :return: the room channel id the member owns, otherwise return None.
+        """
+        return self.owners.get(owner_id)
+
+    def is_room(self, channel_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the channel id.
+        :return: True if the channel is a private room, otherwise return False.
+        """
+        return channel_id in self.rooms
+
+    async def open(self, guild, owner, guests):
+        """generate a private room with admin permissions for every member.
+
+        Parameters
+        ----------
+        :param discord.Guild guild: the server the room is generated in.
+        :param discord.Member owner: the member that generated the room.
+        :param list guests: the other members invited to the room.
+        :return: a tuple (room channel, invite).
+        """
+        start = time.monotonic()
+        self.demand.append(start)
+
+        # private rooms are hidden from everyone that is not invited.
+        name = f'Private Room: {owner}'
+        overwrites = {guild.default_role: discord.PermissionOverwrite(**HIDDEN)}
+        for member in [owner] + guests:
+            overwrites[member] = discord.PermissionOverwrite(**ADMIN)
+
+        channel, invite = None, None
+        while self.pool and channel is None:
+            spare = self.pool.pop()
+            try:
+                self.permissions.forget(spare)
+                _, invite = await asyncio.gather(spare.edit(name=name, overwrites=overwrites), spare.create_invite())
+                channel = spare
+            except discord.NotFound:
+                self.ledger.remove_room(spare.id)
+            except discord.HTTPException as error:
+                # the room stays in the ledger to be deleted on the next startup.
+                print(f'spare room {spare.id} could not be used: {error}')
+
+        pooled = channel is not None
+        if not pooled:
+            category = guild.get_channel(self.category)
+            channel = await category.create_voice_channel(name, overwrites=overwrites)
+            self.ledger.add_room(channel.id)
+            invite = await channel.create_invite()
+
+        self.add(channel.id, owner.id)
+        self.latencies[pooled].append(time.monotonic() - start)
+
+        # replace the spare room that was used.
+        asyncio.ensure_future(self.fill())
+
+        return channel, invite
+
+    def add(self, channel_id, owner_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the room channel id.
+        :param int owner_id: the owner's discord id.
+        """
+        self.owners[owner_id] = channel_id
+        self.rooms[channel_id] = owner_id
+        self.created += 1
+
+        # a room nobody joins is deleted by the reaper.
+        self.schedule(channel_id)
+
+    async def grant(self, member, channel):
+        """give admin like permission to a given member for a given channel.
+
+        Parameters
+        ----------
+        :param discord.Member member: the member object that is being granted the permissions.
+        :param discord.VoiceChannel channel: the channel object that the permission will be set.
+        """
+        await self.permissions.set(channel, member, discord.PermissionOverwrite(**ADMIN))
+
+    async def update(self, member, before, after):
+        """update the rooms when a member joins or leaves a voice channel.
+
+        Parameters
+        ----------
+        :param discord.Member member: the member whose voice states changed.
+        :param discord.VoiceState before: the voice state prior to the changes.
+        :param discord.VoiceState after: the voice state after to the changes.
+        """
+        if before.channel == after.channel:
+            return
+
+        if after.channel is not None and self.is_room(after.channel.id):
+            channel = after.channel
+            self.cancel(channel.id)
+            self.joined.setdefault(channel.id, {})[member.id] = time.monotonic()
+
+            # the first member to join a room that was left empty owns it.
+            owner_id = self.rooms[channel.id]
+            if self.owners.get(owner_id) != channel.id:
+                if owner_id == member.id:
+                    self.owners.setdefault(member.id, channel.id)
+                else:
+                    self.transfer(channel.id, member.id)
+
+            await self.grant(member, channel)
+
+        if before.channel is not None and self.is_room(before.channel.id):
+            channel = before.channel
+            joined = self.joined.get(channel.id, {})
+            joined.pop(member.id, None)
+
+            if not channel.members:
+                self.release(channel.id)
+                self.schedule(channel.id)
+            elif self.rooms[channel.id] == member.id:
+                longest = min(channel.members, key=lambda present: joined.get(present.id, math.inf))
+                self.transfer(channel.id, longest.id)
+
+    def transfer(self, channel_id, owner_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the room channel id.
+        :param int owner_id: the new owner's discord id.
+        """
+        if self.owners.get(self.rooms[channel_id]) == channel_id:
+            self.owners.pop(self.rooms[channel_id])
+
+        # the new owner keeps their own room if they already have one.
+        if owner_id not in self.owners:
+            self.owners[owner_id] = channel_id
+        self.rooms[channel_id] = owner_id
+        self.transferred += 1
+
+    def release(self, channel_id):
+        """the owner of a room that was left empty no longer owns it, the room still remembers its last owner.
+
+        Parameters
+        ----------
+        :param int channel_id: the room channel id.
+        """
+        owner_id = self.rooms[channel_id]
+        if self.owners.get(owner_id) == channel_id:
+            self.owners.pop(owner_id)
+
+    async def close(self, channel):
+        """remove a room from every index and return it to the pool, or delete it if the pool is full.
+
+        Parameters
+        ----------
+        :param discord.VoiceChannel channel: the room channel.
+        """
+        self.remove(channel.id)
+        self.permissions.forget(channel)
+        if len(self.pool) < self.target():
+            await channel.edit(name=SPARE_NAME,
+                               overwrites={channel.guild.default_role: discord.PermissionOverwrite(**HIDDEN)})
+            self.pool.append(channel)
+            return
+
+        await channel.delete()
+        self.ledger.remove_room(channel.id)
+        self.deleted += 1
+
+    def adopt(self, channel):
+        """return a spare room left from before a restart to the pool, if the pool is not full.
+
+        Parameters
+        ----------
+        :param discord.VoiceChannel channel: the spare room recorded in the ledger.
+        :return: True if the room was added to the pool, otherwise return False.
+        """
+        if channel.name != SPARE_NAME or channel.members or len(self.pool) >= self.target():
+            return False
+
+        self.pool.append(channel)
+        return True
+
+    def target(self):
+        """:return: an int that represents the number of spare rooms the pool should have."""
+        while self.demand and time.monotonic() - self.demand[0] > self.window:
+            self.demand.popleft()
+
+        return min(self.max_pool, max(self.min_pool, len(self.demand)))
+
+    async def fill(self):
+        """create spare rooms until the pool is the size of the current demand.
+
+        calling this function while spare rooms are being created does nothing.
+        """
+        if self.filling:
+            return
+
+        self.filling = True
+        try:
+            guild = self.bot.get_guild(int(os.getenv("GUILD_SERVER_ID")))
+            category = guild.get_channel(self.category)
+            while len(self.pool) < self.target():
+                channel = await category.create_voice_channel(
+                    SPARE_NAME, overwrites={guild.default_role: discord.PermissionOverwrite(**HIDDEN)})
+                self.ledger.add_room(channel.id)
+                self.pool.append(channel)
+        except discord.HTTPException as error:
+            print(f'spare room could not be created: {error}')
+        finally:
+            self.filling = False
+
+    async def shrink(self):
+        """delete spare rooms that are no longer needed because demand went down."""
+        while len(self.pool) > self.target():
+            channel = self.pool.pop()
+            try:
+                await channel.delete()
+                self.ledger.remove_room(channel.id)
+            except discord.HTTPException as error:
+                print(f'spare room {channel.id} could not be deleted: {error}')
+
+    def remove(self, channel_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the room channel id to remove from every index.
+        """
+        self.cancel(channel_id)
+        self.joined.pop(channel_id, None)
+        owner_id = self.rooms.pop(channel_id, None)
+        if self.owners.get(owner_id) == channel_id:
+            self.owners.pop(owner_id)
+
+    def schedule(self, channel_id):
+        """schedule a room to be checked by the reaper after it has been idle for long enough.
+
+        Parameters
+        ----------
+        :param int channel_id: the room channel id.
+        """
+        self.cancel(channel_id)
+        slot = (self.cursor + self.ticks + 1) % len(self.wheel)
+        self.wheel[slot].add(channel_id)
+        self.slots[channel_id] = slot
+
+    def cancel(self, channel_id):
+        """
+        Parameters
+        ----------
+        :param int channel_id: the room channel id.
+        """
+        slot = self.slots.pop(channel_id, None)
+        if slot is not None:
+            self.wheel[slot].discard(channel_id)
+
+    async def reap(self):
+        """turn the wheel every tick and delete the rooms that are still empty, then resize the pool.
+
+        calling this function while the reaper is already running does nothing.
+            on_ready can be called more than once when the bot reconnects.
+        """
+        if self.reaping:
+            return
+
+        self.reaping = True
+        while not self.bot.is_closed():
+            await asyncio.sleep(self.tick)
+            self.cursor = (self.cursor + 1) % len(self.wheel)
+            bucket, self.wheel[self.cursor] = self.wheel[self.cursor], set()
+
+            for channel_id in bucket:
+                self.slots.pop(channel_id, None)
+                channel = self.bot.get_channel(channel_id)
+                try:
+                    if channel is None:
+                        self.remove(channel_id)
+                    elif not channel.members:
+                        await self.close(channel)
+                except Exception as error:
+                    print(f'private room {channel_id} could not be deleted: {error}')
+
+            await self.shrink()
+
+        self.reaping = False
+
+    def stats(self):
+        """:return: a str that represents the number of rooms and how often rooms are generated and deleted."""
+        idle = sum(len(bucket) for bucket in self.wheel)
+        ready = {pooled: sum(latencies) / len(latencies) * 1000 if latencies else 0
+                 for pooled, latencies in self.latencies.items()}
+
+        return f'{len(self.rooms)} rooms open ({idle} idle), {len(self.pool)}/{self.target()} spare rooms.\n' \
+               f'{self.created} rooms generated, {self.deleted} rooms deleted, ' \
+               f'{self.transferred} ownership transfers.\n' \
+               f'room ready in {ready[True]:.0f} ms from the pool ({len(self.latencies[True])} rooms), ' \
+               f'{ready[False]:.0f} ms created ({len(self.latencies[False])} rooms).'
@@ -1,73 +1,162 @@
-import json
-from datetime import datetime
+from bisect import bisect_right
+from calendar import day_name
+from datetime import datetime, time, timedelta
+from my_classes.Registry import registry
+
+# the names of the days of the week, index 0 is Monday like datetime.weekday().
+DAYS = tuple(day_name)
 
 
 class Schedule:
-    def __init__(self, course_code):
+    """
+    the tutoring schedule of a course compiled into a sorted timeline for each day of the week.
+
+    each day is compiled into:
+        a list of sessions sorted by start time.
+            to look up the next session with a binary search.
+        a list of boundaries (every start and end time) and the tutor on duty between each boundary.
+            to look up who is on duty with a binary search even when sessions overlap.
+    times are stored as the number of minutes since midnight.
+    the timeline is rebuilt automatically when the .json file is reloaded by the content registry.
+    every look up reads the current time from one clock
+        the clock can be replaced to look up the schedule at any other time.
+    """
+    def __init__(self, course_code, clock=datetime.now):
         self.course_code = course_code  # the class' course code
-        self.schedule = get_schedule(course_code)
+        self.clock = clock  # the function that returns the current datetime.
+        self.version = None  # the content registry version the timeline was built from.
+        self.schedule = {}  # the dictionary that represents the tutoring schedule from the .json file.
+        self.sessions = {}  # a dictionary key=day, value=list of (start, end, tutor, location) sorted by start.
+        self.starts = {}  # a dictionary key=day, value=list of every session's start sorted.
+        self.boundaries = {}  # a dictionary key=day, value=list of every session's start and end sorted.
+        self.on_duty = {}  # a dictionary key=day, value=list of the tutor on duty starting at each boundary.
+        self.times = {}  # a dictionary key=(day, tutor), value=str of the tutor's start and end time.
+        self.text = ''  # the str representation of the tutoring hours.
+
+        self.refresh()
+
+    def refresh(self):
+        """compile the schedule if the content registry has been reloaded since the last build."""
+        if self.version == registry.version:
+            return
+
+        self.schedule = get_schedule(self.course_code)
+        self.sessions, self.starts, self.boundaries, self.on_duty, self.times = {}, {}, {}, {}, {}
+
+        for day in self.schedule:
+            sessions = []
+            for tutor in self.schedule[day]:
+                fields = self.schedule[day][tutor]
+                start = fields['start_hour'] * 60 + fields['start_minute']
+                end = fields['end_hour'] * 60 + fields['end_minute']
+                sessions.append((start, end, tutor, fields['location']))
+
+                self.times[(day, tutor)] = f'{to_string(to_time(start))} {to_string(to_time(end))}'
+
+            # the tutor on duty between each boundary is the first tutor in the file that is tutoring.
+            boundaries = sorted({minute for session in sessions for minute in session[:2]})
+            on_duty = []
+            for minute in boundaries:
+                tutors = [tutor for start, end, tutor, _ in sessions if start <= minute < end]
+                on_duty.append(tutors[0] if tutors else None)
+
+            # sort every session by start time, sessions that start at the same time keep their order in the file.
+            sessions.sort(key=lambda session: session[0])
+
+            self.sessions[day] = sessions
+            self.starts[day] = [session[0] for session in sessions]
+            self.boundaries[day] = boundaries
+            self.on_duty[day] = on_duty
+
+        self.text = self.compile_hours()
+        self.version = registry.version
 
     def tutor_name(self):
         """get the tutor's name that is currently tutoring.
 
-        if no tutor's is found tutoring right now, then get the next tutor that will be tutoring.
+        if no tutor's is found tutoring right now, then get the next tutor that will be tutoring today.
             this feature is for students that sign in early.
 
         :return: a str that represents the tutor's name.
         """
-        # look up today's day of the week in schedule.
-        today = self.schedule[datetime.now().strftime('%A')]
-
-        # get tutor's name.
-        tutor_name = None
-        for tutor in today:
-            # get fields from dictionary.
-            start_hour = today[tutor]['start_hour']
-            start_minute = today[tutor]['start_minute']
-            end_hour = today[tutor]['end_hour']
-            end_minute = today[tutor]['end_minute']
-
-            # convert fields to time object.
-            start_time = datetime.now().replace(hour=start_hour, minute=start_minute)
-            end_time = datetime.now().replace(hour=end_hour, minute=end_minute)
-
-            # get tutor's name.
-            if start_time < datetime.now() < end_time:
-                return tutor
-
-            # store predicted tutor's name.
-            if datetime.now() < start_time:
-                tutor_name = tutor
-
-        # return predicted tutor's name.
-        return tutor_name
-
-    def tutor_time(self, tutor_name, day=datetime.now().strftime('%A')):
-        """get the given tutor's schedule for given day of the week.
+        now = self.clock()
+        tutor = self.current_tutor(now)
+        if tutor is not None:
+            return tutor
+
+        # get the predicted tutor's name.
+        session = self.next_session(now, days=0)
+        return session[1] if session is not None else None
 
+    def current_tutor(self, now=None):
+        """get the tutor that is on duty.
 
         Parameters
         ----------
-        :param str tutor_name: the tutor to look up the schedule for.
-        :param 'datetime' day: the str that represents the day of the week.
+        :param datetime now: the datetime to look up, by default the current time.
+        :return: a str that represents the tutor's name, otherwise return None.
+        """
+        self.refresh()
+        now = now or self.clock()
+        day = DAYS[now.weekday()]
+
+        index = bisect_right(self.boundaries.get(day, []), to_minutes(now)) - 1
+        if index < 0:
+            return None
+
+        return self.on_duty[day][index]
+
+    def next_session(self, now=None, days=7):
+        """get the next session that starts after the given time.
+
+        Parameters
+        ----------
+        :param datetime now: the datetime to look up, by default the current time.
+        :param int days: the number of days after today to look up.
+        :return: a tuple (datetime that represents the start, tutor's name, location), otherwise return None.
         """
-        # get tutor's schedule
-        try:
-            schedule = self.schedule[day][tutor_name]
-        except KeyError:
-            return 'N/A N/A'
+        self.refresh()
+        now = now or self.clock()
+        minute = to_minutes(now)
+
+        for offset in range(days + 1):
+            date = now + timedelta(days=offset) if offset else now
+            day = DAYS[date.weekday()]
+            starts = self.starts.get(day, [])
 
-        # get fields from dictionary.
-        start_hour = schedule['start_hour']
-        start_minute = schedule['start_minute']
-        end_hour = schedule['end_hour']
-        end_minute = schedule['end_minute']
+            # only sessions after the current time are looked up today.
+            index = bisect_right(starts, minute) if offset == 0 else 0
+            if index < len(starts):
+                start, _, tutor, location = self.sessions[day][index]
+                return datetime.combine(date.date(), to_time(start)), tutor, location
 
-        # convert fields to time object.
-        start_time = datetime.now().replace(hour=start_hour, minute=start_minute)
-        end_time = datetime.now().replace(hour=end_hour, minute=end_minute)
+        return None
 
-        return f'{to_string(start_time)} {to_string(end_time)}'
+    def next_tutor(self, now=None):
+        """get the tutor of the next session that starts after the given time.
+
+        Parameters
+        ----------
+        :param datetime now: the datetime to look up, by default the current time.
+        :return: a str that represents the tutor's name, otherwise return None.
+        """
+        session = self.next_session(now)
+        return session[1] if session is not None else None
+
+    def tutor_time(self, tutor_name, day=None):
+        """get the given tutor's schedule for given day of the week.
+
+
+        Parameters
+        ----------
+        :param str tutor_name: the tutor to look up the schedule for.
+        :param str day: the str that represents the day of the week, by default today.
+        """
+        self.refresh()
+        if day is None:
+            day = DAYS[self.clock().weekday()]
+
+        return self.times.get((day, tutor_name), 'N/A N/A')
 
     def hours(self):
         """get the location, tutoring hours (12 hours format), and tutor's name for given course.
@@ -79,6 +168,11 @@ class Schedule:
 
         :return: a str representation of the tutoring hours of a given course.
         """
+        self.refresh()
+        return self.text
+
+    def compile_hours(self):
+        """:return: a str representation of the tutoring hours of a given course."""
         # store schedule in a string.
         tutoring_schedule = ''
         for day in self.schedule:
@@ -91,19 +185,11 @@ class Schedule:
 
             # get tutor's schedule.
             for tutor in self.schedule[day]:
-                # get fields from dictionary.
+                start_time, end_time = self.times[(day, tutor)].split(' ')
                 location = self.schedule[day][tutor]['location']
-                start_hour = self.schedule[day][tutor]['start_hour']
-                start_minute = self.schedule[day][tutor]['start_minute']
-                end_hour = self.schedule[day][tutor]['end_hour']
-                end_minute = self.schedule[day][tutor]['end_minute']
-
-                # convert fields to time object.
-                start_time = datetime.now().replace(hour=start_hour, minute=start_minute)
-                end_time = datetime.now().replace(hour=end_hour, minute=end_minute)
 
                 # add tutor's time, location, and tutor's name time to array.
-                tutoring_schedule += f'**{to_string(start_time)} - {to_string(end_time)}** [{location}] - *{tutor}*\n'
+                tutoring_schedule += f'**{start_time} - {end_time}** [{location}] - *{tutor}*\n'
 
         return tutoring_schedule
 
@@ -118,9 +204,27 @@ def get_schedule(course_code):
     :param str course_code: the str that represents the class course code.
     :return: python dictionary that represents the tutoring schedule.
     """
-    # get tutoring schedule from a local .json file.
-    with open(f'json_files/tutoring_hours/{course_code}.json', encoding='UTF8') as file:
-        return json.load(file)
+    return registry.get(f'tutoring_hours/{course_code}.json')
+
+
+def to_minutes(now):
+    """
+    Parameters
+    ----------
+    :param datetime now: the datetime to convert.
+    :return: a float that represents the number of minutes since midnight.
+    """
+    return now.hour * 60 + now.minute + now.second / 60
+
+
+def to_time(minutes):
+    """
+    Parameters
+    ----------
+    :param int minutes: the number of minutes since midnight.
+    :return: the time object that represents the given minutes.
+    """
+    return time(hour=minutes // 60, minute=minutes % 60)
 
 
 def to_string(time):
@@ -3,7 +3,6 @@ from datetime import date
 from cryptography.fernet import Fernet
 from my_classes.Context import Context
 from my_classes.GoogleSheet import get_google_sheet
-from my_classes.Schedule import Schedule
 
 
 class Student:
@@ -81,7 +80,7 @@ class Student:
             if content['Timestamp'].split(' ')[0] != date.today().strftime('%m-%d-%Y'):
                 return False
             # check if student signed-in.
-            schedule = Schedule(self.course.code)
+            schedule = self.course.schedule
             if content['Student Name'] == self.name() and \
                     str(content['Student ID']) == self.student_id and \
                     content['Course Code'] == self.course.code and \
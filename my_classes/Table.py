@@ -0,0 +1,110 @@
+import math
+import re
+import numpy
+from my_classes.Expression import compile_expression
+
+# the functions a table expression can call, each one calculates every row at once.
+FUNCTIONS = {'abs': numpy.abs, 'ceil': numpy.ceil, 'cos': numpy.cos, 'exp': numpy.exp, 'floor': numpy.floor,
+             'log': lambda x, base=math.e: numpy.log(x) / numpy.log(base), 'log10': numpy.log10, 'log2': numpy.log2,
+             'sin': numpy.sin, 'sqrt': numpy.sqrt, 'tan': numpy.tan}
+
+MAX_ROWS = 50  # the maximum number of rows in a table.
+MAX_COLUMNS = 4  # the maximum number of expressions in a table.
+INLINE_BITS = 2 ** 14  # integer powers without the variable larger than this many bits are rejected.
+
+# the format of a table request (i.e. 'n**2, 2**n for n in 1..10 step 2').
+PATTERN = re.compile(r'(?P<expression>.+)\s+for\s+(?P<variable>[a-z])\s+in\s+(?P<start>-?[\d.]+)\s*\.\.\s*'
+                     r'(?P<stop>-?[\d.]+)(?:\s+step\s+(?P<step>-?[\d.]+))?\s*$', re.IGNORECASE)
+
+
+class Table:
+    """
+    a table of one or more expressions calculated for every value of a variable.
+
+    every row is calculated in one pass with numpy arrays instead of calculating the expression once per row.
+        the variable is an array of every value in the range (i.e. n = [1, 2, ..., 10]).
+        the expression is parsed and checked by the same sandboxed expression engine as .cal.
+    numbers are 64-bit floats
+        results that are too large become inf and results that are undefined become nan (i.e. log(0)).
+    factorial is not available because it cannot be calculated for every row at once.
+    """
+    def __init__(self, text):
+        match = PATTERN.match(text.strip())
+        if match is None:
+            raise SyntaxError('expected: <expression> for <variable> in <start>..<stop> step <step>')
+
+        self.variable = match.group('variable').lower()  # the str that represents the variable name.
+        self.expression = compile_expression(match.group('expression'), (self.variable,))  # the Expression object.
+        self.values = to_range(match.group('start'), match.group('stop'), match.group('step') or '1')  # the rows.
+
+        if len(self.expression.columns) > MAX_COLUMNS:
+            raise ValueError('too many columns')
+
+    def calculate(self):
+        """
+        :return: a list of numpy arrays, one for each column.
+        :raise OverflowError: if an integer power without the variable is too large.
+        """
+        with numpy.errstate(all='ignore'):
+            results = self.expression.evaluate({self.variable: self.values}, FUNCTIONS, INLINE_BITS)
+
+        if len(self.expression.columns) == 1:
+            results = (results, )
+
+        # a column without the variable is the same for every row.
+        return [numpy.broadcast_to(numpy.asarray(result, dtype=float), self.values.shape) for result in results]
+
+    def render(self):
+        """convert the table into a str aligned in columns.
+
+        :return: a str representation of the table.
+        """
+        headers = [self.variable] + self.expression.headers()
+        columns = [self.values] + self.calculate()
+        rows = [headers] + [[to_string(column[row]) for column in columns] for row in range(len(self.values))]
+
+        widths = [max(len(row[index]) for row in rows) for index in range(len(headers))]
+        lines = [' | '.join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows]
+        lines.insert(1, '-+-'.join('-' * width for width in widths))
+
+        separator = '\n'
+        return separator.join(lines)
+
+
+def to_range(start, stop, step):
+    """
+    Parameters
+    ----------
+    :param str start: the first value.
+    :param str stop: the last value, included if the step lands on it.
+    :param str step: the difference between each value.
+    :return: a numpy array of every value from start to stop.
+    :raise ValueError: if the range is empty or has too many rows.
+    """
+    start, stop, step = float(start), float(stop), float(step)
+    if step == 0 or (stop - start) / step < 0:
+        raise ValueError('range is empty')
+
+    # a small tolerance so a decimal step still lands on stop (i.e. 0..1 step 0.1).
+    rows = math.floor((stop - start) / step + 1e-9) + 1
+    if rows > MAX_ROWS:
+        raise ValueError('too many rows')
+
+    return start + step * numpy.arange(rows)
+
+
+def to_string(value):
+    """
+    Parameters
+    ----------
+    :param float value: the value to convert.
+    :return: a str representation of the value rounded to 3 decimal places.
+    """
+    if not math.isfinite(value):
+        return str(value)
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    if abs(value) >= 1e15 or abs(value) < 1e-3:
+        return f'{value:.3e}'
+
+    return str(round(value, 3))
@@ -0,0 +1,80 @@
+class Trie:
+    """
+    a prefix tree that maps every prefix of the inserted strings to the values stored under it.
+
+    each node stores the values of every string that starts with the node's prefix
+        so a prefix look up only walks the length of the prefix.
+    strings that are close to a prefix can be found by edit distance
+        the walk stops early on any branch that cannot be within the maximum distance.
+    """
+    def __init__(self):
+        self.children = {}  # a dictionary key=character, value=child Trie.
+        self.values = []  # the values of every string that starts with this node's prefix in insertion order.
+
+    def insert(self, string, value):
+        """
+        Parameters
+        ----------
+        :param str string: the string to insert.
+        :param value: the value stored under the string.
+        """
+        node = self
+        node.values.append(value)
+        for character in string:
+            node = node.children.setdefault(character, Trie())
+            node.values.append(value)
+
+    def starts_with(self, prefix):
+        """
+        Parameters
+        ----------
+        :param str prefix: the prefix to look up.
+        :return: a list of the values of every string that starts with the prefix.
+        """
+        node = self
+        for character in prefix:
+            node = node.children.get(character)
+            if node is None:
+                return []
+
+        return node.values
+
+    def closest(self, prefix, max_distance):
+        """find the values of the strings that start with something closest to the prefix.
+
+        the distance is the number of characters inserted, deleted, or replaced (Levenshtein distance).
+
+        Parameters
+        ----------
+        :param str prefix: the prefix to look up.
+        :param int max_distance: the maximum distance allowed.
+        :return: a tuple (distance, set of values), the set is empty if nothing is within the maximum distance.
+        """
+        best_distance, best_values = max_distance + 1, set()
+
+        # each row is the distance between the prefix and the path walked so far.
+        stack = [(self, list(range(len(prefix) + 1)))]
+        while stack:
+            node, row = stack.pop()
+
+            # the whole prefix matches the path walked so far.
+            if row[-1] < best_distance:
+                best_distance, best_values = row[-1], set(node.values)
+            elif row[-1] == best_distance:
+                best_values.update(node.values)
+
+            # skip branches that can no longer get closer.
+            if min(row) > min(best_distance, max_distance):
+                continue
+
+            for character, child in node.children.items():
+                next_row = [row[0] + 1]
+                for index in range(1, len(prefix) + 1):
+                    replace = row[index - 1] + (prefix[index - 1] != character)
+                    next_row.append(min(next_row[index - 1] + 1, row[index] + 1, replace))
+                stack.append((child, next_row))
+
+        if best_distance > max_distance:
+            return best_distance, set()
+
+        return best_distance, best_values
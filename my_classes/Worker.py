@@ -1,18 +1,75 @@
+import asyncio
+import time
 from my_classes.Context import Context
-from my_classes.Schedule import Schedule
 
 
 class Worker:
     def __init__(self, ctx, name: str, course: 'Course'):
         self.ctx = Context(ctx)  # the object that represents this member's Content.
-        self.schedule = Schedule(course.code)  # the schedule object that corresponds to the tutor's session.
+        self.schedule = course.schedule  # the schedule object that corresponds to the tutor's session.
         self.name = name  # the str that represents the tutor's full name.
         self.course = course  # the course object the tutor is tutoring.
         self.reaction_msg = None  # the reaction message sent by the tutor to get the next student.
+        self.sweep = None  # the asyncio.Task that asks the students in the queue if they are ready.
+        self.sweep_start = None  # the time.monotonic() the sweep started.
+        self.sweep_round = 0  # the number of times the sweep went through the whole queue.
 
     def is_circulating(self):
         """checks if the tutor's reaction message is still awaiting a response.
 
         :return: True if the tutor's reaction message is still circulating the queue, otherwise return False.
         """
-        return self.reaction_msg is not None
+        return self.sweep is not None and not self.sweep.done()
+
+    def start_sweep(self, coroutine):
+        """run a readiness sweep as a task owned by the tutor.
+
+        the sweep is listed in every running sweep until it ends.
+        an error in the sweep is printed instead of being lost with the task.
+
+        Parameters
+        ----------
+        :param coroutine: the coroutine that asks the students in the queue if they are ready.
+        :return: the asyncio.Task of the sweep.
+        """
+        self.sweep = asyncio.ensure_future(coroutine)
+        self.sweep_start = time.monotonic()
+        self.sweep_round = 0
+        sweeps[self.ctx.discord_id()] = self
+
+        def supervise(task):
+            if sweeps.get(self.ctx.discord_id()) is self and self.sweep is task:
+                sweeps.pop(self.ctx.discord_id())
+            if not task.cancelled() and task.exception() is not None:
+                print(f'{self.name}\'s readiness sweep failed: {task.exception()!r}')
+
+        self.sweep.add_done_callback(supervise)
+        return self.sweep
+
+    async def stop_sweep(self):
+        """cancel the tutor's readiness sweep and wait for it to delete its reaction message.
+
+        :return: True if a sweep was running, otherwise return False.
+        """
+        if not self.is_circulating():
+            return False
+
+        # wait without awaiting the sweep, so only a cancellation of the caller is raised.
+        self.sweep.cancel()
+        await asyncio.wait({self.sweep})
+
+        return True
+
+
+def sweep_stats():
+    """:return: a str that represents every running readiness sweep and how long it has been running."""
+    lines = []
+    for tutor in sweeps.values():
+        age = time.monotonic() - tutor.sweep_start
+        lines.append(f'{tutor.name} ({tutor.course.code}) - round {tutor.sweep_round + 1}, running for {age:.0f}s.')
+
+    return '\n'.join(lines) or 'no readiness sweeps running.'
+
+
+# every running readiness sweep.
+sweeps = {}  # a dictionary key=tutor's discord id, value=Worker.
@@ -0,0 +1,24 @@
+import os
+import sys
+import tempfile
+
+# the bot reads its configuration from the environment when its modules are imported.
+directory = tempfile.mkdtemp()
+for name in ('GUILD_SERVER_ID', 'PRIVATE_ROOM_CATEGORY_ID', 'BOT_ANNOUNCEMENT_CHANNEL_ID', 'BOT_COMMAND_CHANNEL_ID',
+             'STUDENT_ACCOUNTS_CHANNEL_ID', 'ROLE_REACTION_CHANNEL_ID', 'DEVELOPERS_ROLE_ID', 'TUTOR_ROLE_ID',
+             'ROLE_REACTION_MESSAGE_ID', 'BOT_ID'):
+    os.environ.setdefault(name, '1')
+os.environ.setdefault('BOT_PREFIX', '.')
+os.environ.setdefault('LEDGER_PATH', os.path.join(directory, 'ledger.json'))
+os.environ.setdefault('ESV_CACHE_PATH', os.path.join(directory, 'esv_cache.sqlite3'))
+
+# the bot reads its .json files relative to the repository.
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+os.chdir(root)
+
+# every test imports the bot, which cannot be imported without discord.py.
+try:
+    import discord  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ['test_*.py']
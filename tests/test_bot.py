@@ -0,0 +1,35 @@
+import asyncio
+from types import SimpleNamespace
+
+import cogs.bot as bot
+
+
+def test_messages_are_attributed_to_their_invocation():
+    """interleaved commands only store the messages they sent themselves."""
+    bot.msg_history.clear()
+    invocations = [(author, channel) for author in range(1, 6) for channel in (10, 20)]
+
+    async def invoke(discord_id, channel_id):
+        bot.invocation.set((discord_id, channel_id))
+        for number in range(5):
+            bot.store_last_bot_msg(SimpleNamespace(id=(discord_id, channel_id, number)))
+            await asyncio.sleep(0)  # let every other invocation send a message in between.
+
+    async def run():
+        await asyncio.gather(*(invoke(*current) for current in invocations))
+
+    asyncio.run(run())
+
+    for discord_id, channel_id in invocations:
+        messages = [message.id for message in bot.msg_history[discord_id][channel_id]]
+        assert messages == [(discord_id, channel_id, number) for number in range(5)]
+
+
+def test_messages_outside_an_invocation_are_not_stored():
+    bot.msg_history.clear()
+
+    async def run():
+        bot.store_last_bot_msg(SimpleNamespace(id=1))
+
+    asyncio.run(run())
+    assert bot.msg_history == {}
@@ -0,0 +1,25 @@
+import pytest
+
+from my_classes.Catalog import catalog
+
+
+@pytest.mark.parametrize('text, codes', [
+    ('EGR222', ['EGR222']),
+    ('egr 222', ['EGR222']),
+    ('222 ', ['EGR222']),
+    ('data structures', ['EGR227']),
+    ('algoritms', ['CSC312']),
+    ('csc', ['CSC312']),
+    ('structures', ['EGR227']),
+])
+def test_resolve_finds_the_course(text, codes):
+    assert catalog.resolve(text) == codes
+
+
+@pytest.mark.parametrize('text', ['EGR2222', '2222', 'egr 22277', 'csc3120', '', None, 'biology'])
+def test_resolve_rejects_what_is_not_a_course(text):
+    assert catalog.resolve(text) == []
+
+
+def test_resolve_keeps_every_close_course():
+    assert set(catalog.resolve('egr 22')) == {'EGR222', 'EGR227'}
@@ -0,0 +1,22 @@
+from my_classes.CheatSheet import CheatSheet, tokenize
+
+
+def test_tokenize_splits_camel_case():
+    assert tokenize('indexOf(Object)') == ['indexof', 'index', 'object']
+    assert tokenize('the toUpperCase of a String') == ['touppercase', 'upper', 'case', 'string']
+
+
+def test_search_ranks_method_names_first():
+    cheat_sheet = CheatSheet()
+    java_class, data_type, method, _ = cheat_sheet.search('list contains')[0]
+
+    assert (java_class, method) == ('list', 'contains(Object object)')
+    assert cheat_sheet.search('conta')
+
+
+def test_type_parameters_are_not_methods():
+    cheat_sheet = CheatSheet()
+
+    assert all(not data_type.endswith(':') for _, data_type, _, _ in cheat_sheet.methods)
+    assert 'Type Parameters:' in cheat_sheet.get_class('List')
+    assert cheat_sheet.get_class('lists') is None
@@ -0,0 +1,127 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+import cogs.bot as bot
+from my_classes.Ledger import Ledger
+from my_classes.PermissionWriter import PermissionWriter
+from my_classes.RoomManager import SPARE_NAME, RoomManager
+
+
+def http_error(kind=discord.HTTPException, status=500):
+    return kind(SimpleNamespace(status=status, reason='error'), 'error')
+
+
+class Channel:
+    def __init__(self, channel_id, error=None, overwrites=None, name='Private Room'):
+        self.id = channel_id
+        self.name = name
+        self.members = []
+        self.error = error
+        self.overwrites = overwrites or {}
+        self.requests = 0
+        self.deleted = []
+
+    async def edit(self, overwrites):
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+        self.overwrites = overwrites
+
+    async def delete(self):
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        if self.error is not None:
+            raise self.error
+
+    async def delete_messages(self, messages):
+        self.requests += 1
+        if self.error is not None:
+            raise self.error
+        self.deleted += [message.id for message in messages]
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    members = {member_id: discord.Object(id=member_id) for member_id in range(1, 10)}
+    channels = {}
+    guild = SimpleNamespace(get_channel=channels.get, get_member=members.get, get_role=lambda role_id: None)
+
+    ledger = Ledger(str(tmp_path / 'ledger.json'))
+    monkeypatch.setattr(bot, 'ledger', ledger)
+    monkeypatch.setattr(bot, 'permissions', PermissionWriter())
+    monkeypatch.setattr(bot, 'rooms', RoomManager(bot.bot, ledger, bot.permissions, min_pool=1))
+    monkeypatch.setattr(bot.bot, 'get_guild', lambda guild_id: guild)
+    return SimpleNamespace(channels=channels, members=members, ledger=ledger)
+
+
+def test_only_undone_entries_are_removed(server):
+    members = server.members
+    server.channels[10] = Channel(10, overwrites={members[1]: 'allow', members[2]: 'allow'})
+    server.channels[11] = Channel(11, error=http_error(), overwrites={members[3]: 'allow'})
+    server.channels[20] = Channel(20)
+    server.channels[21] = Channel(21, error=http_error(discord.NotFound, 404))
+    server.channels[22] = Channel(22, error=http_error())
+    server.channels[30] = Channel(30)
+
+    ledger = server.ledger
+    ledger.overwrites = {10: {1, 2}, 11: {3}, 12: {4}}
+    ledger.rooms = {20, 21, 22, 23}
+    ledger.messages = {30: {100, 101}, 31: {102}}
+
+    async def main():
+        cleaning = asyncio.ensure_future(bot.clean_up_channels())
+        await asyncio.sleep(0)
+        # changes recorded while cleaning up are kept.
+        ledger.add_overwrite(10, 5)
+        ledger.add_room(24)
+        await cleaning
+
+    asyncio.run(main())
+
+    assert server.channels[10].overwrites == {}
+    assert server.channels[30].deleted == [100, 101]
+    assert ledger.overwrites == {10: {5}, 11: {3}}
+    assert ledger.rooms == {22, 24}
+    assert ledger.messages == {}
+    assert Ledger(ledger.path).rooms == {22, 24}
+
+
+def test_spare_rooms_are_adopted(server):
+    for channel_id in (40, 41):
+        server.channels[channel_id] = Channel(channel_id, name=SPARE_NAME)
+    server.ledger.rooms = {40, 41}
+
+    asyncio.run(bot.clean_up_channels())
+
+    # one spare room is needed, the other one is deleted.
+    assert [channel.id for channel in bot.rooms.pool] == [40]
+    assert server.channels[40].requests == 0
+    assert server.ledger.rooms == {40}
+
+
+def test_requests_wait_for_the_semaphore(server):
+    running, most = [0], [0]
+
+    class Counted(Channel):
+        async def delete(self):
+            running[0] += 1
+            most[0] = max(most[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+
+        async def edit(self, overwrites):
+            await self.delete()
+
+    for channel_id in range(50, 70):
+        server.channels[channel_id] = Counted(channel_id, overwrites={server.members[1]: 'allow'})
+    server.ledger.rooms = set(range(50, 60))
+    server.ledger.overwrites = {channel_id: {1} for channel_id in range(60, 70)}
+
+    asyncio.run(bot.clean_up_channels(concurrency=3))
+
+    assert most[0] == 3
+    assert server.ledger.rooms == set() and server.ledger.overwrites == {}
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import my_classes.Expression as expression_module
+from my_classes.Expression import MAX_BITS, compile_expression, evaluate
+
+
+def run(text, user=None):
+    return asyncio.run(evaluate(text, user))
+
+
+def test_small_expressions_are_calculated():
+    assert run('2 + 3 * 4') == 14
+    assert run('factorial(5) % 7') == 1
+    assert run('2 ** 100 % 1000') == 2 ** 100 % 1000
+
+
+@pytest.mark.parametrize('text', [
+    '(10**10**6*10**10**6*10**10**6*10**10**6*10**10**6*10**10**6) % 7',
+    'factorial(200000)*factorial(200000)*factorial(200000)*factorial(200000) % 2',
+    '(9**9**9**9) // 10**100',
+    '1 ** (10**10**8)',
+])
+def test_large_operands_are_charged_even_if_the_result_is_small(text):
+    assert compile_expression(text).cost() > MAX_BITS
+
+    start = time.perf_counter()
+    with pytest.raises(OverflowError):
+        run(text)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_products_are_bounded():
+    with pytest.raises(OverflowError):
+        compile_expression('(2**1000) * (2**1000)').evaluate(limit=1500)
+    assert compile_expression('(2**1000) * (2**1000)').evaluate(limit=2048) == 2 ** 2000
+
+
+def test_workers_are_limited_globally_and_per_member(monkeypatch):
+    requests = {f'{base} ** (10**6)': user for user, bases in {1: (3, 5, 7), 2: (9, 10), 3: (11, 12)}.items()
+                for base in bases}
+    running, most, lock = {}, {}, threading.Lock()
+
+    def worker(text, timeout):
+        with lock:
+            for key in (requests[text], 'all'):
+                running[key] = running.get(key, 0) + 1
+                most[key] = max(most.get(key, 0), running[key])
+        time.sleep(0.05)
+        with lock:
+            for key in (requests[text], 'all'):
+                running[key] -= 1
+        return text
+
+    monkeypatch.setattr(expression_module, 'evaluate_in_worker', worker)
+    monkeypatch.setattr(expression_module, 'workers', None)
+
+    async def main():
+        expression_module.workers = asyncio.Semaphore(expression_module.MAX_WORKERS)
+        return await asyncio.gather(*(evaluate(text, user) for text, user in requests.items()))
+
+    assert asyncio.run(main()) == list(requests)
+    assert most['all'] == expression_module.MAX_WORKERS
+    assert all(most[user] == expression_module.MAX_USER_WORKERS for user in (1, 2, 3))
+    assert expression_module.user_workers == {}
+
+
+def test_worker_processes_are_reused_and_replaced_after_a_timeout(monkeypatch):
+    monkeypatch.setattr(expression_module, 'idle', [])
+    expression_module.start_workers(1)
+    process, _ = expression_module.idle[0]
+
+    assert expression_module.evaluate_in_worker('3 ** (10**6) % 1000', 5) == 3 ** (10 ** 6) % 1000
+    with pytest.raises(ZeroDivisionError):
+        expression_module.evaluate_in_worker('1 // 0', 5)
+    assert [worker[0] for worker in expression_module.idle] == [process]
+
+    with pytest.raises(TimeoutError):
+        expression_module.evaluate_in_worker('factorial(200000) % 7', 0.01)
+    assert expression_module.idle == [] and process.exitcode is not None
+
+    assert expression_module.evaluate_in_worker('2 ** 10', 5) == 1024
+    assert len(expression_module.idle) == 1 and expression_module.idle[0][0] is not process
+
+    for worker in expression_module.idle:
+        expression_module.stop_worker(worker)
@@ -0,0 +1,37 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from my_classes.Handoff import Handoff
+
+
+class Channel:
+    def __init__(self, id):
+        self.id = id
+        self.created = []
+
+    async def create_invite(self, max_age, unique):
+        invite = SimpleNamespace(code=f'code-{len(self.created)}', channel=self, max_age=max_age, unique=unique)
+        self.created.append(invite)
+        return invite
+
+
+def test_invites_expire_and_are_replaced_before_they_do(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    handoffs, channel = Handoff(max_age=86400, margin=3600), Channel(1)
+
+    first = asyncio.run(handoffs.invite(channel))
+    assert first.max_age == 86400 and first.max_age > 0
+    now[0] += 86400 - 3600 - 1
+    assert asyncio.run(handoffs.invite(channel)) is first
+
+    now[0] += 2
+    second = asyncio.run(handoffs.invite(channel))
+    assert second is not first and second.unique
+    assert (handoffs.created, handoffs.reused) == (2, 1)
+
+    handoffs.forget(first)
+    assert asyncio.run(handoffs.invite(channel)) is second
+    handoffs.forget(second)
+    assert asyncio.run(handoffs.invite(channel)).code == 'code-2'
@@ -0,0 +1,75 @@
+import random
+import string
+
+from my_classes.HelpIndex import HelpIndex
+from my_classes.Registry import registry
+from my_classes.Trie import Trie
+
+
+def distance(first, second):
+    """the Levenshtein distance computed with the full table."""
+    row = list(range(len(second) + 1))
+    for index, character in enumerate(first, 1):
+        previous, row = row, [index]
+        for column, other in enumerate(second, 1):
+            row.append(min(row[column - 1] + 1, previous[column] + 1, previous[column - 1] + (character != other)))
+    return row[-1]
+
+
+def closest(words, prefix, max_distance):
+    """the values closest to the prefix found by comparing it to every prefix of every word."""
+    best = {}
+    for value, word in enumerate(words):
+        best[value] = min(distance(prefix, word[:length]) for length in range(len(word) + 1))
+
+    minimum = min(best.values(), default=max_distance + 1)
+    if minimum > max_distance:
+        return minimum, set()
+    return minimum, {value for value, best_distance in best.items() if best_distance == minimum}
+
+
+def test_starts_with_returns_values_in_insertion_order():
+    trie = Trie()
+    for value, word in enumerate(['.tutee set', '.tutor next', '.tutee hi', '.tutor']):
+        trie.insert(word, value)
+
+    assert trie.starts_with('.tutee') == [0, 2]
+    assert trie.starts_with('.tutor') == [1, 3]
+    assert trie.starts_with('') == [0, 1, 2, 3]
+    assert trie.starts_with('.x') == []
+
+
+def test_closest_matches_a_brute_force_search():
+    generator = random.Random(0)
+    words = [''.join(generator.choice('abcde') for _ in range(generator.randint(1, 8))) for _ in range(60)]
+    trie = Trie()
+    for value, word in enumerate(words):
+        trie.insert(word, value)
+
+    for _ in range(300):
+        prefix = ''.join(generator.choice('abcdef') for _ in range(generator.randint(1, 6)))
+        for max_distance in (1, 2):
+            expected = closest(words, prefix, max_distance)
+            found = trie.closest(prefix, max_distance)
+            assert found[1] == expected[1], prefix
+            if expected[1]:
+                assert found[0] == expected[0], prefix
+
+
+def test_look_up_matches_the_help_files(monkeypatch):
+    monkeypatch.setenv('BOT_PREFIX', '.')
+    index = HelpIndex()
+
+    commands = [f'.{command}' for categories in registry.folder('help_msg').values()
+                for category in categories for command in categories[category]]
+    entries, exact = index.look_up()
+    assert exact and [entry[1] for entry in entries] == commands
+
+    entries, exact = index.look_up('.TUTEE')
+    assert exact and [entry[1] for entry in entries] == [c for c in commands if c.startswith('.tutee')]
+
+    entries, exact = index.look_up('.tuter')
+    assert not exact and entries
+    assert all(entry[1].startswith(('.tutee', '.tutor')) for entry in entries)
+
+    assert index.look_up(string.ascii_lowercase) == ([], False)
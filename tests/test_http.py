@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from my_classes.Http import HttpClient, HttpError, retry_after
+
+
+def serve(responses, test):
+    """run the test against a local server that answers with the given (status, headers) in order."""
+    received = []
+
+    async def handle(request):
+        received.append(time.monotonic())
+        status, headers = responses[min(len(received), len(responses)) - 1]
+        return web.json_response({'status': status}, status=status, headers=headers)
+
+    async def main():
+        application = web.Application()
+        application.router.add_get('/', handle)
+        runner = web.AppRunner(application)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        client = HttpClient()
+        try:
+            return await test(client, f'http://127.0.0.1:{port}'), received
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_retry_after_is_honored():
+    async def test(client, url):
+        client.register('api', url, backoff=0.01)
+        return await client.get_json('api', '/')
+
+    (status, contents), received = serve([(429, {'Retry-After': '1'}), (200, {})], test)
+
+    assert status == 200 and contents == {'status': 200}
+    assert received[1] - received[0] >= 0.9
+
+
+def test_long_retry_after_fails_right_away():
+    async def test(client, url):
+        client.register('api', url, backoff=0.01, max_retry_after=5)
+        with pytest.raises(HttpError) as error:
+            await client.get_json('api', '/')
+        return error.value.status
+
+    status, received = serve([(429, {'Retry-After': '120'})], test)
+
+    assert status == 429
+    assert len(received) == 1
+
+
+def test_retry_after_dates():
+    assert retry_after(None) == 0
+    assert retry_after('3') == 3
+    assert retry_after('soon') == 0
+    assert retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+
+
+def test_bot_close_closes_the_session():
+    import cogs.bot as bot
+    from my_classes.Http import http_client
+
+    async def main():
+        session = http_client.get_session()
+        await bot.bot.close()
+        return session.closed
+
+    assert asyncio.run(main())
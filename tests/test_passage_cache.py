@@ -0,0 +1,30 @@
+import asyncio
+import threading
+
+from my_classes.PassageCache import PassageCache
+
+
+def test_passages_are_read_and_written_off_the_event_loop(tmp_path):
+    cache = PassageCache(str(tmp_path / 'esv.sqlite3'), max_entries=2)
+    threads = set()
+    read, write = cache.read, cache.write
+
+    def record(function):
+        def wrapper(*args):
+            threads.add(threading.get_ident())
+            return function(*args)
+        return wrapper
+
+    cache.read, cache.write = record(read), record(write)
+
+    async def main():
+        assert await cache.get('John 3:16') is None
+        await cache.put('John 3:16', 'For God so loved the world')
+        await cache.put('John 1:1', 'In the beginning was the Word')
+        assert await cache.get('John 3:16') == 'For God so loved the world'
+        await cache.put('Genesis 1:1', 'In the beginning, God created')
+        assert await cache.get('John 1:1') is None
+        return await cache.stats()
+
+    assert asyncio.run(main()) == '1 hits, 2 misses (33% hit rate).\n2 passages cached.'
+    assert len(threads) == 1 and threading.get_ident() not in threads
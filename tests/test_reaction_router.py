@@ -0,0 +1,184 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from my_classes.ReactionRouter import ReactionRouter
+
+
+class Message:
+    def __init__(self, message_id):
+        self.id = message_id
+        self.reactions = []
+        self.deleted = False
+
+    async def add_reaction(self, emoji):
+        self.reactions.append(emoji)
+        await asyncio.sleep(0)
+
+    async def delete(self):
+        if self.deleted:
+            raise discord.NotFound(SimpleNamespace(status=404, reason='error'), 'error')
+        self.deleted = True
+
+
+def react(router, message, user_id, emoji):
+    return router.dispatch(SimpleNamespace(message_id=message.id, user_id=user_id, emoji=emoji))
+
+
+def test_only_the_author_answers_with_a_prompt_emoji():
+    router = ReactionRouter(None)
+    message = Message(1)
+
+    async def main():
+        prompt = asyncio.ensure_future(router.ask(message, 7, ['👍', '👎'], 5))
+        await asyncio.sleep(0)
+        assert react(router, message, 8, '👍')
+        assert react(router, message, 7, '🔥')
+        assert not react(router, Message(2), 7, '👍')
+        assert not prompt.done()
+
+        react(router, message, 7, '👎')
+        return await prompt
+
+    assert asyncio.run(main()) == '👎'
+    assert message.deleted and router.pending == {}
+    assert (router.events, router.answered, router.expired) == (3, 1, 0)
+
+
+def test_an_answer_before_every_reaction_is_added_counts():
+    router = ReactionRouter(None)
+    message = Message(1)
+    emojis = [str(number) for number in range(10)]
+
+    async def main():
+        prompt = asyncio.ensure_future(router.ask(message, 7, emojis, 5))
+        await asyncio.sleep(0)
+        react(router, message, 7, '0')
+        return await prompt
+
+    assert asyncio.run(main()) == '0'
+    assert len(message.reactions) < len(emojis)
+
+
+def test_prompts_expire_in_deadline_order():
+    router = ReactionRouter(None)
+    messages = [Message(message_id) for message_id in range(100)]
+
+    async def main():
+        prompts = [router.ask(message, 7, ['👍'], 0.01 * (message.id % 5 + 1)) for message in messages]
+        return await asyncio.gather(*prompts)
+
+    assert asyncio.run(main()) == [None] * 100
+    assert router.expired == 100 and router.pending == {}
+    assert all(message.deleted for message in messages)
+
+
+def test_answered_prompts_are_removed_from_the_heap():
+    router = ReactionRouter(None)
+
+    async def main():
+        for message_id in range(1000):
+            future = router.wait(message_id, 7, ['👍'], 60)
+            router.answer(message_id, 7, '👍')
+            router.cancel(message_id)
+            assert future.result() == '👍'
+        router.timer.cancel()
+
+    asyncio.run(main())
+    assert len(router.deadlines) <= 64
+
+
+class Http:
+    def __init__(self, reject=False):
+        self.reject = reject
+        self.requests = []
+
+    async def request(self, route, json=None):
+        self.requests.append((route.method, route.path, json))
+        if self.reject:
+            raise discord.HTTPException(SimpleNamespace(status=400, reason='error'), 'error')
+        return {'id': '1'}
+
+
+class Channel:
+    id = 10
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, embed):
+        self.sent.append(embed)
+        return Message(2)
+
+
+def make_router(reject=False):
+    connection = SimpleNamespace(create_message=lambda channel, data: Message(int(data['id'])))
+    return ReactionRouter(SimpleNamespace(http=Http(reject), _connection=connection))
+
+
+def interaction(custom_id, user_id, values=None):
+    data = {'custom_id': custom_id, **({'values': values} if values else {})}
+    return {'type': 3, 'id': '5', 'token': 'token', 'member': {'user': {'id': str(user_id)}}, 'data': data}
+
+
+def test_a_prompt_sent_with_buttons_is_answered_by_custom_id():
+    router = make_router()
+    channel = Channel()
+
+    async def main():
+        message = await router.send(channel, discord.Embed(description='do you need help?'),
+                                    {'👍': 'ready!', '👎': 'not yet'})
+        prompt = asyncio.ensure_future(router.ask(message, 7, ['👍', '👎'], 5))
+        await asyncio.sleep(0)
+        assert not react(router, message, 7, '👍')
+        assert await router.dispatch_interaction(interaction('prompt-1:👍', 8))
+        assert not await router.dispatch_interaction(interaction('prompt-2:👍', 7))
+        assert not prompt.done()
+
+        assert await router.dispatch_interaction(interaction('prompt-1:👎', 7))
+        return message, await prompt
+
+    message, answer = asyncio.run(main())
+    assert answer == '👎' and message.reactions == [] and message.deleted
+    assert channel.sent == [] and router.sent == {} and router.pending == {}
+
+    (method, path, payload), *callbacks = router.bot.http.requests
+    assert (method, path) == ('POST', '/channels/{channel_id}/messages')
+    buttons = payload['components'][0]['components']
+    assert [button['custom_id'] for button in buttons] == ['prompt-1:👍', 'prompt-1:👎']
+    assert [(path, payload) for _, path, payload in callbacks] == \
+        [('/interactions/{interaction_id}/{interaction_token}/callback', {'type': 6})] * 2
+
+
+def test_more_than_five_choices_are_a_select_menu():
+    router = make_router()
+    options = {str(number): f'course {number}' for number in range(8)}
+    row, = router.components('prompt-1', options)
+    select, = row['components']
+    assert select['type'] == 3 and select['custom_id'] == 'prompt-1'
+    assert [option['value'] for option in select['options']] == list(options)
+
+    async def main():
+        future = router.wait('prompt-1', 7, options, 5)
+        assert await router.dispatch_interaction(interaction('prompt-1', 7, ['6']))
+        router.timer.cancel()
+        return await future
+
+    assert asyncio.run(main()) == '6'
+
+
+def test_a_prompt_that_could_not_be_sent_with_buttons_falls_back_to_reactions():
+    router = make_router(reject=True)
+    channel = Channel()
+
+    async def main():
+        message = await router.send(channel, discord.Embed(description='pick a course'), {'1️⃣': 'EGR 222'})
+        prompt = asyncio.ensure_future(router.ask(message, 7, ['1️⃣'], 5))
+        await asyncio.sleep(0.01)
+        react(router, message, 7, '1️⃣')
+        return message, await prompt
+
+    message, answer = asyncio.run(main())
+    assert answer == '1️⃣' and message.reactions == ['1️⃣'] and len(channel.sent) == 1
+    assert router.sent == {}
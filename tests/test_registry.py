@@ -0,0 +1,59 @@
+import asyncio
+import json
+import os
+import threading
+
+import my_classes.Registry as registry_module
+from my_classes.Registry import Registry
+
+
+def write(directory, path, contents, mtime):
+    path = os.path.join(directory, path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(contents, file)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_reload_swaps_only_changed_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    directory = 'content'
+    write(directory, 'a/one.json', {'x': 1}, 10 ** 18)
+    write(directory, 'a/two.json', {'y': 2}, 10 ** 18)
+    registry = Registry(directory)
+    assert registry.version == 1 and registry.get('a/one.json')['x'] == 1
+
+    assert registry.reload() == [] and registry.version == 1
+
+    write(directory, 'a/one.json', {'x': 3}, 2 * 10 ** 18)
+    write(directory, 'a/bad.json', [1], 2 * 10 ** 18)
+    os.remove(os.path.join(directory, 'a/two.json'))
+    assert sorted(registry.reload()) == ['a/one.json', 'a/two.json']
+    assert dict(registry.folder('a')) == {'one.json': {'x': 3}}
+
+
+def test_watch_reads_the_directory_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    directory = 'content'
+    write(directory, 'a/one.json', {'x': 1}, 10 ** 18)
+    registry = Registry(directory)
+    threads = []
+
+    def read_changes(directory, mtimes):
+        threads.append(threading.get_ident())
+        return original(directory, mtimes)
+
+    original = registry_module.read_changes
+    monkeypatch.setattr(registry_module, 'read_changes', read_changes)
+
+    async def main():
+        watcher = asyncio.ensure_future(registry.watch(interval=0.01))
+        write(directory, 'a/one.json', {'x': 2}, 2 * 10 ** 18)
+        while registry.version == 1:
+            await asyncio.sleep(0.01)
+        watcher.cancel()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert registry.get('a/one.json')['x'] == 2
+    assert threads and loop_thread not in threads
@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+
+from my_classes.Role import Role
+
+
+class Member:
+    def __init__(self, roles, error=None):
+        self.roles = roles
+        self.error = error
+        self.calls = []
+
+    async def add_roles(self, *roles):
+        if self.error is not None:
+            raise self.error
+        self.calls.append(('add', [role.id for role in roles]))
+
+    async def remove_roles(self, *roles):
+        self.calls.append(('remove', [role.id for role in roles]))
+
+
+def guild_of(member, role_ids):
+    roles = {role_id: SimpleNamespace(id=role_id) for role_id in role_ids}
+    return SimpleNamespace(get_member=lambda member_id: member, get_role=roles.get)
+
+
+def run(member, edits):
+    """buffer every edit then wait for the member's window to end."""
+    async def main():
+        role = Role(SimpleNamespace(loop=asyncio.get_running_loop()), window=0)
+        guild = guild_of(member, range(1, 6))
+        for role_id, add in edits:
+            role.buffer(guild, 7, SimpleNamespace(id=role_id), add)
+        await asyncio.sleep(0.01)
+        return role
+
+    return asyncio.run(main())
+
+
+def test_only_changed_roles_are_sent():
+    member = Member([SimpleNamespace(id=1), SimpleNamespace(id=2)])
+    role = run(member, [(3, True), (4, True), (4, False), (1, True), (2, False), (5, False)])
+
+    assert member.calls == [('add', [3]), ('remove', [2])]
+    assert role.requests == 2
+
+
+def test_cancelled_edits_send_nothing():
+    member = Member([SimpleNamespace(id=1)])
+    role = run(member, [(3, True), (3, False), (1, False), (1, True)])
+
+    assert member.calls == []
+    assert role.requests == 0
+
+
+def test_failed_edit_is_printed(capsys):
+    member = Member([], error=RuntimeError('rate limited'))
+    run(member, [(3, True)])
+
+    assert 'role edit for 7 failed' in capsys.readouterr().out
@@ -0,0 +1,155 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from my_classes.PermissionWriter import PermissionWriter
+from my_classes.RoomManager import RoomManager
+
+
+class Channel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.members = []
+        self.overwrites = {}
+
+    async def edit(self, overwrites):
+        self.overwrites = overwrites
+
+
+def manager():
+    return RoomManager(SimpleNamespace(), SimpleNamespace(), PermissionWriter())
+
+
+def move(rooms, member, before, after):
+    """move a member between voice channels the way discord updates them before the event."""
+    if before is not None:
+        before.members.remove(member)
+    if after is not None:
+        # discord does not keep the members in the order they joined.
+        after.members.insert(0, member)
+
+    voice = SimpleNamespace
+    asyncio.run(rooms.update(member, voice(channel=before), voice(channel=after)))
+
+
+def test_ownership_goes_to_the_member_present_longest():
+    rooms, room = manager(), Channel(10)
+    owner, first, second = (discord.Object(id=member_id) for member_id in (1, 2, 3))
+    rooms.add(room.id, owner.id)
+
+    for member in (owner, first, second):
+        move(rooms, member, None, room)
+    move(rooms, owner, room, None)
+
+    assert rooms.rooms[room.id] == first.id
+    assert rooms.room_of(first.id) == room.id
+    assert rooms.room_of(owner.id) is None
+
+
+def test_an_empty_room_is_released():
+    rooms, room = manager(), Channel(10)
+    owner, guest = discord.Object(id=1), discord.Object(id=2)
+    rooms.add(room.id, owner.id)
+
+    move(rooms, owner, None, room)
+    move(rooms, owner, room, None)
+    assert rooms.room_of(owner.id) is None
+    assert rooms.is_room(room.id)
+
+    # the owner coming back owns the room again.
+    move(rooms, owner, None, room)
+    assert rooms.room_of(owner.id) == room.id
+    move(rooms, owner, room, None)
+
+    # anyone else coming back first owns it instead.
+    move(rooms, guest, None, room)
+    assert rooms.room_of(guest.id) == room.id
+    assert rooms.rooms[room.id] == guest.id
+
+
+def test_a_guest_joining_before_the_owner_does_not_take_the_room():
+    rooms, room = manager(), Channel(10)
+    owner, guest = discord.Object(id=1), discord.Object(id=2)
+    rooms.add(room.id, owner.id)
+
+    move(rooms, guest, None, room)
+    assert rooms.room_of(owner.id) == room.id
+    assert rooms.room_of(guest.id) is None
+
+
+class Spare(Channel):
+    def __init__(self, channel_id, error=None):
+        super().__init__(channel_id)
+        self.error = error
+        self.name = None
+
+    async def edit(self, name=None, overwrites=None):
+        if self.error is not None:
+            raise self.error
+        self.name, self.overwrites = name, overwrites
+
+    async def create_invite(self):
+        return f'invite-{self.id}'
+
+
+def test_open_skips_spare_rooms_that_cannot_be_used(tmp_path):
+    from my_classes.Ledger import Ledger
+
+    created = []
+
+    async def create_voice_channel(name, overwrites):
+        created.append(Spare(100 + len(created)))
+        return created[-1]
+
+    guild = SimpleNamespace(default_role=discord.Object(id=0), get_channel=lambda channel_id: category)
+    category = SimpleNamespace(create_voice_channel=create_voice_channel)
+    ledger = Ledger(str(tmp_path / 'ledger.json'))
+    rooms = RoomManager(SimpleNamespace(get_guild=lambda guild_id: guild), ledger, PermissionWriter(), min_pool=0)
+
+    deleted = Spare(10, discord.NotFound(SimpleNamespace(status=404, reason='error'), 'error'))
+    rooms.pool = [deleted]
+    ledger.rooms = {deleted.id}
+    owner = discord.Object(id=1)
+
+    channel, invite = asyncio.run(rooms.open(guild, owner, []))
+
+    # the deleted spare room is forgotten and a new room is created instead.
+    assert channel is created[0] and invite == 'invite-100'
+    assert 10 not in ledger.rooms and 100 in ledger.rooms
+    assert rooms.room_of(owner.id) == 100
+
+    # the next spare room that works is used before creating a new room.
+    rooms.pool = [Spare(11), Spare(12, discord.HTTPException(SimpleNamespace(status=500, reason='error'), 'error'))]
+    ledger.rooms = {11, 12}
+    channel, invite = asyncio.run(rooms.open(guild, discord.Object(id=2), []))
+
+    # the spare room that failed stays in the ledger to be deleted on the next startup.
+    assert channel.id == 11 and invite == 'invite-11'
+    assert {11, 12} <= ledger.rooms
+
+
+def test_a_reused_room_forgets_the_previous_overwrites(tmp_path):
+    from my_classes.Ledger import Ledger
+
+    guild = SimpleNamespace(default_role=discord.Object(id=0))
+    ledger = Ledger(str(tmp_path / 'ledger.json'))
+    rooms = RoomManager(SimpleNamespace(get_guild=lambda guild_id: None), ledger, PermissionWriter(), min_pool=1)
+    room = Spare(10)
+    room.guild = guild
+    previous, visitor, owner, guest = (discord.Object(id=member_id) for member_id in (1, 2, 3, 4))
+
+    async def main():
+        rooms.pool = [room]
+        await rooms.open(guild, previous, [])
+        await rooms.grant(visitor, room)
+        await rooms.close(room)
+        # discord.py has not cached the edits yet, the writer still remembers them.
+        room.overwrites = {}
+        await rooms.open(guild, owner, [])
+        await rooms.grant(guest, room)
+
+    asyncio.run(main())
+
+    assert previous not in room.overwrites and visitor not in room.overwrites
+    assert owner in room.overwrites and guest in room.overwrites
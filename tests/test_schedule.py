@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import my_classes.Schedule as schedule_module
+from my_classes.Schedule import DAYS, Schedule
+
+HOURS = {
+    'Monday': {
+        'Ann': {'start_hour': 9, 'start_minute': 0, 'end_hour': 12, 'end_minute': 0, 'location': 'A'},
+        'Bob': {'start_hour': 8, 'start_minute': 30, 'end_hour': 10, 'end_minute': 0, 'location': 'B'},
+        'Cat': {'start_hour': 11, 'start_minute': 0, 'end_hour': 14, 'end_minute': 15, 'location': 'C'},
+        'Dan': {'start_hour': 20, 'start_minute': 0, 'end_hour': 22, 'end_minute': 0, 'location': 'D'},
+    },
+    'Wednesday': {
+        'Eve': {'start_hour': 17, 'start_minute': 30, 'end_hour': 19, 'end_minute': 30, 'location': 'E'},
+        'Fay': {'start_hour': 17, 'start_minute': 30, 'end_hour': 18, 'end_minute': 0, 'location': 'F'},
+    },
+}
+
+MONDAY = datetime(2026, 10, 19)
+
+
+@pytest.fixture
+def schedule(monkeypatch):
+    monkeypatch.setattr(schedule_module, 'get_schedule', lambda course_code: HOURS)
+    return Schedule('EGR222')
+
+
+def minutes(fields, side):
+    return fields[f'{side}_hour'] * 60 + fields[f'{side}_minute']
+
+
+def on_duty(now):
+    """the first tutor in the file that is tutoring, the predicate the timeline replaced."""
+    minute = now.hour * 60 + now.minute
+    for tutor, fields in HOURS.get(DAYS[now.weekday()], {}).items():
+        if minutes(fields, 'start') <= minute < minutes(fields, 'end'):
+            return tutor
+    return None
+
+
+def test_current_tutor_matches_every_minute_of_the_week(schedule):
+    for minute in range(7 * 24 * 60):
+        now = MONDAY + timedelta(minutes=minute)
+        assert schedule.current_tutor(now) == on_duty(now), now
+
+
+def test_next_session_rolls_into_later_days(schedule):
+    assert schedule.next_session(MONDAY.replace(hour=8)) == (MONDAY.replace(hour=8, minute=30), 'Bob', 'B')
+    assert schedule.next_session(MONDAY.replace(hour=9)) == (MONDAY.replace(hour=11), 'Cat', 'C')
+    assert schedule.next_session(MONDAY.replace(hour=21)) == (
+        MONDAY.replace(day=21, hour=17, minute=30), 'Eve', 'E')
+    assert schedule.next_session(MONDAY.replace(hour=21), days=0) is None
+    assert schedule.next_tutor(MONDAY.replace(day=22)) == 'Bob'
+
+
+def test_tutor_name_reads_the_clock(schedule):
+    schedule.clock = lambda: MONDAY.replace(hour=15)
+    assert schedule.tutor_name() == 'Dan'
+
+    schedule.clock = lambda: MONDAY.replace(hour=13)
+    assert schedule.tutor_name() == 'Cat'
+    assert schedule.tutor_time('Cat') == '11:00am 2:15pm'
+    assert schedule.tutor_time('Eve', 'Wednesday') == '5:30pm 7:30pm'
+    assert schedule.tutor_time('Eve') == 'N/A N/A'
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+import cogs.weather as weather
+from my_classes.Http import HttpError
+
+
+@pytest.mark.parametrize('segment, expected', [
+    ('riverside', ('riverside', '', 'US', 'imperial')),
+    ('los angeles 90015 US metric', ('los angeles', '90015', 'US', 'metric')),
+    ('london gb', ('london', '', 'GB', 'imperial')),
+    ('port st lucie', ('port st lucie', '', 'US', 'imperial')),
+    ('st george kelvin', ('st george', '', 'US', 'kelvin')),
+    ('tokyo jp metric', ('tokyo', '', 'JP', 'metric')),
+    ('ab xy', ('ab xy', '', 'US', 'imperial')),
+])
+def test_parse_city(segment, expected):
+    assert weather.parse_city(segment) == expected
+
+
+def look_up(monkeypatch, status, response):
+    weather.weather_cache.entries.clear()
+
+    async def get_json(name, path='', params=None, headers=None):
+        return status, response
+
+    monkeypatch.setattr(weather.http_client, 'get_json', get_json)
+    return asyncio.run(weather.look_up_weather('riverside', '', 'US', 'imperial'))
+
+
+def test_only_not_found_is_reported_as_missing(monkeypatch):
+    assert look_up(monkeypatch, 404, {'cod': '404', 'message': 'city not found'}) == 'cannot find city, riverside'
+    assert ('riverside', '', 'US', 'imperial') in weather.weather_cache.entries
+
+    message = look_up(monkeypatch, 401, {'cod': 401, 'message': 'invalid api key'})
+    assert message == 'weather service is unavailable for riverside.'
+    assert ('riverside', '', 'US', 'imperial') not in weather.weather_cache.entries
+
+
+def test_weather_is_displayed(monkeypatch):
+    response = {'main': {'temp': 71.6}, 'name': 'Riverside', 'sys': {'country': 'US'},
+                'weather': [{'description': 'clear sky'}]}
+
+    assert look_up(monkeypatch, 200, response) == 'it is 72 °F with clear sky in Riverside, US'
+
+
+def test_invalid_response_is_an_error(monkeypatch):
+    async def get_json(name, path='', params=None, headers=None):
+        return 200, {'cod': 200}
+
+    monkeypatch.setattr(weather.http_client, 'get_json', get_json)
+    with pytest.raises(HttpError):
+        asyncio.run(weather.get_weather('riverside', '', 'US', 'imperial'))
@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from my_classes.Worker import Worker, sweeps
+
+
+def make_tutor():
+    ctx = SimpleNamespace(author=SimpleNamespace(id=1))
+    return Worker(ctx, 'tutor', SimpleNamespace(schedule=None, code='CSC 101'))
+
+
+def test_stopping_a_sweep_waits_for_it_to_clean_up():
+    cleaned = []
+
+    async def sweep():
+        try:
+            await asyncio.sleep(60)
+        finally:
+            await asyncio.sleep(0)
+            cleaned.append(True)
+
+    async def main():
+        tutor = make_tutor()
+        tutor.start_sweep(sweep())
+        await asyncio.sleep(0)
+        return await tutor.stop_sweep(), await tutor.stop_sweep()
+
+    assert asyncio.run(main()) == (True, False)
+    assert cleaned == [True] and sweeps == {}
+
+
+def test_cancelling_the_caller_of_stop_sweep_is_not_swallowed():
+    async def sweep():
+        try:
+            await asyncio.sleep(60)
+        finally:
+            await asyncio.sleep(0.2)
+
+    async def main():
+        tutor = make_tutor()
+        tutor.start_sweep(sweep())
+        await asyncio.sleep(0)
+        stopping = asyncio.ensure_future(tutor.stop_sweep())
+        await asyncio.sleep(0.05)
+        stopping.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await stopping
+        await asyncio.wait({tutor.sweep})
+
+    asyncio.run(main())